@@ -0,0 +1,58 @@
+"""Measures what a trading iteration that does nothing costs a backtest, leaving out the analysis at the end.
+
+Run as a module from the root of the repository, so that lumibot is imported from the working tree:
+
+    python -m benchmarks.backtest_iteration_overhead
+"""
+import datetime
+import time
+
+import pandas as pd
+
+from lumibot.backtesting import BacktestingBroker, PandasDataBacktesting
+from lumibot.entities import Asset, Data
+from lumibot.strategies import Strategy
+
+
+class MinuteStrategy(Strategy):
+    def initialize(self):
+        self.sleeptime = "1M"
+        self.iterations = 0
+
+    def on_trading_iteration(self):
+        self.iterations += 1
+
+
+def main():
+    df = pd.read_csv("data/XYZ_1Min.csv", index_col=0, parse_dates=True)
+    data_source = PandasDataBacktesting(
+        datetime_start=datetime.datetime(2020, 1, 6),
+        datetime_end=datetime.datetime(2020, 1, 11),
+        pandas_data=[Data(Asset("XYZ"), df, timestep="minute")],
+        show_progress_bar=False,
+    )
+    broker = BacktestingBroker(data_source=data_source)
+    strategy = MinuteStrategy(broker=broker, budget=100000, benchmark_asset=None, risk_free_rate=0)
+    strategy._dump_stats = lambda: None
+    executor = strategy._executor
+
+    # Time the loop of every trading session
+    run_trading_session = executor._run_trading_session
+    session_times = []
+
+    def timed_trading_session():
+        iterations, start = strategy.iterations, time.perf_counter()
+        run_trading_session()
+        if strategy.iterations > iterations:
+            session_times.append((time.perf_counter() - start) / (strategy.iterations - iterations))
+
+    executor._run_trading_session = timed_trading_session
+    executor.run()
+
+    print(f"{strategy.iterations} iterations")
+    print(f"best session: {min(session_times) * 1e6:.1f} us/iteration")
+    print(f"mean session: {sum(session_times) / len(session_times) * 1e6:.1f} us/iteration")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from .alpaca_backtesting import AlpacaBacktesting
 from .alpha_vantage_backtesting import AlphaVantageBacktesting
 from .backtesting_broker import BacktestingBroker
+from .lockstep_clock import LockstepClock
 from .pandas_backtesting import PandasDataBacktesting
 from .polygon_backtesting import PolygonDataBacktesting
 from .thetadata_backtesting import ThetaDataBacktesting
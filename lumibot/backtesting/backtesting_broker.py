@@ -1,23 +1,32 @@
 import logging
 import traceback
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from functools import wraps
 
+import numpy as np
+import pandas as pd
 import pytz
 
 from lumibot.brokers import Broker
 from lumibot.data_sources import DataSourceBacktesting
 from lumibot.entities import Asset, Order, Position, TradingFee
-from lumibot.trading_builtins import CustomStream
+from lumibot.trading_builtins import DirectStream
 
 logger = logging.getLogger(__name__)
 
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
 
 class BacktestingBroker(Broker):
     # Metainfo
     IS_BACKTESTING_BROKER = True
 
+    # Orders of the same asset evaluated with numpy when there are at least this many of them
+    VECTORIZED_FILL_MIN_ORDERS = 8
+    # Prices that compare the same in numpy float64 arrays as they do as scalars
+    _VECTORIZED_PRICE_TYPES = (float, int, np.float64, type(None))
+
     def __init__(self, data_source, option_source=None, connect_stream=True, max_workers=20, config=None, **kwargs):
         super().__init__(name="backtesting", data_source=data_source,
                          option_source=option_source, connect_stream=connect_stream, **kwargs)
@@ -26,6 +35,9 @@ class BacktestingBroker(Broker):
         self.market = "NASDAQ"
         self.option_source = option_source
 
+        # Set by the Trader when several strategies are backtested together with this broker, see LockstepClock
+        self.lockstep_clock = None
+
         # Legacy strategy.backtest code will always pass in a config even for Brokers that don't need it, so
         # catch it here and ignore it in this class. Child classes that need it should error check it themselves.
         # self._config = config
@@ -33,34 +45,6 @@ class BacktestingBroker(Broker):
         if not isinstance(self.data_source, DataSourceBacktesting):
             raise ValueError("Must provide a backtesting data_source to run with a BacktestingBroker")
 
-    def __getattribute__(self, name):
-        attr = object.__getattribute__(self, name)
-
-        if name == "submit_order":
-            broker = self
-
-            @wraps(attr)
-            def new_func(order, *args, **kwargs):
-                result = attr(order, *args, **kwargs)
-                if result.was_transmitted() and result.order_class and result.order_class == "oco":
-                    orders = broker._flatten_order(result)
-                    for order in orders:
-                        logger.info(f"{order} was sent to broker {self.name}")
-                        broker._new_orders.append(order)
-
-                    # Remove the original order from the list of new orders because
-                    # it's been replaced by the individual orders
-                    broker._new_orders.remove(result)
-                elif order not in broker._new_orders:
-                    # David M: This seems weird and I don't understand why we're doing this.  It seems like
-                    # we're adding the order to the new orders list twice, so checking first.
-                    broker._new_orders.append(order)
-                return result
-
-            return new_func
-        else:
-            return attr
-
     @property
     def datetime(self):
         return self.data_source.get_datetime()
@@ -101,6 +85,14 @@ class BacktestingBroker(Broker):
         # This is needed to handle Daylight Savings Time changes
         new_datetime = tz.normalize(new_datetime) if is_pytz else new_datetime
 
+        if self.lockstep_clock is not None and self.lockstep_clock.move_to(
+            new_datetime, cash=cash, portfolio_value=portfolio_value
+        ):
+            return
+        self._set_datetime(new_datetime, cash=cash, portfolio_value=portfolio_value)
+
+    def _set_datetime(self, new_datetime, cash=None, portfolio_value=None):
+        """Moves the clock of the data sources to new_datetime"""
         self.data_source._update_datetime(new_datetime, cash=cash, portfolio_value=portfolio_value)
         if self.option_source:
             self.option_source._update_datetime(new_datetime, cash=cash, portfolio_value=portfolio_value)
@@ -120,81 +112,88 @@ class BacktestingBroker(Broker):
         # All other cases we should continue
         return True
 
+    @property
+    def _trading_days(self):
+        return self._trading_days_df
+
+    @_trading_days.setter
+    def _trading_days(self, trading_days):
+        """Set the trading days, indexed and sorted by market close. The open and close times are also kept as int64
+        nanoseconds so that the clock functions are a searchsorted on plain integers."""
+        self._trading_days_df = trading_days
+        self._market_close_ns = trading_days.index.asi8
+        self._market_open_ns = pd.DatetimeIndex(trading_days["market_open"]).asi8
+
+    @staticmethod
+    def _to_ns(dt):
+        """Convert a timezone aware datetime to nanoseconds since the epoch"""
+        if isinstance(dt, pd.Timestamp):
+            return dt.value
+        return (dt - EPOCH) // ONE_MICROSECOND * 1000
+
     def is_market_open(self):
         """Return True if market is open else false"""
-        now = self.datetime
+        now = self._to_ns(self.datetime)
 
-        # As the index is sorted, use searchsorted to find the relevant day
-        idx = self._trading_days.index.searchsorted(now, side='right')
+        # The trading day is the first one that closes after now
+        idx = self._market_close_ns.searchsorted(now, side='right')
 
         # Check that the index is not out of bounds
-        if idx >= len(self._trading_days):
+        if idx >= len(self._market_close_ns):
             logging.error("Cannot predict future")
             return False
 
-        # The index of the trading_day is used as the market close time
-        market_close = self._trading_days.index[idx]
-
-        # Retrieve market open time using .at since idx is a valid datetime index
-        market_open = self._trading_days.at[market_close, 'market_open']
-
         # Check if 'now' is within the trading hours of the located day
-        return market_open <= now < market_close
+        return int(self._market_open_ns[idx]) <= now < int(self._market_close_ns[idx])
 
     def _get_next_trading_day(self):
-        now = self.datetime
-        search = self._trading_days[now < self._trading_days.market_open]
-        if search.empty:
+        now = self._to_ns(self.datetime)
+        idx = self._market_open_ns.searchsorted(now, side='right')
+        if idx >= len(self._market_open_ns):
             logging.error("Cannot predict future")
 
-        return search.market_open[0].to_pydatetime()
+        return self._trading_days["market_open"].iloc[idx].to_pydatetime()
 
     def get_time_to_open(self):
         """Return the remaining time for the market to open in seconds"""
         now = self.datetime
+        now_ns = self._to_ns(now)
 
-        search = self._trading_days[now < self._trading_days.index]
-        if search.empty:
+        idx = self._market_close_ns.searchsorted(now_ns, side='right')
+        if idx >= len(self._market_close_ns):
             logging.error("Cannot predict future")
             return 0
 
-        trading_day = search.iloc[0]
-        open_time = trading_day.market_open
+        open_ns = int(self._market_open_ns[idx])
 
         # For Backtesting, sometimes the user can just pass in dates (i.e. 2023-08-01) and not datetimes
         # In this case the "now" variable is starting at midnight, so we need to adjust the open_time to be actual
         # market open time.  In the case where the user passes in a time inside a valid trading day, use that time
         # as the start of trading instead of market open.
-        if self.IS_BACKTESTING_BROKER and now > open_time:
+        if self.IS_BACKTESTING_BROKER and now_ns > open_ns:
             open_time = self.data_source.datetime_start
+            if now >= open_time:
+                return 0
+            return (open_time - now).total_seconds()
 
-        if now >= open_time:
+        if now_ns >= open_ns:
             return 0
 
-        delta = open_time - now
-        return delta.total_seconds()
+        return (open_ns - now_ns) / 1e9
 
     def get_time_to_close(self):
         """Return the remaining time for the market to close in seconds"""
-        now = self.datetime
-
-        # Use searchsorted for efficient searching and reduce unnecessary DataFrame access
-        idx = self._trading_days.index.searchsorted(now, side='left')
+        now = self._to_ns(self.datetime)
 
-        if idx >= len(self._trading_days):
+        idx = self._market_close_ns.searchsorted(now, side='left')
+        if idx >= len(self._market_close_ns):
             logging.error("Cannot predict future")
             return 0
 
-        # Directly access the data needed using more efficient methods
-        market_close_time = self._trading_days.index[idx]
-        market_open = self._trading_days.at[market_close_time, 'market_open']
-        market_close = market_close_time  # Assuming this is a scalar value directly from the index
-
-        if now < market_open:
+        if now < self._market_open_ns[idx]:
             return None
 
-        delta = market_close - now
-        return delta.total_seconds()
+        return (int(self._market_close_ns[idx]) - now) / 1e9
 
     def _await_market_to_open(self, timedelta=None, strategy=None):
         # Process outstanding orders first before waiting for market to open
@@ -408,6 +407,20 @@ class BacktestingBroker(Broker):
             wait_until_complete=True,
             order=order,
         )
+
+        if order.was_transmitted() and order.order_class and order.order_class == "oco":
+            orders = self._flatten_order(order)
+            for flat_order in orders:
+                logger.info(f"{flat_order} was sent to broker {self.name}")
+                self._new_orders.append(flat_order)
+
+            # Remove the original order from the list of new orders because
+            # it's been replaced by the individual orders
+            self._new_orders.remove(order)
+        elif order not in self._new_orders:
+            # David M: This seems weird and I don't understand why we're doing this.  It seems like
+            # we're adding the order to the new orders list twice, so checking first.
+            self._new_orders.append(order)
         return order
 
     def submit_orders(self, orders, is_multileg=False, **kwargs):
@@ -540,6 +553,11 @@ class BacktestingBroker(Broker):
         if self.data_source.SOURCE != "PANDAS":
             return
 
+        # The positions are kept by expiration, most of the time nothing has expired yet
+        positions = self._filled_positions.expiring(self.datetime.date(), strategy.name)
+        if not positions:
+            return
+
         # If it's the same day as the expiration, we need to check the time to see if it's after market close
         time_to_close = self.get_time_to_close()
 
@@ -550,17 +568,35 @@ class BacktestingBroker(Broker):
         # Calculate the number of seconds before market close
         seconds_before_closing = strategy.minutes_before_closing * 60
 
-        positions = self.get_tracked_positions(strategy.name)
         for position in positions:
-            if position.asset.expiration is not None and position.asset.expiration <= self.datetime.date():
-                # If the contract has expired, we should sell it
-                if position.asset.expiration == self.datetime.date() and time_to_close > seconds_before_closing:
-                    continue
+            # If the contract has expired, we should sell it
+            if position.asset.expiration == self.datetime.date() and time_to_close > seconds_before_closing:
+                continue
+
+            logger.info(f"Automatically selling expired contract for asset {position.asset}")
 
-                logger.info(f"Automatically selling expired contract for asset {position.asset}")
+            # Cash settle the options contract
+            self.cash_settle_options_contract(position, strategy)
 
-                # Cash settle the options contract
-                self.cash_settle_options_contract(position, strategy)
+    def has_expired_contracts(self, strategy, dt):
+        """Return True if the strategy holds contracts that have expired at the market close of the date of dt, the
+        ones process_expired_option_contracts would settle then.
+
+        Parameters
+        ----------
+        strategy : Strategy object.
+            Strategy object.
+        dt : datetime
+            A datetime in the session to check.
+
+        Returns
+        -------
+        bool
+        """
+        if self.data_source.SOURCE != "PANDAS":
+            return False
+
+        return bool(self._filled_positions.expiring(dt.date(), strategy.name))
 
     def calculate_trade_cost(self, order: Order, strategy, price: float):
         """Calculate the trade cost of an order for a given strategy"""
@@ -604,12 +640,31 @@ class BacktestingBroker(Broker):
         self.process_expired_option_contracts(strategy)
 
         pending_orders = [
-            order for order in self.get_tracked_orders(strategy.name) if order.status in ["unprocessed", "new"]
+            order
+            for order in self._orders.get_orders(strategy.name, statuses=("unprocessed", "new"))
+            if order.status in ["unprocessed", "new"]
         ]
 
         if len(pending_orders) == 0:
             return
 
+        # Get the bar of each asset once, then evaluate the orders of each asset together. The fill prices only
+        # depend on the bar and on each order, so they can be computed before any order is filled.
+        bars = {}
+        orders_by_bar = {}
+        for order in pending_orders:
+            if order.dependent_order_filled or order.status == self.CANCELED_ORDER or order.is_parent():
+                continue
+            key = self._get_order_bar_key(order)
+            if key not in bars:
+                bars[key] = self._get_order_bar(strategy, order)
+            orders_by_bar.setdefault(key, []).append(order)
+
+        fill_prices = {}
+        for key, orders in orders_by_bar.items():
+            if bars[key] is not None:
+                fill_prices.update(zip(map(id, orders), self._get_fill_prices(orders, bars[key])))
+
         for order in pending_orders:
             if order.dependent_order_filled or order.status == self.CANCELED_ORDER:
                 continue
@@ -632,108 +687,29 @@ class BacktestingBroker(Broker):
 
                 continue
 
-            # Check validity if current date > valid date, cancel order. todo valid date
-            asset = order.asset if order.asset.asset_type != "crypto" else (order.asset, order.quote)
-
-            price = None
             filled_quantity = order.quantity
 
-            #############################
-            # Get OHLCV data for the asset
-            #############################
-
-            # Get the OHLCV data for the asset if we're using the YAHOO, CCXT data source
-            data_source_name = self.data_source.SOURCE.upper()
-            if data_source_name in ["CCXT", "YAHOO"]:
-                # If we're using the CCXT data source, we don't need to timeshift the data
-                if data_source_name == "CCXT":
-                    timeshift = None
-                else:
-                    timeshift = timedelta(
-                        days=-1
-                    )  # Is negative so that we get today (normally would get yesterday's data to prevent lookahead bias)
-
-                ohlc = strategy.get_historical_prices(
-                    asset,
-                    1,
-                    quote=order.quote,
-                    timeshift=timeshift,
-                )
-
-                dt = ohlc.df.index[-1]
-                open = ohlc.df['open'].iloc[-1]
-                high = ohlc.df['high'].iloc[-1]
-                low = ohlc.df['low'].iloc[-1]
-                close = ohlc.df['close'].iloc[-1]
-                volume = ohlc.df['volume'].iloc[-1]
-
-            # Get the OHLCV data for the asset if we're using the PANDAS data source
-            elif self.data_source.SOURCE == "PANDAS":
-                # This is a hack to get around the fact that we need to get the previous day's data to prevent lookahead bias.
-                ohlc = strategy.get_historical_prices(
-                    asset,
-                    2,
-                    quote=order.quote,
-                    timeshift=-2,
-                    timestep=self.data_source._timestep,
-                )
-                # Check if we got any ohlc data
-                if ohlc is None:
-                    self.cancel_order(order)
-                    continue
-
-                df_original = ohlc.df
-
-                # Make sure that we are only getting the prices for the current time exactly or in the future
-                df = df_original[df_original.index >= self.datetime]
-
-                # If the dataframe is empty, then we should get the last row of the original dataframe
-                # because it is the best data we have
-                if df.empty:
-                    df = df_original.iloc[-1:]
-
-                dt = df.index[0]
-                open = df["open"].iloc[0]
-                high = df["high"].iloc[0]
-                low = df["low"].iloc[0]
-                close = df["close"].iloc[0]
-                volume = df["volume"].iloc[0]
+            # Check if we got any ohlc data
+            ohlc = bars[self._get_order_bar_key(order)]
+            if ohlc is None:
+                self.cancel_order(order)
+                continue
 
             #############################
             # Determine transaction price.
             #############################
 
-            if order.type == "market":
-                price = open
-
-            elif order.type == "limit":
-                price = self.limit_order(order.limit_price, order.side, open, high, low)
-
-            elif order.type == "stop":
-                price = self.stop_order(order.stop_price, order.side, open, high, low)
+            price, stop_triggered = fill_prices[id(order)]
 
-            elif order.type == "stop_limit":
-                if not order.price_triggered:
-                    price = self.stop_order(order.stop_price, order.side, open, high, low)
-                    if price is not None:
-                        price = self.limit_order(order.limit_price, order.side, price, high, low)
-                        order.price_triggered = True
-                elif order.price_triggered:
-                    price = self.limit_order(order.limit_price, order.side, open, high, low)
+            if order.type == "stop_limit" and stop_triggered:
+                order.price_triggered = True
 
             elif order.type == "trailing_stop":
-                if order._trail_stop_price:
-                    # Check if we have hit the trail stop price for both sell/buy orders
-                    price = self.stop_order(order._trail_stop_price, order.side, open, high, low)
-
                 # Update the stop price if the price has moved
                 if order.side == "sell":
-                    order.update_trail_stop_price(high)
+                    order.update_trail_stop_price(ohlc["high"])
                 elif order.side == "buy":
-                    order.update_trail_stop_price(low)
-
-            else:
-                raise ValueError(f"Order type {order.type} is not implemented for backtesting.")
+                    order.update_trail_stop_price(ohlc["low"])
 
             #############################
             # Fill the order.
@@ -769,6 +745,177 @@ class BacktestingBroker(Broker):
             else:
                 continue
 
+    @staticmethod
+    def _get_order_bar_key(order):
+        # Check validity if current date > valid date, cancel order. todo valid date
+        asset = order.asset if order.asset.asset_type != "crypto" else (order.asset, order.quote)
+        return asset, order.quote
+
+    def _get_order_bar(self, strategy, order):
+        """Returns the OHLCV bar the order is evaluated against as a dict, None if there is no data."""
+        asset, quote = self._get_order_bar_key(order)
+
+        # Get the OHLCV data for the asset if we're using the YAHOO, CCXT data source
+        data_source_name = self.data_source.SOURCE.upper()
+        if data_source_name in ["CCXT", "YAHOO"]:
+            # If we're using the CCXT data source, we don't need to timeshift the data
+            if data_source_name == "CCXT":
+                timeshift = None
+            else:
+                timeshift = timedelta(
+                    days=-1
+                )  # Is negative so that we get today (normally would get yesterday's data to prevent lookahead bias)
+
+            ohlc = strategy.get_historical_prices(
+                asset,
+                1,
+                quote=quote,
+                timeshift=timeshift,
+            )
+
+            bar = {"datetime": ohlc.df.index[-1]}
+            for column in ["open", "high", "low", "close", "volume"]:
+                bar[column] = ohlc.df[column].iloc[-1]
+            return bar
+
+        # Get the OHLCV data for the asset if we're using the PANDAS data source
+        elif self.data_source.SOURCE == "PANDAS":
+            if self.option_source is not None and order.asset.asset_type == "option":
+                return self._get_fill_bar_from_bars(strategy, asset, quote)
+            return self.data_source.get_fill_bar(
+                asset,
+                quote=quote if quote is not None else strategy.quote_asset,
+                timestep=self.data_source._timestep,
+            )
+
+        raise ValueError(f"Orders can't be filled in backtesting with the {self.data_source.SOURCE} data source.")
+
+    def _get_fill_bar_from_bars(self, strategy, asset, quote):
+        """Returns the bar to fill orders against from the historical prices of the strategy, for the option
+        source which has no `get_fill_bar`."""
+        # This is a hack to get around the fact that we need to get the previous day's data to prevent lookahead bias.
+        ohlc = strategy.get_historical_prices(
+            asset,
+            2,
+            quote=quote,
+            timeshift=-2,
+            timestep=self.data_source._timestep,
+        )
+        if ohlc is None:
+            return None
+
+        df_original = ohlc.df
+
+        # Make sure that we are only getting the prices for the current time exactly or in the future
+        df = df_original[df_original.index >= self.datetime]
+
+        # If the dataframe is empty, then we should get the last row of the original dataframe
+        # because it is the best data we have
+        if df.empty:
+            df = df_original.iloc[-1:]
+
+        bar = {"datetime": df.index[0]}
+        for column in ["open", "high", "low", "close", "volume"]:
+            bar[column] = df[column].iloc[0]
+        return bar
+
+    def _get_fill_prices(self, orders, bar):
+        """Returns (price, stop_triggered) for each order of the same asset evaluated against the bar.
+
+        price is None if the order doesn't fill. stop_triggered is True when the stop of a stop_limit order is
+        reached. Many orders are evaluated with numpy in one pass, a few one at a time with `limit_order` and
+        `stop_order`, which give the same results.
+        """
+        open_, high, low = bar["open"], bar["high"], bar["low"]
+        for order in orders:
+            if order.type not in ["market", "limit", "stop", "stop_limit", "trailing_stop"]:
+                raise ValueError(f"Order type {order.type} is not implemented for backtesting.")
+
+        trigger_prices = [p for o in orders for p in (o.limit_price, o.stop_price, o._trail_stop_price)]
+        if len(orders) < self.VECTORIZED_FILL_MIN_ORDERS or not all(
+            type(value) in self._VECTORIZED_PRICE_TYPES for value in [open_, high, low, *trigger_prices]
+        ):
+            return [self._get_fill_price(order, open_, high, low) for order in orders]
+
+        def nan_if_none(values):
+            return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+        is_sell = np.array([order.side == "sell" for order in orders])
+        types = np.array([order.type for order in orders])
+        limit_prices = nan_if_none([order.limit_price for order in orders])
+        stop_prices = nan_if_none([order.stop_price for order in orders])
+        trail_prices = nan_if_none([order._trail_stop_price or None for order in orders])
+        price_triggered = np.array([bool(order.price_triggered) for order in orders])
+
+        # Result codes: 0 no fill, 1 the open, 2 the stop (or trail stop) price, 3 the limit price
+        def limit_codes(reference, prices, reference_code):
+            gap = np.where(is_sell, prices <= reference, prices >= reference)
+            touched = (low <= prices) & (prices <= high)
+            return np.where(gap, reference_code, np.where(touched, 3, 0))
+
+        def stop_codes(prices):
+            gap = np.where(is_sell, prices >= open_, prices <= open_)
+            touched = (low <= prices) & (prices <= high)
+            return np.where(gap, 1, np.where(touched, 2, 0))
+
+        stop_limit = (types == "stop_limit") & ~price_triggered
+        stops = stop_codes(np.where(types == "trailing_stop", trail_prices, stop_prices))
+        stop_limit_reference = np.where(stops == 2, stop_prices, open_)
+        # The limit of a stop_limit order is checked against the stop fill price, the open if it gapped
+        stop_limit_codes = np.where(
+            stops == 0, 0, limit_codes(stop_limit_reference, limit_prices, np.where(stops == 2, 2, 1))
+        )
+
+        codes = np.select(
+            [types == "market", types == "limit", types == "stop", stop_limit, types == "stop_limit"],
+            [1, limit_codes(open_, limit_prices, 1), stops, stop_limit_codes, limit_codes(open_, limit_prices, 1)],
+            default=np.where(np.isnan(trail_prices), 0, stops),
+        )
+
+        results = []
+        for order, code, is_stop_limit, stop in zip(orders, codes.tolist(), stop_limit.tolist(), stops.tolist()):
+            if code == 0:
+                price = None
+            elif code == 1:
+                price = open_
+            elif code == 3:
+                price = order.limit_price
+            elif order.type == "trailing_stop":
+                price = order._trail_stop_price
+            else:
+                price = order.stop_price
+            results.append((price, is_stop_limit and stop != 0))
+        return results
+
+    def _get_fill_price(self, order, open_, high, low):
+        """Returns (price, stop_triggered) for one order evaluated against a bar, see `_get_fill_prices`."""
+        price = None
+        stop_triggered = False
+        if order.type == "market":
+            price = open_
+
+        elif order.type == "limit":
+            price = self.limit_order(order.limit_price, order.side, open_, high, low)
+
+        elif order.type == "stop":
+            price = self.stop_order(order.stop_price, order.side, open_, high, low)
+
+        elif order.type == "stop_limit":
+            if not order.price_triggered:
+                price = self.stop_order(order.stop_price, order.side, open_, high, low)
+                if price is not None:
+                    price = self.limit_order(order.limit_price, order.side, price, high, low)
+                    stop_triggered = True
+            elif order.price_triggered:
+                price = self.limit_order(order.limit_price, order.side, open_, high, low)
+
+        elif order.type == "trailing_stop":
+            if order._trail_stop_price:
+                # Check if we have hit the trail stop price for both sell/buy orders
+                price = self.stop_order(order._trail_stop_price, order.side, open_, high, low)
+
+        return price, stop_triggered
+
     def limit_order(self, limit_price, side, open_, high, low):
         """Limit order logic."""
         # Gap Up case: Limit wasn't triggered by previous candle but current candle opens higher, fill it now
@@ -811,10 +958,16 @@ class BacktestingBroker(Broker):
     # ==========Processing streams data=======================
 
     def _get_stream_object(self):
-        """get the broker stream connection"""
-        stream = CustomStream()
+        """get the broker stream connection. The events are processed in the thread dispatching them, so filling an
+        order does not have to wait for a stream thread"""
+        stream = DirectStream()
         return stream
 
+    def _launch_stream(self):
+        """Register the actions of the stream. There is no stream thread to start, see _get_stream_object"""
+        self._register_stream_events()
+        self._stream_established()
+
     def _register_stream_events(self):
         """Register the function on_trade_event
         to be executed on each trade_update event"""
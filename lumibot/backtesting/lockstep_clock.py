@@ -0,0 +1,98 @@
+import threading
+
+
+class LockstepClock:
+    """Runs the strategies of a multi-strategy backtest one at a time, in lockstep on the clock of their broker.
+
+    Every strategy runs in its own executor thread and moves the clock of the shared broker the way it does when it
+    is backtested alone. When a strategy moves the clock past the time another strategy is waiting for, it waits
+    instead: the clock only moves to the earliest time a strategy is waiting for, and that strategy runs next.
+    Strategies waiting for the same time run in the order they were added. Only one strategy runs at a time, so
+    every strategy sees the clock, the data and its orders exactly as it would if it was backtested alone.
+
+    Parameters
+    ----------
+    broker : BacktestingBroker
+        The broker shared by the strategies.
+    threads : list of StrategyExecutor
+        The executor threads of the strategies, in order.
+    """
+
+    def __init__(self, broker, threads):
+        self._broker = broker
+        self._ranks = {thread: rank for rank, thread in enumerate(threads)}
+        self._condition = threading.Condition()
+
+        # The threads that have not finished, and the thread running its strategy, if any
+        self._active = set(threads)
+        self._turn = None
+        # thread -> (datetime in nanoseconds, rank, datetime, cash, portfolio value) the thread waits for
+        self._waiting = {}
+
+    def start(self):
+        """Waits for the current thread to have its turn to start running its strategy."""
+        with self._condition:
+            self._wait(self._broker.datetime)
+
+    def finish(self):
+        """Lets the other strategies run once the strategy of the current thread has finished."""
+        thread = threading.current_thread()
+        with self._condition:
+            self._active.discard(thread)
+            self._waiting.pop(thread, None)
+            if self._turn is thread:
+                self._turn = None
+            self._next()
+
+    def move_to(self, dt, cash=None, portfolio_value=None):
+        """Moves the clock to dt for the strategy of the current thread, once the strategies that have to run before
+        that time have run.
+
+        Parameters
+        ----------
+        dt : datetime
+            The datetime the strategy moves the clock to.
+        cash : float, optional
+            The cash of the strategy, passed on to the data sources with the new datetime.
+        portfolio_value : float, optional
+            The portfolio value of the strategy, passed on to the data sources with the new datetime.
+
+        Returns
+        -------
+        bool
+            False if the current thread does not run one of the strategies, in which case the clock is not moved.
+        """
+        thread = threading.current_thread()
+        rank = self._ranks.get(thread)
+        if rank is None:
+            return False
+
+        with self._condition:
+            # The clock can move freely, even back, as long as no other strategy waits for an earlier time
+            waiting = [waiting[:2] for waiting in self._waiting.values()]
+            if not waiting or (self._broker._to_ns(dt), rank) < min(waiting):
+                self._broker._set_datetime(dt, cash=cash, portfolio_value=portfolio_value)
+                return True
+
+            self._turn = None
+            self._wait(dt, cash, portfolio_value)
+        return True
+
+    def _wait(self, dt, cash=None, portfolio_value=None):
+        thread = threading.current_thread()
+        self._waiting[thread] = (self._broker._to_ns(dt), self._ranks[thread], dt, cash, portfolio_value)
+        self._next()
+        while self._turn is not thread:
+            self._condition.wait()
+
+    def _next(self):
+        # Wait for every strategy to be waiting for a time before choosing the next one
+        if self._turn is not None or not self._waiting or len(self._waiting) < len(self._active):
+            return
+
+        thread = min(self._waiting, key=lambda waiting_thread: self._waiting[waiting_thread][:2])
+        _, _, dt, cash, portfolio_value = self._waiting.pop(thread)
+        if dt != self._broker.datetime:
+            self._broker._set_datetime(dt, cash=cash, portfolio_value=portfolio_value)
+        self._turn = thread
+        self._condition.notify_all()
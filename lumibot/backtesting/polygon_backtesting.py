@@ -168,7 +168,14 @@ class PolygonDataBacktesting(PandasData):
 
         if (df is None) or df.empty:
             return
-        data = Data(asset_separated, df, timestep=ts_unit, quote=quote_asset)
+        data = Data(
+            asset_separated,
+            df,
+            timestep=ts_unit,
+            quote=quote_asset,
+            storage_dir=self.storage_dir,
+            compact=self.compact,
+        )
         pandas_data_update = self._set_pandas_data_keys([data])
         # Add the keys to the self.pandas_data dictionary
         self.pandas_data.update(pandas_data_update)
@@ -196,7 +196,14 @@ class ThetaDataBacktesting(PandasData):
         if df is None or df.empty:
             return None
 
-        data = Data(asset_separated, df, timestep=ts_unit, quote=quote_asset)
+        data = Data(
+            asset_separated,
+            df,
+            timestep=ts_unit,
+            quote=quote_asset,
+            storage_dir=self.storage_dir,
+            compact=self.compact,
+        )
         pandas_data_update = self._set_pandas_data_keys([data])
         if pandas_data_update is not None:
             # Add the keys to the self.pandas_data dictionary
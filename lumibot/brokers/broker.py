@@ -15,7 +15,7 @@ from termcolor import colored
 
 from ..data_sources import DataSource
 from ..entities import Asset, Order, Position
-from ..trading_builtins import SafeList
+from ..trading_builtins import OrderStore, PositionLedger, SafeList, TradeEventLog
 
 
 class CustomLoggerAdapter(logging.LoggerAdapter):
@@ -46,21 +46,26 @@ class Broker(ABC):
     ERROR_ORDER = "error"
 
     def __init__(self, name="", connect_stream=True, data_source: DataSource = None, option_source: DataSource = None,
-                 config=None, max_workers=20, extended_trading_minutes=0):
+                 config=None, max_workers=20, extended_trading_minutes=0, archive_terminal_orders=False,
+                 trade_events_parquet_dir=None):
         """Broker constructor"""
         # Shared Variables between threads
         self.name = name
         self._lock = RLock()
-        self._unprocessed_orders = SafeList(self._lock)
-        self._new_orders = SafeList(self._lock)
-        self._canceled_orders = SafeList(self._lock)
-        self._partially_filled_orders = SafeList(self._lock)
-        self._filled_orders = SafeList(self._lock)
-        self._error_orders = SafeList(self._lock)
-        self._filled_positions = SafeList(self._lock)
+        # Orders are indexed by status, identifier, strategy and asset. Filled, errored and canceled orders can be
+        # archived so that get_tracked_orders only returns the orders that are still active.
+        self._orders = OrderStore(self._lock, archive_terminal=archive_terminal_orders)
+        self._unprocessed_orders = self._orders.view("unprocessed")
+        self._new_orders = self._orders.view("new")
+        self._canceled_orders = self._orders.view("canceled")
+        self._partially_filled_orders = self._orders.view("partially_filled")
+        self._filled_orders = self._orders.view("filled")
+        self._error_orders = self._orders.view("error")
+        self._filled_positions = PositionLedger(self._lock)
         self._subscribers = SafeList(self._lock)
         self._is_stream_subscribed = False
-        self._trade_event_log_df = pd.DataFrame()
+        # Trade events are kept in memory, and also written to Parquet files as the log grows if a directory is given
+        self._trade_event_log = TradeEventLog(parquet_dir=trade_events_parquet_dir)
         self._hold_trade_events = False
         self._held_trades = []
         self._config = config
@@ -265,12 +270,7 @@ class Broker(ABC):
                 continue
 
             # Check against existing position.
-            position_lumi = [
-                pos_lumi
-                for pos_lumi in self._filled_positions.get_list()
-                if pos_lumi.asset == position.asset
-            ]
-            position_lumi = position_lumi[0] if len(position_lumi) > 0 else None
+            position_lumi = self._filled_positions.get(position.asset)
 
             if position_lumi:
                 # Compare to existing lumi position.
@@ -292,13 +292,9 @@ class Broker(ABC):
 
         # Now iterate through lumibot positions.
         # Remove lumibot position if not at the broker.
+        broker_assets = {position.asset for position in positions_broker if position is not None}
         for position in self._filled_positions.get_list():
-            found = False
-            for position_broker in positions_broker:
-                if position_broker.asset == position.asset:
-                    found = True
-                    break
-            if not found and (position.asset not in self.quote_assets):
+            if position.asset not in broker_assets and position.asset not in self.quote_assets:
                 self._filled_positions.remove(position)
 
     # =========Market functions=======================
@@ -350,9 +346,7 @@ class Broker(ABC):
     # ================================ Common functions ================================
     @property
     def _tracked_orders(self):
-        return (self._unprocessed_orders.get_list() + self._new_orders.get_list() +
-                self._partially_filled_orders.get_list() + self._filled_orders.get_list() + 
-                self._error_orders.get_list() + self._canceled_orders.get_list())
+        return self._orders.get_orders(statuses=OrderStore.STATUSES)
 
     def is_backtesting_broker(self):
         return self.IS_BACKTESTING_BROKER
@@ -824,10 +818,7 @@ class Broker(ABC):
     def get_tracked_position(self, strategy, asset):
         """get a tracked position given an asset and
         a strategy"""
-        for position in self._filled_positions:
-            if position.asset == asset and (not strategy or position.strategy == strategy):
-                return position
-        return None
+        return self._filled_positions.get(asset, strategy)
 
     def get_tracked_positions(self, strategy=None):
         """get all tracked positions for a given strategy"""
@@ -838,20 +829,11 @@ class Broker(ABC):
 
     def get_tracked_order(self, identifier):
         """get a tracked order given an identifier"""
-        for order in self._tracked_orders:
-            if order.identifier == identifier:
-                return order
-        return None
+        return self._orders.get_order(identifier)
 
     def get_tracked_orders(self, strategy=None, asset=None) -> list[Order]:
-        """get all tracked orders for a given strategy"""
-        result = []
-        tracked_orders = self._tracked_orders
-        for order in tracked_orders:
-            if (strategy is None or order.strategy == strategy) and (asset is None or order.asset == asset):
-                result.append(order)
-
-        return result
+        """get all tracked orders for a given strategy. Archived orders are left out, see archive_terminal_orders"""
+        return self._orders.get_orders(strategy, asset)
 
     def get_all_orders(self) -> list[Order]:
         """get all tracked and completed orders"""
@@ -860,10 +842,7 @@ class Broker(ABC):
 
     def get_order(self, identifier) -> Order:
         """get a tracked order given an identifier"""
-        for order in self.get_all_orders():
-            if order.identifier == identifier:
-                return order
-        return None
+        return self._orders.get_order(identifier)
 
     def get_tracked_assets(self, strategy):
         """Get the list of assets for positions
@@ -1002,15 +981,9 @@ class Broker(ABC):
         # Returns true if outstanding orders for a strategy are complete.
 
         while max_loop > 0:
-            outstanding_orders = [
-                order
-                for order in (
-                    self._unprocessed_orders.get_list()
-                    + self._new_orders.get_list()
-                    + self._partially_filled_orders.get_list()
-                )
-                if order.strategy == strategy
-            ]
+            outstanding_orders = self._orders.get_orders(
+                strategy, statuses=("unprocessed", "new", "partially_filled")
+            )
 
             if len(outstanding_orders) > 0:
                 time.sleep(0.25)
@@ -1245,14 +1218,8 @@ class Broker(ABC):
             "asset.expiration": stored_order.asset.expiration if stored_order.asset is not None else None,
             "asset.asset_type": stored_order.asset.asset_type if stored_order.asset is not None else None,
         }
-        # Create a DataFrame with the new row
-        new_row_df = pd.DataFrame(new_row, index=[0])
-
-        # Filter out empty or all-NA columns from new_row_df
-        new_row_df = new_row_df.dropna(axis=1, how="all")
-
-        # Concatenate the filtered new_row_df with the existing _trade_event_log_df
-        self._trade_event_log_df = pd.concat([self._trade_event_log_df, new_row_df], axis=0)
+        # The DataFrame of the events is only built when it is asked for, see _trade_event_log_df
+        self._trade_event_log.append(new_row)
 
         return
 
@@ -1272,9 +1239,16 @@ class Broker(ABC):
                     break
         return
 
+    @property
+    def _trade_event_log_df(self):
+        """The trade events as a DataFrame, one row per event"""
+        return self._trade_event_log.to_dataframe()
+
     def export_trade_events_to_csv(self, filename):
-        if len(self._trade_event_log_df) > 0:
-            output_df = self._trade_event_log_df.set_index("time")
+        # Built from the event log on every access, so only read once
+        trade_event_log_df = self._trade_event_log_df
+        if len(trade_event_log_df) > 0:
+            output_df = trade_event_log_df.set_index("time")
             output_df.to_csv(filename)
 
     def set_strategy_name(self, strategy_name):
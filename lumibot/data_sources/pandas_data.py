@@ -1,16 +1,124 @@
+import bisect
 import logging
 from collections import defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 
+import numpy as np
 import pandas as pd
 from lumibot.data_sources import DataSourceBacktesting
-from lumibot.entities import Asset, Bars
+from lumibot.entities import Asset, Bars, Data
+from lumibot.entities.data import DataClock
+
+
+class PandasDataStore(OrderedDict):
+    """
+    OrderedDict of (asset, quote) keys to Data that keeps an index of the option contracts it holds:
+    underlying symbol -> right -> expiration -> sorted list of strikes. The index is updated whenever keys are
+    added or removed so option chain and strike lookups don't have to scan every key of the store.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._chains = {}
+        self._contract_counts = {}
+        super().__init__(*args, **kwargs)
+
+    @staticmethod
+    def _get_option(key):
+        asset = key[0] if isinstance(key, tuple) else key
+        if isinstance(asset, Asset) and asset.asset_type == "option":
+            return asset
+        return None
+
+    def _index_key(self, key):
+        option = self._get_option(key)
+        if option is None:
+            return
+        contract = (option.symbol, option.right, option.expiration, option.strike)
+        # The same contract can be stored for several quotes, only index its strike once
+        self._contract_counts[contract] = self._contract_counts.get(contract, 0) + 1
+        if self._contract_counts[contract] == 1:
+            rights = self._chains.setdefault(option.symbol, {})
+            strikes = rights.setdefault(option.right, {}).setdefault(option.expiration, [])
+            bisect.insort(strikes, option.strike)
+
+    def _unindex_key(self, key):
+        option = self._get_option(key)
+        if option is None:
+            return
+        contract = (option.symbol, option.right, option.expiration, option.strike)
+        self._contract_counts[contract] -= 1
+        if self._contract_counts[contract] == 0:
+            del self._contract_counts[contract]
+            expirations = self._chains[option.symbol][option.right]
+            strikes = expirations[option.expiration]
+            del strikes[bisect.bisect_left(strikes, option.strike)]
+            if not strikes:
+                del expirations[option.expiration]
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._index_key(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._unindex_key(key)
+
+    def pop(self, key, *args):
+        if key in self:
+            self._unindex_key(key)
+        return super().pop(key, *args)
+
+    def popitem(self, last=True):
+        key, value = super().popitem(last=last)
+        self._unindex_key(key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def clear(self):
+        super().clear()
+        self._chains.clear()
+        self._contract_counts.clear()
+
+    def get_rights(self, symbol):
+        """Returns the rights of the option contracts of `symbol`."""
+        return list(self._chains.get(symbol, {}))
+
+    def get_expirations(self, symbol, right):
+        """Returns the sorted expirations of the option contracts of `symbol` with the given right."""
+        return sorted(self._chains.get(symbol, {}).get(right, {}))
+
+    def get_strikes(self, symbol, right, expiration):
+        """Returns the sorted strikes of the option contracts of `symbol` with the given right and expiration."""
+        return self._chains.get(symbol, {}).get(right, {}).get(expiration, [])
+
+    def get_nearest_strike(self, symbol, right, expiration, price):
+        """Returns the strike closest to `price`, or None if there are no contracts. Ties go to the lower strike."""
+        strikes = self.get_strikes(symbol, right, expiration)
+        if not strikes:
+            return None
+        i = bisect.bisect_left(strikes, price)
+        if i == 0:
+            return strikes[0]
+        if i == len(strikes):
+            return strikes[-1]
+        return strikes[i - 1] if price - strikes[i - 1] <= strikes[i] - price else strikes[i]
 
 
 class PandasData(DataSourceBacktesting):
     """
     PandasData is a Backtesting-only DataSource that uses a Pandas DataFrame (read from CSV) as the source of
     data for a backtest run. It is not possible to use this class to run a live trading strategy.
+
+    If `storage_dir` is set, it is used as the `storage_dir` of every Data that doesn't have one, so their
+    columns are kept in memory-mapped files instead of RAM. The files outlive the backtest so later runs on the
+    same data reuse them; `Data.clear_storage_dir` deletes them. If `compact` is True, every Data stores its
+    columns with smaller dtypes (see the `compact` parameter of Data for the precision tradeoff).
     """
 
     SOURCE = "PANDAS"
@@ -19,20 +127,23 @@ class PandasData(DataSourceBacktesting):
         {"timestep": "minute", "representations": ["1M", "minute"]},
     ]
 
-    def __init__(self, *args, pandas_data=None, auto_adjust=True, **kwargs):
+    def __init__(self, *args, pandas_data=None, auto_adjust=True, storage_dir=None, compact=False, **kwargs):
         super().__init__(*args, **kwargs)
         self.name = "pandas"
+        self.storage_dir = storage_dir
+        self.compact = compact
         self.pandas_data = self._set_pandas_data_keys(pandas_data)
         self.auto_adjust = auto_adjust
         self._data_store = self.pandas_data
         self._date_index = None
         self._date_supply = None
         self._timestep = "minute"
+        self._clock = None
 
     @staticmethod
     def _set_pandas_data_keys(pandas_data):
         # OrderedDict tracks the LRU dataframes for when it comes time to do evictions.
-        new_pandas_data = OrderedDict()
+        new_pandas_data = PandasDataStore()
 
         def _get_new_pandas_data_key(data):
             # Always save the asset as a tuple of Asset and quote
@@ -72,21 +183,81 @@ class PandasData(DataSourceBacktesting):
         pcal = self.get_trading_days_pandas()
         self._date_index = self.clean_trading_times(self._date_index, pcal)
         for _, data in self._data_store.items():
-            data.repair_times_and_fill(self._date_index)
+            if data.storage_dir is None:
+                data.storage_dir = self.storage_dir
+            if self.compact:
+                data.compact = True
+
+        # The fill is numpy work that releases the GIL, so the assets are filled in parallel threads
+        with ThreadPoolExecutor() as executor:
+            list(executor.map(lambda data: data.repair_times_and_fill(self._date_index), self._data_store.values()))
+
+        # Data reindexed on the same dates share one index array, so that their index lookups can be shared. The
+        # Data aligned with the whole date index share the array of the clock and read their row from it.
+        date_index_ns = np.ascontiguousarray(self._date_index.asi8, dtype=np.int64)
+        index_arrays = {self._index_array_key(date_index_ns): [date_index_ns]}
+        for data in self._data_store.values():
+            index_ns = data.index_ns
+            candidates = index_arrays.setdefault(self._index_array_key(index_ns), [])
+            data.index_ns = next((c for c in candidates if np.array_equal(c, index_ns)), index_ns)
+            if data.index_ns is index_ns:
+                candidates.append(index_ns)
+
+        self._clock = DataClock(date_index_ns)
+        self._clock.advance(self._datetime)
+        for data in self._data_store.values():
+            data.clock = self._clock
         return pcal
 
+    @staticmethod
+    def _index_array_key(index_ns):
+        return len(index_ns), index_ns[:1].tobytes(), index_ns[-1:].tobytes()
+
+    def _update_datetime(self, new_datetime, cash=None, portfolio_value=None):
+        super()._update_datetime(new_datetime, cash=cash, portfolio_value=portfolio_value)
+        # Move the shared bar cursor once for all the aligned Data
+        if self._clock is not None:
+            self._clock.advance(new_datetime)
+
     def clean_trading_times(self, dt_index, pcal):
         # Used to fill in blanks in the data, on trading days, within market trading hours.
-        df = pd.DataFrame(range(len(dt_index)), index=dt_index)
-        df = df.sort_index()
-        df["dates"] = df.index.date
-        df = df.merge(pcal[["market_open", "market_close"]], left_on="dates", right_index=True)
-        if self._timestep == "minute":
-            df = df.asfreq("1min", method="pad")
-            result_index = df.loc[(df.index >= df["market_open"]) & (df.index <= df["market_close"]), :].index
-        else:
-            result_index = df.index
-        return result_index
+        dt_index = dt_index.sort_values()
+
+        # Only keep the datetimes that are on a day of the calendar
+        day_ns = 86_400_000_000_000
+        pcal = pcal.sort_index()
+        cal_days = pd.DatetimeIndex(pcal.index).asi8 // day_ns
+        row_days = dt_index.tz_localize(None).asi8 // day_ns
+        sessions = np.searchsorted(cal_days, row_days).clip(max=max(len(cal_days) - 1, 0))
+        on_calendar = (cal_days[sessions] == row_days) if len(cal_days) else np.zeros(len(row_days), dtype=bool)
+        dt_index = dt_index[on_calendar]
+        sessions = sessions[on_calendar]
+
+        if self._timestep != "minute" or len(dt_index) == 0:
+            return dt_index
+
+        # Every minute from the first datetime, within the session of the last datetime before it. Each day
+        # covers the minutes from the later of its first datetime and market open, to the earlier of the next
+        # day's first datetime and market close.
+        minute_ns = 60_000_000_000
+        rows_ns = dt_index.asi8
+        first_ns = rows_ns[0]
+        day_starts = np.flatnonzero(np.diff(sessions)) + 1
+        day_starts = np.concatenate(([0], day_starts))
+        day_sessions = sessions[day_starts]
+
+        next_day_ns = np.append(rows_ns[day_starts[1:]] - 1, rows_ns[-1])
+        lo = np.maximum(pd.DatetimeIndex(pcal["market_open"]).asi8[day_sessions], rows_ns[day_starts])
+        hi = np.minimum(pd.DatetimeIndex(pcal["market_close"]).asi8[day_sessions], next_day_ns)
+
+        first_minute = -((first_ns - lo) // minute_ns)
+        last_minute = (hi - first_ns) // minute_ns
+        counts = np.maximum(last_minute - first_minute + 1, 0)
+        offsets = np.cumsum(counts) - counts
+        minutes = np.arange(counts.sum()) - np.repeat(offsets - first_minute, counts)
+
+        result_index = pd.DatetimeIndex(first_ns + minutes * minute_ns, tz="UTC", name=dt_index.name)
+        return result_index.tz_convert(dt_index.tz)
 
     def get_trading_days_pandas(self):
         pcal = pd.DataFrame(self._date_index)
@@ -150,12 +321,17 @@ class PandasData(DataSourceBacktesting):
 
     def update_date_index(self):
         dt_index = None
-        for asset, data in self._data_store.items():
-            if dt_index is None:
-                df = data.df
-                dt_index = df.index
-            else:
-                dt_index = dt_index.join(data.df.index, how="outer")
+        indexes = [data.df.index for data in self._data_store.values()]
+        if len(indexes) == 1:
+            dt_index = indexes[0]
+        elif len(indexes) > 1:
+            # Merge the sorted indexes: a stable sort of the concatenation merges the already sorted runs
+            merged = np.concatenate([index.asi8 for index in indexes])
+            merged.sort(kind="stable")
+            is_new = np.empty(len(merged), dtype=bool)
+            is_new[:1] = True
+            np.not_equal(merged[1:], merged[:-1], out=is_new[1:])
+            dt_index = pd.DatetimeIndex(merged[is_new], tz="UTC", name=indexes[0].name).tz_convert(indexes[0].tz)
 
         if dt_index is None:
             # Build a dummy index
@@ -222,11 +398,57 @@ class PandasData(DataSourceBacktesting):
         else:
             return None
 
-    def get_last_prices(self, assets, quote=None, exchange=None, **kwargs):
-        result = {}
-        for asset in assets:
-            result[asset] = self.get_last_price(asset, quote=quote, exchange=exchange)
-        return result
+    def get_last_prices(self, assets, quote=None, exchange=None, as_array=False, **kwargs):
+        """Returns the last known prices of the assets.
+
+        Parameters
+        ----------
+        assets : list of Asset or tuple
+            The assets to get the prices of.
+        quote : Asset, optional
+            The quote asset of the assets.
+        exchange : str, optional
+            Not used by PandasData.
+        as_array : bool, optional
+            If True, returns a float64 numpy array in the order of `assets`, with NaN where there is no price.
+
+        Returns
+        -------
+        dict or numpy.ndarray
+            The prices keyed by asset, None where there is no price, or an array if `as_array` is True.
+        """
+        assets = list(assets)
+        if type(self).get_last_price is PandasData.get_last_price:
+            prices = self._get_last_prices_batch(assets, quote)
+        else:
+            # Subclasses load the data of the asset in get_last_price, so it has to be called for each asset
+            prices = [self.get_last_price(asset, quote=quote, exchange=exchange) for asset in assets]
+
+        if as_array:
+            return np.array([np.nan if price is None else price for price in prices], dtype=np.float64)
+        return dict(zip(assets, prices))
+
+    def _get_last_prices_batch(self, assets, quote=None):
+        # Resolve all the assets first so the Data can share their index lookups
+        datas = []
+        positions = []
+        for position, asset in enumerate(assets):
+            tuple_to_find = self.find_asset_in_data_store(asset, quote)
+            if tuple_to_find in self._data_store:
+                datas.append(self._data_store[tuple_to_find])
+                positions.append(position)
+
+        prices = [None] * len(assets)
+        try:
+            found_prices = Data.get_last_prices(datas, self.get_datetime())
+        except Exception as e:
+            logging.info(f"Error getting last prices, getting them one at a time: {e}")
+            found_prices = [self.get_last_price(assets[position], quote=quote) for position in positions]
+
+        for position, price in zip(positions, found_prices):
+            if price is not None and not pd.isna(price):
+                prices[position] = price
+        return prices
 
     def find_asset_in_data_store(self, asset, quote=None):
         if asset in self._data_store:
@@ -270,7 +492,7 @@ class PandasData(DataSourceBacktesting):
 
         now = self.get_datetime()
         try:
-            res = data.get_bars(now, length=length, timestep=timestep, timeshift=timeshift)
+            res = data.get_bars_arrays(now, length=length, timestep=timestep, timeshift=timeshift)
         # Return None if data.get_bars returns a ValueError
         except ValueError as e:
             logging.info(f"Error getting bars for {asset}: {e}")
@@ -278,6 +500,47 @@ class PandasData(DataSourceBacktesting):
 
         return res
 
+    def get_fill_bar(self, asset, quote=None, timestep=None):
+        """Returns the bar that orders are evaluated against at the current datetime, as scalars.
+
+        This is the first bar starting at or after the current datetime among the current and the next bar,
+        or the last of them if neither does. The bars are read from the Data arrays, so no DataFrame or Bars
+        object is built.
+
+        Parameters
+        ----------
+        asset : Asset or tuple
+            The asset of the order, or (asset, quote) for crypto.
+        quote : Asset, optional
+            The quote asset of the order.
+        timestep : str, optional
+            The timestep of the bars, the timestep of the data source by default.
+
+        Returns
+        -------
+        dict or None
+            The `datetime`, `open`, `high`, `low`, `close` and `volume` of the bar, None if there is no data.
+        """
+        timestep = timestep if timestep else self._timestep
+        # The previous bar is excluded to prevent lookahead bias, so get the current bar and the next one
+        response = self._pull_source_symbol_bars(asset, 2, timestep=timestep, timeshift=-2, quote=quote)
+        if response is None:
+            return None
+
+        if isinstance(response, dict):
+            index = response["datetime"]
+        else:
+            index = response.index
+        if len(index) == 0:
+            return None
+
+        later = np.flatnonzero(index.asi8 >= Data._to_ns(self.get_datetime()))
+        row = later[0] if len(later) else len(index) - 1
+        bar = {"datetime": index[row]}
+        for column in ["open", "high", "low", "close", "volume"]:
+            bar[column] = response[column][row]
+        return bar
+
     def _pull_source_symbol_bars_between_dates(
         self,
         asset,
@@ -336,6 +599,9 @@ class PandasData(DataSourceBacktesting):
         asset2 = quote
         if isinstance(asset, tuple):
             asset1, asset2 = asset
+        if isinstance(response, dict):
+            # Bars pulled from the datalines are numpy arrays, only build the dataframe if it is used
+            return Bars.from_arrays(response, self.SOURCE, asset1, quote=asset2)
         bars = Bars(response, self.SOURCE, asset1, quote=asset2, raw=response)
         return bars
 
@@ -380,16 +646,51 @@ class PandasData(DataSourceBacktesting):
             Chains={"CALL": defaultdict(list), "PUT": defaultdict(list)},
         )
 
-        for store_item, data in self._data_store.items():
-            store_asset = store_item[0]
-            if store_asset.asset_type != "option":
-                continue
-            if store_asset.symbol != asset.symbol:
-                continue
-            chains["Chains"][store_asset.right][store_asset.expiration].append(store_asset.strike)
+        store = self._get_indexed_data_store()
+        for right in store.get_rights(asset.symbol):
+            rights = chains["Chains"].setdefault(right, defaultdict(list))
+            for expiration in store.get_expirations(asset.symbol, right):
+                rights[expiration] = list(store.get_strikes(asset.symbol, right, expiration))
 
         return chains
 
+    def get_strikes(self, asset):
+        """Returns the sorted strikes of the option contracts of the underlying of `asset`. If `asset` is an
+        option with a right and an expiration, only the strikes of that right and expiration are returned."""
+        store = self._get_indexed_data_store()
+        if asset.asset_type == "option" and asset.right is not None and asset.expiration is not None:
+            return list(store.get_strikes(asset.symbol, asset.right, asset.expiration))
+
+        strikes = set()
+        for right in store.get_rights(asset.symbol):
+            for expiration in store.get_expirations(asset.symbol, right):
+                strikes.update(store.get_strikes(asset.symbol, right, expiration))
+        return sorted(strikes)
+
+    def get_nearest_strike(self, asset, price):
+        """Returns the strike closest to `price` among the option contracts with the symbol, right and
+        expiration of the option `asset`, or None if there are none.
+
+        Parameters
+        ----------
+        asset : Asset
+            An option asset with a right and an expiration. Its strike is ignored.
+        price : float
+            The price to find the nearest strike to, usually the last price of the underlying.
+
+        Returns
+        -------
+        float or None
+        """
+        store = self._get_indexed_data_store()
+        return store.get_nearest_strike(asset.symbol, asset.right, asset.expiration, price)
+
+    def _get_indexed_data_store(self):
+        # The data store is a PandasDataStore unless it was replaced with a plain dict, then index a copy of it
+        if isinstance(self._data_store, PandasDataStore):
+            return self._data_store
+        return PandasDataStore(self._data_store)
+
     def get_start_datetime_and_ts_unit(self, length, timestep, start_dt=None, start_buffer=timedelta(days=5)):
         """
         Get the start datetime for the data.
@@ -1,7 +1,7 @@
 from .asset import Asset, AssetsMapping
 from .bar import Bar
 from .bars import Bars
-from .data import Data
+from .data import Data, SharedData
 from .dataline import Dataline
 from .order import Order
 from .position import Position
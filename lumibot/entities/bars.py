@@ -1,6 +1,7 @@
 import logging
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
 from .bar import Bar
@@ -36,8 +37,25 @@ class Bars:
         For cryptocurrency only. This is the other asset for trading
         getting ohlcv quotes.
 
+    Attributes
+    ----------
+    df : Pandas Dataframe
+        The bars as a dataframe. Bars created with `from_arrays` only build
+        it the first time it is accessed.
+
+    open, high, low, close, volume : numpy array
+        The columns of the bars as numpy arrays. Bars created with
+        `from_arrays` return the arrays they were built from.
+
+    datetime : DatetimeIndex
+        The index of the bars.
+
     Methods
     -------
+    from_arrays(data, source, asset, quote=None)
+        Creates bars backed directly by numpy arrays, the dataframe and
+        the return columns are only computed if needed.
+
     get_last_price
         Returns the closing price of the last dataframe row
 
@@ -102,6 +120,46 @@ class Bars:
         if df.shape[0] == 0:
             logging.warning(f"Unable to get bar data for {asset} {source}")
 
+        self._set_source_and_asset(source, asset, quote, raw)
+
+        self._add_return_columns(df)
+        self.df = df
+
+    @classmethod
+    def from_arrays(cls, data, source, asset, quote=None):
+        """Create bars backed directly by numpy arrays.
+
+        The dataframe (with the return columns) is only built the first time `df` is accessed, so
+        strategies that only read columns such as `bars.close` never allocate one.
+
+        Parameters
+        ----------
+        data : dict
+            Keys are column names like `close`, values are numpy arrays. The `datetime` key holds
+            the DatetimeIndex of the bars.
+        source : str
+            The source of the data e.g. (yahoo, alpaca, …)
+        asset : Asset
+            The asset for which the bars are holding data.
+        quote : Asset
+            The quote asset, for cryptocurrency only.
+
+        Returns
+        -------
+        Bars object
+        """
+        index = data["datetime"]
+        if len(index) == 0:
+            logging.warning(f"Unable to get bar data for {asset} {source}")
+
+        bars = cls.__new__(cls)
+        bars._set_source_and_asset(source, asset, quote, None)
+        bars._arrays = {col: arr for col, arr in data.items() if col != "datetime"}
+        bars._index = index
+        bars._df = None
+        return bars
+
+    def _set_source_and_asset(self, source, asset, quote, raw):
         self.source = source.upper()
         self.asset = asset
         if isinstance(asset, tuple):
@@ -111,6 +169,8 @@ class Bars:
         self.quote = quote
         self._raw = raw
 
+    @staticmethod
+    def _add_return_columns(df):
         if "dividend" in df.columns:
             df["price_change"] = df["close"].pct_change()
             df["dividend_yield"] = df["dividend"] / df["close"]
@@ -118,7 +178,50 @@ class Bars:
         else:
             df["return"] = df["close"].pct_change()
 
-        self.df = df
+    @property
+    def df(self):
+        if self._df is None:
+            df = pd.DataFrame(self._arrays, index=self._index)
+            self._add_return_columns(df)
+            self._df = df
+        return self._df
+
+    @df.setter
+    def df(self, df):
+        self._df = df
+        self._arrays = None
+        self._index = None
+
+    def _get_column(self, column):
+        if self._arrays is not None:
+            return self._arrays[column]
+        return self.df[column].to_numpy()
+
+    @property
+    def open(self):
+        return self._get_column("open")
+
+    @property
+    def high(self):
+        return self._get_column("high")
+
+    @property
+    def low(self):
+        return self._get_column("low")
+
+    @property
+    def close(self):
+        return self._get_column("close")
+
+    @property
+    def volume(self):
+        return self._get_column("volume")
+
+    @property
+    def datetime(self):
+        if self._arrays is not None:
+            return self._index
+        return self.df.index
 
     def __repr__(self):
         return repr(self.df)
@@ -180,8 +283,18 @@ class Bars:
         float
 
         """
+        if self._arrays is not None:
+            return self._last_value(self._arrays["close"])
         return self.df["close"].iloc[-1]
 
+    @staticmethod
+    def _last_value(values):
+        value = values[-1]
+        if values.dtype == np.float32:
+            # Compact data is stored as float32, keep the strategy calculations in float64
+            return float(value)
+        return value
+
     def get_last_dividend(self):
         """Return the last dividend of the last bar
 
@@ -193,6 +306,8 @@ class Bars:
         -------
         float
         """
+        if self._arrays is not None and "dividend" in self._arrays:
+            return self._last_value(self._arrays["dividend"])
         if "dividend" in self.df.columns:
             return self.df["dividend"].iloc[-1]
         else:
@@ -227,6 +342,21 @@ class Bars:
         Calculate the momentum of the asset over the last num_periods rows. If dividends are provided by the data source,
         and included in the return calculation, the momentum will be adjusted for dividends.
         """
+        if self._arrays is not None:
+            # Same as the dataframe version below, without building the dataframe
+            close = self._arrays["close"]
+            if len(close) == 0:
+                return np.nan
+            returns = np.empty(len(close), dtype=np.float64)
+            returns[0] = np.nan
+            returns[1:] = close[1:] / close[:-1] - 1
+            if "dividend" in self._arrays:
+                returns += self._arrays["dividend"] / close
+            period_adj_returns = returns[-num_periods:]
+            if np.isnan(period_adj_returns[-1]):
+                return np.nan
+            return np.nanprod(1 + period_adj_returns) - 1
+
         df_copy = self.df.copy()
         if "return" in df_copy.columns:
             period_adj_returns = df_copy['return'].iloc[-num_periods:]
@@ -1,7 +1,12 @@
 import datetime
+import hashlib
 import logging
+import os
 import re
+import tempfile
+from multiprocessing.shared_memory import SharedMemory
 
+import numpy as np
 import pandas as pd
 from lumibot import LUMIBOT_DEFAULT_PYTZ as DEFAULT_PYTZ
 from lumibot.tools.helpers import parse_timestep_qty_and_unit, to_datetime_aware
@@ -9,6 +14,56 @@ from lumibot.tools.helpers import parse_timestep_qty_and_unit, to_datetime_aware
 from .asset import Asset
 from .dataline import Dataline
 
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class DataClock:
+    """The current datetime of a backtest and its row in an index that several Data share.
+
+    The backtesting data source advances the clock once per bar. The Data whose `index_ns` is the clock's
+    `index_ns` then read `row` instead of searching their own index for the datetime.
+
+    Parameters
+    ----------
+    index_ns : numpy array
+        Sorted int64 epoch-nanosecond timestamps shared by the aligned Data.
+
+    Attributes
+    ----------
+    datetime : datetime.datetime or None
+        The datetime the clock was last advanced to.
+    dt_ns : int or None
+        `datetime` in epoch nanoseconds.
+    row : int
+        The row of the last timestamp of `index_ns` at or before `datetime`, -1 if there is none. The readers of
+        the row treat -1 as no data: indexing with it would read the last row, a bar from the future.
+    """
+
+    def __init__(self, index_ns):
+        self.index_ns = index_ns
+        self.datetime = None
+        self.dt_ns = None
+        self.row = -1
+
+    def advance(self, dt):
+        """Moves the clock to `dt`, which is usually at or just after the current datetime."""
+        index_ns = self.index_ns
+        n = len(index_ns)
+        dt_ns = Data._to_ns(dt)
+
+        # The backtest clock only moves forward, so first try the current row and the one after it
+        row = self.row
+        if 0 <= row < n and index_ns[row] <= dt_ns and (row + 1 == n or index_ns[row + 1] > dt_ns):
+            pass
+        elif 0 <= row + 1 < n and index_ns[row + 1] <= dt_ns and (row + 2 == n or index_ns[row + 2] > dt_ns):
+            row += 1
+        else:
+            row = int(np.searchsorted(index_ns, dt_ns, side="right")) - 1
+
+        self.datetime = dt
+        self.dt_ns = dt_ns
+        self.row = row
+
 
 class Data:
     """Input and manage Pandas dataframes for backtesting.
@@ -40,6 +95,24 @@ class Data:
         If not None, then localize the timezone of the dataframe to the
         given timezone as a string. The values can be any supported by tz_localize,
         e.g. "US/Eastern", "UTC", etc.
+    storage_dir : str or None
+        If not None, the numeric columns are stored in memory-mapped `.npy`
+        files in this directory once the data is filled, instead of in RAM.
+        The OS then only pages in the rows that are actually read, and
+        backtests running in parallel on the same data share the same pages
+        (files are named after their content, so identical columns are
+        written once and reused). The files are not deleted when the Data
+        goes away: they are kept so that later runs on the same data reuse
+        them, and are removed with `Data.clear_storage_dir`.
+    compact : bool
+        If True, the columns are stored with smaller dtypes once the data is
+        filled, roughly halving the memory used: prices (open, high, low,
+        close, bid, ask, dividend) as float32, integral volumes and sizes as
+        uint32 (int64 if they don't fit) and the bid/ask exchange and
+        condition codes as the smallest integer type that holds them.
+        float32 keeps about 7 significant digits, so prices above 100,000 or
+        with many decimals (e.g. crypto pairs) are rounded, and so are the
+        prices used to fill orders. Defaults to False.
 
     Attributes
     ----------
@@ -67,9 +140,14 @@ class Data:
     datalines : dict
         Keys are column names like `datetime` or `close`, values are
         numpy arrays.
-    iter_index : Pandas Series
-        Datetime in the index, range count in values. Used to retrieve
-        the current df iteration for this data and datetime.
+    index_ns : numpy array
+        Sorted int64 epoch-nanosecond timestamps of the df index. Used
+        with `np.searchsorted` to retrieve the current df iteration for
+        this data and datetime.
+    clock : DataClock or None
+        Set by the backtesting data source. While the clock is at the
+        requested datetime and shares this data's `index_ns`, the current
+        row is read from it instead of searching the index.
 
     Methods
     -------
@@ -87,8 +165,12 @@ class Data:
         Trim the dataframe to match the desired backtesting dates.
     to_datalines
         Create numpy datalines from existing date index and columns.
+    to_shared_memory
+        Copies the filled data into shared memory for other processes to
+        attach to, see SharedData.
     get_iter_count
-        Returns the current index number (len) given a date.
+        Returns the current index number (len) given a date. Remembers the
+        last position found since the backtest clock only moves forward.
     check_data (wrapper)
         Validates if the provided date, length, timeshift, and timestep
         will return data. Runs function if data, returns None if no data.
@@ -96,11 +178,20 @@ class Data:
         Gets the last price from the current date.
     _get_bars_dict
         Returns bars in the form of a dict.
+    get_bars_arrays
+        Returns bars in the form of a dict of numpy arrays. Bars of a larger
+        timestep than the data are aggregated once per timestep and cached.
     get_bars
         Returns bars in the form of a dataframe.
     """
 
     MIN_TIMESTEP = "minute"
+    AGG_COLUMNS = ["open", "high", "low", "close", "volume", "dividend"]
+    PRICE_COLUMNS = ["open", "high", "low", "close", "bid", "ask", "dividend"]
+    SIZE_COLUMNS = ["volume", "bid_size", "ask_size"]
+    CODE_COLUMNS = ["bid_exchange", "ask_exchange", "bid_condition", "ask_condition"]
+    # The rows of a column stored on disk that are read or written at once
+    CHUNK_ROWS = 1 << 20
     TIMESTEP_MAPPING = [
         {"timestep": "day", "representations": ["1D", "day"]},
         {"timestep": "minute", "representations": ["1M", "minute"]},
@@ -117,6 +208,8 @@ class Data:
         timestep="minute",
         quote=None,
         timezone=None,
+        storage_dir=None,
+        compact=False,
     ):
         self.asset = asset
         self.symbol = self.asset.symbol
@@ -143,6 +236,20 @@ class Data:
             )
 
         self.timestep = timestep
+        self.storage_dir = storage_dir
+        self.compact = compact
+
+        # Index lookups, built by repair_times_and_fill
+        self.index_ns = None
+        self._iter_cursor = 0
+        self.clock = None
+
+        # The shared memory segment the columns are read from, set by SharedData.attach
+        self._shared_memory = None
+
+        # Aggregated bars keyed by bar width in nanoseconds (None if no aggregation is needed), built by get_bars
+        self._bars_cache = {}
+        self._local_ns = None
 
         self.df = self.columns(df)
 
@@ -268,40 +375,261 @@ class Data:
             )
         return df
 
-    # ./lumibot/build/__editable__.lumibot-3.1.14-py3-none-any/lumibot/entities/data.py:280:
-    # FutureWarning: Downcasting object dtype arrays on .fillna, .ffill, .bfill is deprecated and will change in a future version.
-    # Call result.infer_objects(copy=False) instead.
-    # To opt-in to the future behavior, set `pd.set_option('future.no_silent_downcasting', True)`
-
     def repair_times_and_fill(self, idx):
         # Trim the global index so that it is within the local data.
         idx = idx[(idx >= self.datetime_start) & (idx <= self.datetime_end)]
 
+        if self._shared_memory is not None and np.array_equal(self.index_ns, idx.asi8):
+            # Data attached from shared memory is already filled on these dates, keep reading the shared columns
+            self._iter_cursor = 0
+            return
+
         # After all time series merged, adjust the local dataframe to reindex and fill nan's.
-        df = self.df.reindex(idx, method="ffill")
-        df.loc[df["volume"].isna(), "volume"] = 0
-        df.loc[:, ~df.columns.isin(["open", "high", "low"])] = df.loc[
-            :, ~df.columns.isin(["open", "high", "low"])
-        ].ffill()
-        for col in ["open", "high", "low"]:
-            df.loc[df[col].isna(), col] = df.loc[df[col].isna(), "close"]
+        if self.storage_dir is not None:
+            df = self._fill_to_storage(self.df, idx)
+        else:
+            df = self._fill(self.df, idx)
+            if self.compact:
+                df = self._to_compact(df)
 
         self.df = df
 
-        iter_index = pd.Series(df.index)
-        self.iter_index = pd.Series(iter_index.index, index=iter_index)
-        self.iter_index_dict = self.iter_index.to_dict()
+        # Sorted epoch nanoseconds (UTC) of every row, used for all index lookups
+        self.index_ns = np.ascontiguousarray(df.index.asi8, dtype=np.int64)
+        self._iter_cursor = 0
+        self._bars_cache = {}
+        self._local_ns = None
 
         self.datalines = dict()
         self.to_datalines()
 
+    @staticmethod
+    def _fill(df, idx, empty=None):
+        """Returns df reindexed on idx, building each output column directly with numpy.
+
+        Each new row takes the values of the last row of df at or before it (as `reindex(method="ffill")`).
+        Missing values are then filled: volume with 0, the other columns with the last known value, and
+        open/high/low with the close.
+
+        empty(column, length, dtype), if given, returns the array each numeric column is written into
+        (`np.empty` by default), so that the columns can be built directly where they are stored.
+        """
+        # idx is trimmed to the dates of df, so every row has a row of df to take its values from
+        positions = np.searchsorted(df.index.asi8, idx.asi8, side="right") - 1
+
+        # The close is filled first, open/high/low take it where they are missing
+        order = [column for column in df.columns if column not in ["open", "high", "low"]]
+        order += [column for column in df.columns if column in ["open", "high", "low"]]
+
+        columns = {}
+        for column in order:
+            series = df[column]
+            if isinstance(series.dtype, np.dtype):
+                source = series.to_numpy()
+                if empty is None or source.dtype.hasobject:
+                    values = source.take(positions)
+                else:
+                    values = source.take(positions, out=empty(column, len(positions), source.dtype))
+            else:
+                values = series.array.take(positions)
+
+            missing = pd.isna(values)
+            if missing.any():
+                if column in ["open", "high", "low"]:
+                    if "close" in columns:
+                        values[missing] = columns["close"][missing]
+                elif column == "volume":
+                    values[missing] = 0
+                else:
+                    # Forward fill from the last row that isn't missing
+                    last_valid = np.where(missing, 0, np.arange(len(values)))
+                    np.maximum.accumulate(last_valid, out=last_valid)
+                    if isinstance(values, np.ndarray):
+                        values.take(last_valid, out=values)
+                    else:
+                        values = values.take(last_valid)
+            columns[column] = values
+
+        return pd.DataFrame({column: columns[column] for column in df.columns}, index=idx, copy=False)
+
+    @classmethod
+    def _compact_dtype(cls, column, values):
+        """Returns the smaller dtype to store a column with, see the compact parameter, or None to keep it."""
+        if column in cls.PRICE_COLUMNS:
+            return np.dtype(np.float32) if values.dtype.kind == "f" else None
+        if column not in cls.SIZE_COLUMNS and column not in cls.CODE_COLUMNS:
+            return None
+        values = np.asarray(values)
+        dtype = values.dtype
+        if dtype.kind not in "fiu":
+            return None
+
+        # Looked at in chunks, so that a column stored on disk is not read into memory at once
+        low, high, integral = 0, 0, True
+        for start in range(0, len(values), cls.CHUNK_ROWS):
+            chunk = values[start : start + cls.CHUNK_ROWS]
+            if dtype.kind == "f":
+                if np.isnan(chunk).any():
+                    return None
+                integral = integral and bool((chunk == np.floor(chunk)).all())
+            low, high = min(low, chunk.min(initial=0)), max(high, chunk.max(initial=0))
+
+        if column in cls.SIZE_COLUMNS:
+            if not integral or low < 0:
+                return None
+            return np.dtype(np.uint32 if high <= np.iinfo(np.uint32).max else np.int64)
+
+        # The smallest integer type that holds the codes, as pd.to_numeric(downcast="integer")
+        if not integral:
+            return None
+        for candidate in (np.int8, np.int16, np.int32, np.int64):
+            info = np.iinfo(candidate)
+            if info.min <= low and high <= info.max:
+                return np.dtype(candidate)
+        return None
+
+    def _to_compact(self, df):
+        """Returns df with smaller dtypes for the known columns, see the compact parameter."""
+        columns = {}
+        for column in df.columns:
+            series = df[column]
+            dtype = self._compact_dtype(column, series.array if isinstance(series.dtype, np.dtype) else series)
+            columns[column] = series if dtype is None else series.astype(dtype)
+        return pd.DataFrame(columns, index=df.index)
+
+    def _fill_to_storage(self, df, idx):
+        """Returns df reindexed on idx as `_fill` does, with its numeric columns written straight into files of
+        storage_dir and backed by read-only memory maps of them.
+
+        Every column is built in a memory-mapped temporary file, so a filled column never has to fit in memory,
+        and is then renamed after its content, so that identical columns are only stored once.
+        """
+        os.makedirs(self.storage_dir, exist_ok=True)
+        tmp_paths = []
+        # column -> (temporary file, memory map) the column is being written into
+        files = {}
+
+        def empty(column, length, dtype):
+            fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.storage_dir)
+            os.close(fd)
+            tmp_paths.append(tmp_path)
+            files[column] = (tmp_path, np.lib.format.open_memmap(tmp_path, mode="w+", dtype=dtype, shape=(length,)))
+            return files[column][1]
+
+        try:
+            filled = self._fill(df, idx, empty=empty)
+            columns = {}
+            for column in filled.columns:
+                if column in files:
+                    continue
+                # Columns of other types were built in memory, numeric ones are stored as well
+                values = np.ascontiguousarray(filled[column].to_numpy())
+                if values.dtype.hasobject:
+                    columns[column] = values
+                else:
+                    np.copyto(empty(column, len(values), values.dtype), values)
+                    del values
+            del filled
+
+            for column in list(files):
+                values = files[column][1]
+                dtype = self._compact_dtype(column, values) if self.compact else None
+                if dtype is not None:
+                    uncompacted, values = values, empty(column, len(values), dtype)
+                    for start in range(0, len(values), self.CHUNK_ROWS):
+                        stop = start + self.CHUNK_ROWS
+                        np.copyto(values[start:stop], uncompacted[start:stop], casting="unsafe")
+                    del uncompacted
+
+                # Release the memory map before the file is moved (Windows can't move a mapped file)
+                tmp_path = files.pop(column)[0]
+                values.flush()
+                path = self._storage_path(column, values)
+                del values
+                if not os.path.exists(path):
+                    try:
+                        os.replace(tmp_path, path)
+                    except OSError:
+                        # Another writer got there first, its file is the same
+                        if not os.path.exists(path):
+                            raise
+                columns[column] = np.load(path, mmap_mode="r")
+        finally:
+            files.clear()
+            for tmp_path in tmp_paths:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        # copy=False keeps each column as its own block backed by the memory-mapped file
+        return pd.DataFrame({column: columns[column] for column in df.columns}, index=idx, copy=False)
+
+    def _storage_path(self, column, values):
+        """Returns the path of the file of storage_dir holding values, named after their content."""
+        symbol = re.sub(r"[^\w.-]", "_", self.symbol)
+        digest = hashlib.sha1(f"{values.dtype.str}{values.shape}".encode())
+        for start in range(0, len(values), self.CHUNK_ROWS):
+            digest.update(values[start : start + self.CHUNK_ROWS].data)
+        return os.path.join(self.storage_dir, f"{symbol}_{column}_{digest.hexdigest()}.npy")
+
+    @staticmethod
+    def clear_storage_dir(storage_dir):
+        """Deletes the column files of a storage_dir, and the temporary files of interrupted writes.
+
+        Only call this once no Data uses the files any more: on Windows a memory-mapped file can't be deleted.
+
+        Parameters
+        ----------
+        storage_dir : str
+            The storage_dir the files were written to.
+
+        Returns
+        -------
+        int
+            The number of files deleted.
+        """
+        if not os.path.isdir(storage_dir):
+            return 0
+        removed = 0
+        for name in os.listdir(storage_dir):
+            if name.endswith(".npy") or name.endswith(".tmp"):
+                os.remove(os.path.join(storage_dir, name))
+                removed += 1
+        return removed
+
+    def to_shared_memory(self):
+        """Copies the index and columns into a shared memory segment that other processes can attach to.
+
+        The data is filled on its own dates first if it was not filled yet.
+
+        Returns
+        -------
+        SharedData
+            The handle to send to the other processes, see SharedData.
+        """
+        if self.index_ns is None:
+            self.repair_times_and_fill(self.df.index)
+        return SharedData(self)
+
+    @staticmethod
+    def _to_ns(dt):
+        # Convert a datetime to epoch nanoseconds (UTC) comparable with index_ns.
+        if isinstance(dt, pd.Timestamp):
+            if dt.tzinfo is None:
+                dt = dt.tz_localize(DEFAULT_PYTZ)
+            return dt.value
+        if isinstance(dt, datetime.datetime) and dt.tzinfo is not None:
+            delta = dt - _EPOCH
+            return ((delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds) * 1_000
+        return pd.Timestamp(to_datetime_aware(dt)).value
+
     def to_datalines(self):
+        # Keep the datetimes as the index (int64) rather than building an array of Timestamp objects
         self.datalines.update(
             {
                 "datetime": Dataline(
                     self.asset,
                     "datetime",
-                    self.df.index.to_numpy(),
+                    self.df.index,
                     self.df.index.dtype,
                 )
             }
@@ -322,23 +650,35 @@ class Data:
             setattr(self, column, self.datalines[column].dataline)
 
     def get_iter_count(self, dt):
-        # Return the index location for a given datetime.
-
-        # Check if the date is in the dataframe, if not then get the last
-        # known data (this speeds up the process)
-        i = None
+        # Return the index location for a given datetime, i.e. the row of the last
+        # known data at or before dt. Returns -1 if dt is before the first row.
 
-        # Check if we have the iter_index_dict, if not then repair the times and fill (which will create the iter_index_dict)
-        if getattr(self, "iter_index_dict", None) is None:
+        # Check if we have the index, if not then repair the times and fill (which will create the index)
+        if self.index_ns is None:
             self.repair_times_and_fill(self.df.index)
 
-        # Search for dt in self.iter_index_dict
-        if dt in self.iter_index_dict:
-            i = self.iter_index_dict[dt]
-        else:
-            # If not found, get the last known data
-            i = self.iter_index.asof(dt)
-
+        # The clock of the data source already knows the row of its current datetime in a shared index
+        clock = self.clock
+        if clock is not None and dt is clock.datetime and self.index_ns is clock.index_ns:
+            return clock.row
+
+        index_ns = self.index_ns
+        n = len(index_ns)
+        dt_ns = self._to_ns(dt)
+
+        # The backtest clock only moves forward, so first try the last position and the one after it
+        i = self._iter_cursor
+        if i < n and index_ns[i] <= dt_ns:
+            if i + 1 == n or index_ns[i + 1] > dt_ns:
+                return i
+            if i + 2 == n or index_ns[i + 2] > dt_ns:
+                self._iter_cursor = i + 1
+                return i + 1
+
+        # Otherwise binary search for the last row at or before dt
+        i = int(np.searchsorted(index_ns, dt_ns, side="right")) - 1
+        if i >= 0:
+            self._iter_cursor = i
         return i
 
     def check_data(func):
@@ -350,22 +690,14 @@ class Data:
 
             dt = args[0]
 
-            # Check if the iter date is outside of this data's date range.
-            if dt < self.datetime_start:
+            # Check if the iter date is outside of this data's date range, or before its first row (which can be
+            # after datetime_start when the first rows were not on the trading times)
+            i = -1 if dt < self.datetime_start else self.get_iter_count(dt)
+            if i < 0:
                 raise ValueError(
                     f"The date you are looking for ({dt}) for ({self.asset}) is outside of the data's date range ({self.datetime_start} to {self.datetime_end}). This could be because the data for this asset does not exist for the date you are looking for, or something else."
                 )
 
-            # Search for dt in self.iter_index_dict
-            if getattr(self, "iter_index_dict", None) is None:
-                self.repair_times_and_fill(self.df.index)
-
-            if dt in self.iter_index_dict:
-                i = self.iter_index_dict[dt]
-            else:
-                # If not found, get the last known data
-                i = self.iter_index.asof(dt)
-
             length = kwargs.get("length", 1)
             timeshift = kwargs.get("timeshift", 0)
             data_index = i + 1 - length - timeshift
@@ -404,9 +736,55 @@ class Data:
         iter_count = self.get_iter_count(dt)
         open_price = self.datalines["open"].dataline[iter_count]
         close_price = self.datalines["close"].dataline[iter_count]
-        price = close_price if dt > self.datalines["datetime"].dataline[iter_count] else open_price
+        dt_ns = self.clock.dt_ns if self.clock is not None and dt is self.clock.datetime else self._to_ns(dt)
+        price = close_price if dt_ns > self.index_ns[iter_count] else open_price
+        if self.compact:
+            # Keep the strategy and broker calculations in float64
+            return float(price)
         return price
 
+    @staticmethod
+    def get_last_prices(datas, dt):
+        """Returns the last known price of each Data of `datas`, as `get_last_price` would.
+
+        dt is converted once, and the Data that share their `index_ns` array (as the Data of a PandasData do
+        after `load_data`) share a single index lookup.
+
+        Parameters
+        ----------
+        datas : list of Data
+            The Data to get the last prices of.
+        dt : datetime.datetime
+            The datetime to get the last prices.
+
+        Returns
+        -------
+        list
+            The last price of each Data, in the order of `datas`. None where dt is before the start or the first
+            row of the Data.
+        """
+        dt_ns = Data._to_ns(dt)
+        rows = {}
+        prices = []
+        for data in datas:
+            if dt < data.datetime_start:
+                prices.append(None)
+                continue
+            if data.index_ns is None:
+                data.repair_times_and_fill(data.df.index)
+
+            i = rows.get(id(data.index_ns))
+            if i is None:
+                i = rows[id(data.index_ns)] = data.get_iter_count(dt)
+            if i < 0:
+                # dt is before the first row, the last row would be a price from the future
+                prices.append(None)
+                continue
+            column = "close" if dt_ns > data.index_ns[i] else "open"
+            price = data.datalines[column].dataline[i]
+            prices.append(float(price) if data.compact else price)
+        return prices
+
     @check_data
     def get_quote(self, dt, length=1, timeshift=0):
         """Returns the last known price of the data.
@@ -458,8 +836,8 @@ class Data:
         }
 
     @check_data
-    def _get_bars_dict(self, dt, length=1, timestep=None, timeshift=0):
-        """Returns a dictionary of the data.
+    def _get_bars_rows(self, dt, length=1, timestep=None, timeshift=0):
+        """Returns the start and end rows (end excluded) of the bars ending at dt.
 
         Parameters
         ----------
@@ -474,20 +852,42 @@ class Data:
 
         Returns
         -------
-        dict
-
+        tuple of int
         """
-
-        # Get bars.
         end_row = self.get_iter_count(dt) - timeshift
         start_row = end_row - length
 
         if start_row < 0:
             start_row = 0
+        # A negative end row would slice from the end of the data, i.e. return bars from the future
+        if end_row < 0:
+            end_row = 0
 
         # Cast both start_row and end_row to int
-        start_row = int(start_row)
-        end_row = int(end_row)
+        return int(start_row), int(end_row)
+
+    def _get_bars_dict(self, dt, length=1, timestep=None, timeshift=0):
+        """Returns a dictionary of the data.
+
+        Parameters
+        ----------
+        dt : datetime.datetime
+            The datetime to get the data.
+        length : int
+            The number of periods to get the data.
+        timestep : str
+            The frequency of the data to get the data.
+        timeshift : int
+            The number of periods to shift the data.
+
+        Returns
+        -------
+        dict
+
+        """
+
+        # Get bars.
+        start_row, end_row = self._get_bars_rows(dt, length=length, timestep=timestep, timeshift=timeshift)
 
         dict = {}
         for dl_name, dl in self.datalines.items():
@@ -495,6 +895,140 @@ class Data:
 
         return dict
 
+    def _get_local_ns(self):
+        # Wall clock (local time) epoch nanoseconds of every row, used to bin rows into bars.
+        if self._local_ns is None:
+            self._local_ns = self.df.index.tz_localize(None).asi8
+        return self._local_ns
+
+    def _aggregate_rows(self, width_ns, start_row, end_row):
+        """Aggregates the rows between start_row and end_row (excluded) into bars of width_ns.
+
+        Bars are aligned on the local time, so daily bars start at midnight. Returns the bar labels
+        (local time nanoseconds of the start of each bar), the start and end rows of each bar and a
+        dict of the aggregated columns.
+        """
+        local_ns = self._get_local_ns()
+        keys = local_ns[start_row:end_row] // width_ns
+        if len(keys) == 0:
+            empty = np.empty(0, dtype=np.int64)
+            values = {col: self.datalines[col].dataline[:0] for col in self.AGG_COLUMNS if col in self.datalines}
+            return empty, empty, empty, values
+
+        starts = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+        starts = np.concatenate(([0], starts))
+        ends = np.append(starts[1:], len(keys))
+
+        if len(starts) == len(keys):
+            # One row per bar, nothing to aggregate so return views of the datalines
+            values = {
+                col: self.datalines[col].dataline[start_row:end_row]
+                for col in self.AGG_COLUMNS
+                if col in self.datalines
+            }
+            return keys * width_ns, starts + start_row, ends + start_row, values
+
+        values = {}
+        for col in self.AGG_COLUMNS:
+            if col not in self.datalines:
+                continue
+            arr = self.datalines[col].dataline[start_row:end_row]
+            if col == "open":
+                values[col] = arr[starts]
+            elif col == "close":
+                values[col] = arr[ends - 1]
+            elif col == "high":
+                values[col] = np.maximum.reduceat(arr, starts)
+            elif col == "low":
+                values[col] = np.minimum.reduceat(arr, starts)
+            elif arr.dtype.kind in "iu" and arr.dtype.itemsize < 8:
+                # Compact volumes are summed as int64 so daily volumes can't overflow
+                values[col] = np.add.reduceat(arr, starts, dtype=np.int64)
+            else:
+                values[col] = np.add.reduceat(arr, starts)
+
+        return keys[starts] * width_ns, starts + start_row, ends + start_row, values
+
+    def _extend_bars_cache(self, cache, width_ns, end_row):
+        # Aggregate the complete bars up to (at least) end_row. The cache grows geometrically so
+        # the total aggregation cost over a backtest stays linear in the number of rows.
+        n = len(self.index_ns)
+        covered = cache["covered"]
+        if covered >= end_row or covered >= n:
+            return
+
+        limit = min(n, max(2 * end_row, end_row + 4096))
+        labels, starts, ends, values = self._aggregate_rows(width_ns, covered, limit)
+
+        # The last bar may continue after limit, if so leave it for the next extension
+        local_ns = self._get_local_ns()
+        if limit < n and local_ns[limit] // width_ns == local_ns[starts[-1]] // width_ns:
+            labels, starts, ends = labels[:-1], starts[:-1], ends[:-1]
+            values = {col: arr[:-1] for col, arr in values.items()}
+        cache["covered"] = int(ends[-1]) if len(ends) else covered
+
+        cache["labels"] = np.concatenate((cache["labels"], labels))
+        cache["starts"] = np.concatenate((cache["starts"], starts))
+        cache["ends"] = np.concatenate((cache["ends"], ends))
+        for col, arr in values.items():
+            cache[col] = np.concatenate((cache[col], arr)) if col in cache else arr
+
+    def _get_aggregated_bars(self, width_ns, start_row, end_row):
+        """Returns a dict of the rows between start_row and end_row aggregated into bars of width_ns.
+
+        Bars completely inside the rows are read from the cache, the partial bars at either end are
+        aggregated from the datalines. If every row is its own bar (e.g. 1 minute bars from minute
+        data) nothing is cached and the datalines are returned as is.
+        """
+        if width_ns not in self._bars_cache:
+            keys = self._get_local_ns() // width_ns
+            if (keys[1:] != keys[:-1]).all():
+                self._bars_cache[width_ns] = None
+            else:
+                empty = np.empty(0, dtype=np.int64)
+                self._bars_cache[width_ns] = {"labels": empty, "starts": empty, "ends": empty, "covered": 0}
+
+        cache = self._bars_cache[width_ns]
+        if cache is not None:
+            self._extend_bars_cache(cache, width_ns, end_row)
+            first = int(np.searchsorted(cache["starts"], start_row, side="left"))
+            last = int(np.searchsorted(cache["ends"], end_row, side="right"))
+        else:
+            first = last = 0
+
+        if first < last:
+            pieces = [
+                self._aggregate_rows(width_ns, start_row, int(cache["starts"][first])),
+                (
+                    cache["labels"][first:last],
+                    cache["starts"][first:last],
+                    None,
+                    {col: cache[col][first:last] for col in self.AGG_COLUMNS if col in cache},
+                ),
+                self._aggregate_rows(width_ns, int(cache["ends"][last - 1]), end_row),
+            ]
+            labels = np.concatenate([piece[0] for piece in pieces])
+            starts = np.concatenate([piece[1] for piece in pieces])
+            values = {col: np.concatenate([piece[3][col] for piece in pieces]) for col in pieces[1][3]}
+        else:
+            labels, starts, _, values = self._aggregate_rows(width_ns, start_row, end_row)
+
+        if np.array_equal(labels, self._get_local_ns()[starts]):
+            # Every bar starts on a row (e.g. 1 minute bars from minute data), so reuse the row timestamps
+            index = self.df.index[starts].rename("datetime")
+        else:
+            index = pd.DatetimeIndex(labels, name="datetime").tz_localize(
+                DEFAULT_PYTZ, ambiguous="NaT", nonexistent="shift_forward"
+            )
+        if index.hasnans:
+            # Bars starting at an ambiguous local time (when clocks go back) use the UTC offset of their first row
+            offsets = self._get_local_ns()[starts] - self.index_ns[starts]
+            utc_index = pd.DatetimeIndex(labels - offsets, tz="UTC", name="datetime").tz_convert(DEFAULT_PYTZ)
+            index = index.where(~index.isna(), utc_index)
+
+        values["datetime"] = index
+        return values
+
     def _get_bars_between_dates_dict(self, timestep=None, start_date=None, end_date=None):
         """Returns a dictionary of all the data available between the start and end dates.
 
@@ -517,6 +1051,8 @@ class Data:
 
         if start_row < 0:
             start_row = 0
+        if end_row < 0:
+            end_row = 0
 
         # Cast both start_row and end_row to int
         start_row = int(start_row)
@@ -528,8 +1064,8 @@ class Data:
 
         return dict
 
-    def get_bars(self, dt, length=1, timestep=MIN_TIMESTEP, timeshift=0):
-        """Returns a dataframe of the data.
+    def get_bars_arrays(self, dt, length=1, timestep=MIN_TIMESTEP, timeshift=0):
+        """Returns the bars as a dict of numpy arrays, without building a dataframe.
 
         Parameters
         ----------
@@ -538,67 +1074,94 @@ class Data:
         length : int
             The number of periods to get the data.
         timestep : str
-            The frequency of the data to get the data. Only minute and day are supported.
+            The frequency of the data to get the data. Only minute, hour and day are supported.
         timeshift : int
             The number of periods to shift the data.
 
         Returns
         -------
-        pandas.DataFrame
-
+        dict
+            Keys are the column names, values are numpy arrays (views of the
+            datalines when no aggregation is needed). The `datetime` key holds
+            the bars DatetimeIndex.
         """
         # Parse the timestep
         quantity, timestep = parse_timestep_qty_and_unit(timestep)
         num_periods = length
 
+        if timestep == "hour":
+            quantity, timestep = quantity * 60, "minute"
+
         if timestep == "minute" and self.timestep == "day":
             raise ValueError("You are requesting minute data from a daily data source. This is not supported.")
 
         if timestep != "minute" and timestep != "day":
             raise ValueError(f"Only minute and day are supported for timestep. You provided: {timestep}")
 
-        agg_column_map = {
-            "open": "first",
-            "high": "max",
-            "low": "min",
-            "close": "last",
-            "volume": "sum",
-        }
         if timestep == "day" and self.timestep == "minute":
             # If the data is minute data and we are requesting daily data then multiply the length by 1440
             length = length * 1440
-            unit = "D"
-            data = self._get_bars_dict(dt, length=length, timestep="minute", timeshift=timeshift)
-
-        elif timestep == 'day' and self.timestep == 'day':
-            unit = "D"
-            data = self._get_bars_dict(dt, length=length, timestep=timestep, timeshift=timeshift)
-
+            width_ns = quantity * 86_400_000_000_000
+        elif timestep == "day" and self.timestep == "day":
+            width_ns = quantity * 86_400_000_000_000
         else:
-            unit = "min"  # Guaranteed to be minute timestep at this point
+            # Guaranteed to be minute timestep at this point
             length = length * quantity
-            data = self._get_bars_dict(dt, length=length, timestep=timestep, timeshift=timeshift)
-
-        if data is None:
-            return None
-
-        df = pd.DataFrame(data).assign(datetime=lambda df: pd.to_datetime(df['datetime'])).set_index('datetime')
-        if "dividend" in df.columns:
-            agg_column_map["dividend"] = "sum"
-        df_result = df.resample(f"{quantity}{unit}").agg(agg_column_map)
-
-        # Drop any rows that have NaN values (this can happen if the data is not complete, eg. weekends)
-        df_result = df_result.dropna()
+            width_ns = quantity * 60_000_000_000
+
+        start_row, end_row = self._get_bars_rows(dt, length=length, timestep=timestep, timeshift=timeshift)
+        data = self._get_aggregated_bars(width_ns, start_row, end_row)
+        index = data.pop("datetime")
+
+        # Drop any rows that have NaN values (this can happen if the data is not complete)
+        keep = None
+        for arr in data.values():
+            if arr.dtype.kind == "f":
+                not_nan = ~np.isnan(arr)
+                keep = not_nan if keep is None else keep & not_nan
+        if keep is not None and not keep.all():
+            index = index[keep]
+            data = {col: arr[keep] for col, arr in data.items()}
 
         # Remove partial day data from the current day, which can happen if the data is in minute timestep.
+        end = len(index)
         if timestep == "day" and self.timestep == "minute":
-            df_result = df_result[df_result.index < dt.replace(hour=0, minute=0, second=0, microsecond=0)]
+            end = int(index.searchsorted(dt.replace(hour=0, minute=0, second=0, microsecond=0), side="left"))
 
-        # The original df_result may include more rows when timestep is day and self.timestep is minute.
+        # The bars may include more rows when timestep is day and self.timestep is minute.
         # In this case, we only want to return the last n rows.
-        df_result = df_result.tail(n=int(num_periods))
+        start = max(end - int(num_periods), 0)
+
+        result = {"datetime": index[start:end]}
+        for col, arr in data.items():
+            # The arrays may be views of the datalines, so they must not be modified
+            view = arr[start:end]
+            view.flags.writeable = False
+            result[col] = view
+        return result
+
+    def get_bars(self, dt, length=1, timestep=MIN_TIMESTEP, timeshift=0):
+        """Returns a dataframe of the data.
 
-        return df_result
+        Parameters
+        ----------
+        dt : datetime.datetime
+            The datetime to get the data.
+        length : int
+            The number of periods to get the data.
+        timestep : str
+            The frequency of the data to get the data. Only minute, hour and day are supported.
+        timeshift : int
+            The number of periods to shift the data.
+
+        Returns
+        -------
+        pandas.DataFrame
+
+        """
+        data = self.get_bars_arrays(dt, length=length, timestep=timestep, timeshift=timeshift)
+        index = data.pop("datetime")
+        return pd.DataFrame(data, index=index)
 
     def get_bars_between_dates(self, timestep=MIN_TIMESTEP, exchange=None, start_date=None, end_date=None):
         """Returns a dataframe of all the data available between the start and end dates.
@@ -653,3 +1216,112 @@ class Data:
 
             df = pd.DataFrame(dict).set_index("datetime")
             return df
+
+
+class SharedData:
+    """A filled Data with its index and numeric columns in a shared memory segment.
+
+    Made by ``Data.to_shared_memory`` in the process that loads the data. A SharedData only holds the name of the
+    segment and where every column is in it, so it is cheap to pickle and send to worker processes. ``attach``
+    returns a Data reading its columns straight from the segment, without parsing or filling anything and without
+    copying the columns: every process attached to the segment uses the same memory. The attached columns are
+    read-only. Columns of Python objects cannot be shared, they are pickled with the SharedData instead.
+
+    The process that made the segment owns it, and calls ``unlink`` once no process uses the data anymore.
+
+    Parameters
+    ----------
+    data : Data
+        The data to share, filled by ``repair_times_and_fill``.
+
+    Attributes
+    ----------
+    name : str
+        The name of the shared memory segment.
+    """
+
+    # Every array starts on a cache line
+    ALIGNMENT = 64
+
+    # Attributes of Data that are rebuilt when attaching instead of being pickled
+    ARRAY_ATTRIBUTES = ("df", "index_ns", "datalines", "clock", "_iter_cursor", "_bars_cache", "_local_ns", "_shared_memory")
+
+    def __init__(self, data):
+        df = data.df
+        self._data_class = type(data)
+        self._state = {
+            key: value
+            for key, value in vars(data).items()
+            if key not in self.ARRAY_ATTRIBUTES and key not in data.datalines
+        }
+        self._length = len(df)
+        self._index_name = df.index.name
+        self._tz = df.index.tz
+
+        # (column, dtype, offset) of every column, in order. The dtype is None for the columns kept in _objects.
+        self._layout = []
+        self._objects = {}
+        arrays = [(0, data.index_ns)]
+        size = self._aligned(self._length * 8)
+        for column in df.columns:
+            dtype = df[column].dtype
+            if isinstance(dtype, np.dtype) and not dtype.hasobject:
+                self._layout.append((column, dtype, size))
+                arrays.append((size, df[column].to_numpy()))
+                size = self._aligned(size + self._length * dtype.itemsize)
+            else:
+                self._layout.append((column, None, None))
+                self._objects[column] = df[column].array
+
+        self._shm = SharedMemory(create=True, size=max(size, 1))
+        self.name = self._shm.name
+        for offset, values in arrays:
+            np.ndarray(len(values), dtype=values.dtype, buffer=self._shm.buf, offset=offset)[:] = values
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_shm"] = None
+        return state
+
+    def attach(self):
+        """Returns a Data reading its index and columns from the shared memory segment.
+
+        Returns
+        -------
+        Data
+        """
+        shm = SharedMemory(name=self.name)
+        index_ns = self._view(shm, np.dtype(np.int64), 0)
+        columns = {
+            column: self._objects[column] if dtype is None else self._view(shm, dtype, offset)
+            for column, dtype, offset in self._layout
+        }
+        index = pd.DatetimeIndex(index_ns, tz="UTC", name=self._index_name).tz_convert(self._tz)
+
+        data = self._data_class.__new__(self._data_class)
+        data.__dict__.update(self._state)
+        # copy=False keeps each column as its own block backed by the shared memory segment
+        data.df = pd.DataFrame(columns, index=index, copy=False)
+        data.index_ns = index_ns
+        data._iter_cursor = 0
+        data.clock = None
+        data._bars_cache = {}
+        data._local_ns = None
+        data._shared_memory = shm
+        data.datalines = dict()
+        data.to_datalines()
+        return data
+
+    def unlink(self):
+        """Frees the shared memory segment. Only called by the process that made it."""
+        self._shm.close()
+        self._shm.unlink()
+
+    def _view(self, shm, dtype, offset):
+        values = np.ndarray(self._length, dtype=dtype, buffer=shm.buf, offset=offset)
+        values.flags.writeable = False
+        return values
+
+    @classmethod
+    def _aligned(cls, size):
+        return -(-size // cls.ALIGNMENT) * cls.ALIGNMENT
@@ -273,6 +273,8 @@ class Order:
         """
         # Ensure child_orders is properly initialized
         self.child_orders = child_orders if isinstance(child_orders, list) else []
+        # The order stores tracking the order, told when its identifier changes
+        self._order_stores = []
 
         if asset == quote and asset is not None:
             logging.error(
@@ -632,6 +634,16 @@ class Order:
     def avg_fill_price(self, value):
         self._avg_fill_price = round(float(value), 2) if value is not None else None
 
+    @property
+    def identifier(self):
+        return self._identifier
+
+    @identifier.setter
+    def identifier(self, value):
+        self._identifier = value
+        for order_store in self._order_stores:
+            order_store.update_identifier(self)
+
     @property
     def status(self):
         return self._status
@@ -905,7 +917,8 @@ class Order:
 
         # List of non-serializable keys (thread locks, events, etc.)
         non_serializable_keys = [
-            "_new_event", "_canceled_event", "_partial_filled_event", "_filled_event", "_closed_event"
+            "_new_event", "_canceled_event", "_partial_filled_event", "_filled_event", "_closed_event",
+            "_order_stores",
         ]
 
         # Iterate through all attributes in the object's __dict__
@@ -914,6 +927,10 @@ class Order:
             if key in non_serializable_keys:
                 continue
 
+            # The identifier is a property, keep its public name
+            if key == "_identifier":
+                key = "identifier"
+
             # Convert datetime objects to ISO format for JSON serialization
             if isinstance(value, datetime.datetime):
                 order_dict[key] = value.isoformat()
@@ -960,7 +977,8 @@ class Order:
 
         # List of non-serializable keys (thread locks, events, etc.)
         non_serializable_keys = [
-            "_new_event", "_canceled_event", "_partial_filled_event", "_filled_event", "_closed_event"
+            "_new_event", "_canceled_event", "_partial_filled_event", "_filled_event", "_closed_event",
+            "_order_stores",
         ]
 
         # Handle additional fields directly after the instance is created
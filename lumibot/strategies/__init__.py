@@ -1,2 +1,3 @@
+from .backtesting_executor import BacktestingExecutor
 from .strategy import Strategy
 from .strategy_executor import StrategyExecutor
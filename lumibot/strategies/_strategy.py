@@ -18,12 +18,17 @@ import matplotlib.ticker as ticker
 import uuid
 import json
 import io
+from inspect import signature
+import itertools
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from sqlalchemy import create_engine, inspect, text
 
 import pandas as pd
 from lumibot import LUMIBOT_DEFAULT_PYTZ
 from ..backtesting import BacktestingBroker, PolygonDataBacktesting, ThetaDataBacktesting
-from ..entities import Asset, Position, Order
+from ..data_sources import PandasData
+from ..entities import Asset, Position, Order, SharedData
 from ..tools import (
     create_tearsheet,
     day_deduplicate,
@@ -34,6 +39,8 @@ from ..tools import (
     to_datetime_aware,
 )
 from ..traders import Trader
+from ..trading_builtins import StatsRecorder
+from .backtesting_executor import BacktestingExecutor
 from .strategy_executor import StrategyExecutor
 from ..credentials import (
     THETADATA_CONFIG, 
@@ -55,6 +62,49 @@ from ..credentials import (
 # Set the stats table name for when storing stats in a database, defined by db_connection_str
 STATS_TABLE_NAME = "strategy_tracker"
 
+# The strategy class and backtest arguments of a parameter sweep worker, set once when the worker process starts so
+# that they are not sent again with every backtest it runs
+_sweep_strategy_class = None
+_sweep_backtest_kwargs = None
+
+
+def _init_sweep_worker(strategy_class, backtest_kwargs):
+    global _sweep_strategy_class, _sweep_backtest_kwargs
+    pandas_data = backtest_kwargs.get("pandas_data")
+    if pandas_data:
+        backtest_kwargs["pandas_data"] = [
+            data.attach() if isinstance(data, SharedData) else data for data in pandas_data
+        ]
+    _sweep_strategy_class = strategy_class
+    _sweep_backtest_kwargs = backtest_kwargs
+
+
+def _run_sweep_backtest(parameters):
+    kwargs = dict(_sweep_backtest_kwargs)
+    kwargs["parameters"] = {**kwargs.get("parameters", {}), **parameters}
+    trader_class = kwargs.get("trader_class", Trader)
+
+    # Only the results are kept, the files of the backtest go to a temporary directory instead of logs
+    with tempfile.TemporaryDirectory() as logdir:
+
+        def make_trader(*args, **trader_kwargs):
+            trader = trader_class(*args, **trader_kwargs)
+            trader.logdir = logdir
+            return trader
+
+        kwargs["stats_file"] = os.path.join(logdir, "stats.csv")
+        kwargs["trader_class"] = make_trader
+        try:
+            backtest = _sweep_strategy_class.run_backtest(**kwargs)
+        except Exception as e:
+            # A backtest that fails does not stop the sweep, its error is reported with its parameters
+            return {"error": f"{type(e).__name__}: {e}"}
+    if backtest is None:
+        return {}
+    result, _ = backtest
+    return result or {}
+
+
 class CustomLoggerAdapter(logging.LoggerAdapter):
     def __init__(self, logger, extra):
         super().__init__(logger, extra)
@@ -145,7 +195,7 @@ class _Strategy:
             The risk-free rate to use for calculating the Sharpe ratio.
         benchmark_asset : Asset or str
             The asset to use as the benchmark for the strategy. Defaults to "SPY". Strings are converted to
-            Asset objects with an asset_type="stock".
+            Asset objects with an asset_type="stock". None backtests without a benchmark.
         backtesting_start : datetime.datetime
             The date and time to start backtesting from. Required for backtesting.
         backtesting_end : datetime.datetime
@@ -316,7 +366,8 @@ class _Strategy:
 
         # Setting the data provider
         if self.is_backtesting:
-            if self.broker.data_source.SOURCE == "PANDAS":
+            # The data is loaded once, strategies backtested together share the data source
+            if self.broker.data_source.SOURCE == "PANDAS" and self.broker.data_source._date_index is None:
                 self.broker.data_source.load_data()
 
             # Create initial starting positions.
@@ -386,13 +437,16 @@ class _Strategy:
         self._minutes_after_closing = minutes_after_closing
         self._sleeptime = sleeptime
         self._risk_free_rate = risk_free_rate
-        self._executor = StrategyExecutor(self)
+        if self.broker.IS_BACKTESTING_BROKER:
+            self._executor = BacktestingExecutor(self)
+        else:
+            self._executor = StrategyExecutor(self)
         self.broker._add_subscriber(self._executor)
 
         # Stats related variables
         self._stats_file = stats_file
         self._stats = None
-        self._stats_list = []
+        self._stats_recorder = StatsRecorder()
         self._analysis = {}
 
         # Variable backup related variables
@@ -480,13 +534,14 @@ class _Strategy:
         return True
 
     def _set_cash_position(self, cash: float):
-        # Check if cash is in the list of positions yet
-        for x in range(len(self.broker._filled_positions.get_list())):
-            position = self.broker._filled_positions[x]
-            if position is not None and position.asset == self._quote_asset:
-                position.quantity = cash
-                self.broker._filled_positions[x] = position
-                return
+        # Check if cash is in the list of positions yet. In a backtest the broker can be shared with other strategies
+        # that have their own cash. When trading live, any cash position is the one of the strategy, whatever strategy
+        # the broker gave the positions it synced.
+        strategy = self._name if self.is_backtesting else None
+        position = self.broker._filled_positions.get(self._quote_asset, strategy)
+        if position is not None:
+            position.quantity = cash
+            return
 
         # If not in positions, create a new position for cash
         position = Position(
@@ -601,6 +656,7 @@ class _Strategy:
             # Set the base currency for crypto valuations.
 
             prices = {}
+            data_source_assets = []
             for asset in assets_original:
                 if asset != self._quote_asset:
                     asset_is_option = False
@@ -613,9 +669,15 @@ class _Strategy:
                         price = self.broker.option_source.get_last_price(asset)
                         prices[asset] = price
                     else:
-                        price = self.broker.data_source.get_last_price(asset)
-                        prices[asset] = price
-                        
+                        data_source_assets.append(asset)
+
+            if isinstance(self.broker.data_source, PandasData):
+                # Get all the prices in one batch instead of one lookup per position
+                prices.update(self.broker.data_source.get_last_prices(data_source_assets))
+            else:
+                for asset in data_source_assets:
+                    prices[asset] = self.broker.data_source.get_last_price(asset)
+
             for position in positions:
                 # Turn the asset into a tuple if it's a crypto asset
                 asset = (
@@ -708,11 +770,8 @@ class _Strategy:
 
     # =============Stats functions=====================
 
-    def _append_row(self, row):
-        self._stats_list.append(row)
-
     def _format_stats(self):
-        self._stats = pd.DataFrame(self._stats_list)
+        self._stats = self._stats_recorder.to_dataframe()
         if "datetime" in self._stats.columns:
             self._stats = self._stats.set_index("datetime")
         self._stats["return"] = self._stats["portfolio_value"].pct_change()
@@ -727,7 +786,7 @@ class _Strategy:
                 current_stream_handler_level = handler.level
                 handler.setLevel(logging.INFO)
         logger.setLevel(logging.INFO)
-        if len(self._stats_list) > 0:
+        if len(self._stats_recorder) > 0:
             self._format_stats()
             if self._stats_file:
                 # Get the directory name from the stats file path
@@ -752,7 +811,8 @@ class _Strategy:
         logger.setLevel(current_level)
 
     def _dump_benchmark_stats(self):
-        if not self.is_backtesting:
+        # Without a benchmark asset, the backtest is analyzed without benchmark returns
+        if not self.is_backtesting or self._benchmark_asset is None:
             return
         if self._backtesting_start is not None and self._backtesting_end is not None:
             # Need to adjust the backtesting end date because the data from Yahoo
@@ -979,7 +1039,7 @@ class _Strategy:
             The initial budget to use for the backtest.
         benchmark_asset : str or Asset
             The benchmark asset to use for the backtest to compare to. If it is a string then it will be converted
-            to a stock Asset object.
+            to a stock Asset object. If it is None, the backtest is not compared to a benchmark.
         plot_file_html : str
             The file to write the plot html to.
         trades_file : str
@@ -1265,7 +1325,122 @@ class _Strategy:
         )
 
         return result[name], strategy
-        
+
+    @classmethod
+    def run_parameter_sweep(cls, param_grid, max_workers=None, shared_memory=False, **kwargs):
+        """Backtest a strategy with every set of parameters of a grid, in parallel processes.
+
+        The backtests are spread over a pool of worker processes. Every worker gets the backtest arguments once, when
+        it starts, and runs its backtests one after the other with them, so data given with ``pandas_data`` is
+        only sent to a worker once. Every backtest still builds its own data source, which fills that data on the
+        dates of the backtest again. The workers do not show or save plots, indicators or tearsheets, and the
+        files a backtest writes, like its stats, trades and settings, go to a temporary directory that is removed
+        once its results are in.
+
+        With ``shared_memory``, the data given with ``pandas_data`` is instead filled once on the dates of the
+        backtest in this process and copied into shared memory segments (see ``SharedData``). The workers read
+        the columns from the segments without copying them, so the memory used does not grow with the number of
+        workers, and the backtests do not fill the data again.
+
+        Parameters
+        ----------
+        param_grid : dict or list of dict
+            The parameters to backtest the strategy with. Either a dictionary of parameter names to lists of values,
+            in which case every combination of the values is backtested, or a list of parameter dictionaries.
+            The parameters of every backtest are added to the ``parameters`` passed in the keyword arguments.
+        max_workers : int
+            The number of worker processes. Defaults to the number of CPUs.
+        shared_memory : bool
+            Whether to share the data given with ``pandas_data`` with the workers through shared memory.
+            Defaults to False.
+        **kwargs
+            The arguments of ``run_backtest``, the same for every backtest.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per set of parameters, in the order of the grid, with a column for every parameter and the
+            ``stats_summary`` metrics of the backtest: cagr, volatility, sharpe, max_drawdown, max_drawdown_date,
+            romad and total_return. The metrics are NaN when a backtest has no results. The error column has the
+            error a backtest failed with, None if it did not fail; the other backtests still run.
+
+        Examples
+        --------
+
+        >>> from datetime import datetime
+        >>> from lumibot.backtesting import YahooDataBacktesting
+        >>>
+        >>> results = MyStrategy.run_parameter_sweep(
+        >>>     {"fast_period": [5, 10, 20], "slow_period": [50, 100]},
+        >>>     max_workers=4,
+        >>>     datasource_class=YahooDataBacktesting,
+        >>>     backtesting_start=datetime(2020, 1, 1),
+        >>>     backtesting_end=datetime(2021, 1, 1),
+        >>> )
+        >>> results.sort_values("sharpe", ascending=False)
+        """
+
+        if isinstance(param_grid, dict):
+            names = list(param_grid)
+            parameter_sets = [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+        else:
+            parameter_sets = [dict(parameters) for parameters in param_grid]
+
+        kwargs.update(
+            show_plot=False,
+            show_tearsheet=False,
+            save_tearsheet=False,
+            show_indicators=False,
+            show_progress_bar=False,
+            quiet_logs=True,
+        )
+
+        shared_data = []
+        datasource_class = kwargs.get("datasource_class")
+        if shared_memory and kwargs.get("pandas_data") and getattr(datasource_class, "SOURCE", None) == "PANDAS":
+            # Fill the data on the dates of the backtest the way the workers would, then share it. The data source
+            # gets the arguments run_backtest gives it: config, auto_adjust and the ones run_backtest does not take
+            run_backtest_parameters = signature(cls.run_backtest).parameters
+            data_source = datasource_class(
+                to_datetime_aware(kwargs["backtesting_start"]),
+                to_datetime_aware(kwargs["backtesting_end"]),
+                config=kwargs.get("config"),
+                auto_adjust=kwargs.get("auto_adjust", False),
+                pandas_data=kwargs["pandas_data"],
+                show_progress_bar=False,
+                **{key: value for key, value in kwargs.items() if key not in run_backtest_parameters},
+            )
+            data_source.load_data()
+            shared_data = [data.to_shared_memory() for data in data_source.pandas_data.values()]
+            kwargs["pandas_data"] = shared_data
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_sweep_worker, initargs=(cls, kwargs)
+            ) as executor:
+                results = list(executor.map(_run_sweep_backtest, parameter_sets))
+        finally:
+            for data in shared_data:
+                data.unlink()
+
+        rows = []
+        for parameters, result in zip(parameter_sets, results):
+            max_drawdown = result.get("max_drawdown") or {}
+            rows.append(
+                {
+                    **parameters,
+                    "cagr": result.get("cagr", math.nan),
+                    "volatility": result.get("volatility", math.nan),
+                    "sharpe": result.get("sharpe", math.nan),
+                    "max_drawdown": max_drawdown.get("drawdown", math.nan),
+                    "max_drawdown_date": max_drawdown.get("date"),
+                    "romad": result.get("romad", math.nan),
+                    "total_return": result.get("total_return", math.nan),
+                    "error": result.get("error"),
+                }
+            )
+        return pd.DataFrame(rows)
+
     def write_backtest_settings(self, settings_file):
         """
         Redefined in the Strategy class to that it has access to all the needed variables.
@@ -1309,10 +1484,18 @@ class _Strategy:
         self.write_backtest_settings(settings_file)
 
         backtesting_broker = self.broker
-        backtesting_broker.export_trade_events_to_csv(trades_file)
+        trades_df = backtesting_broker._trade_event_log_df
+        if backtesting_broker.lockstep_clock is None:
+            backtesting_broker.export_trade_events_to_csv(trades_file)
+        else:
+            # The broker is shared with other strategies, only keep the trades of this one
+            if len(trades_df) > 0:
+                trades_df = trades_df[trades_df["strategy"] == name]
+            if len(trades_df) > 0:
+                trades_df.set_index("time").to_csv(trades_file)
         self.plot_returns_vs_benchmark(
             plot_file_html,
-            backtesting_broker._trade_event_log_df,
+            trades_df,
             show_plot=show_plot,
         )
         # Create chart lines dataframe
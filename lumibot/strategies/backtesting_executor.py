@@ -0,0 +1,143 @@
+from collections import deque
+from contextlib import nullcontext
+from datetime import datetime
+
+from lumibot.tools import append_locals
+
+from .strategy_executor import StrategyExecutor
+
+
+class BacktestingExecutor(StrategyExecutor):
+    """Runs a strategy with a backtesting broker.
+
+    The backtest clock only moves when the executor moves it, so the lifecycle methods are called directly in a loop
+    instead of going through the live trading machinery of ``StrategyExecutor``: there is no scheduler, the broker
+    events are kept in a plain deque and processed between the lifecycle methods, and the strategy lock is a no-op
+    because the whole backtest runs in the executor thread. The strategy sees the same lifecycle methods, events and
+    clock as before.
+    """
+
+    def __init__(self, strategy):
+        super().__init__(strategy)
+        self.lock = nullcontext()
+        self.queue = deque()
+        self.scheduler = None
+
+        # The on_trading_iteration method of the strategy, wrapped to keep its local variables for trace_stats
+        self._on_trading_iteration_method = None
+        self._on_trading_iteration_with_locals = None
+
+        # The last sleeptime and its length in seconds
+        self._sleeptime = None
+        self._sleeptime_seconds = None
+
+    def run(self):
+        # Strategies backtested together take turns on the clock of their broker
+        lockstep_clock = self.broker.lockstep_clock
+        if lockstep_clock is None:
+            return super().run()
+
+        lockstep_clock.start()
+        try:
+            return super().run()
+        finally:
+            lockstep_clock.finish()
+
+    def add_event(self, event_name, payload):
+        self.queue.append((event_name, payload))
+
+    def process_queue(self):
+        queue = self.queue
+        while queue:
+            event, payload = queue.popleft()
+            self.process_event(event, payload)
+
+    @StrategyExecutor.lifecycle_method
+    @StrategyExecutor.trace_stats
+    def _on_trading_iteration(self):
+        self._in_trading_iteration = True
+        start_dt = datetime.now()
+
+        # Check if we are in market hours.
+        if not self.broker.is_market_open():
+            self.strategy.log_message("The market is not currently open, skipping this trading iteration", color="blue")
+            return
+
+        self._strategy_context = None
+        start_str = start_dt.strftime("%Y-%m-%d %H:%M:%S")
+        self.strategy.log_message(f"Bot is running. Executing the on_trading_iteration lifecycle method at {start_str}", color="green")
+
+        on_trading_iteration = self.strategy.on_trading_iteration
+        if on_trading_iteration != self._on_trading_iteration_method:
+            self._on_trading_iteration_method = on_trading_iteration
+            self._on_trading_iteration_with_locals = append_locals(on_trading_iteration)
+        on_trading_iteration = self._on_trading_iteration_with_locals
+
+        # Errors are raised, they stop the backtest
+        on_trading_iteration()
+
+        self.strategy._first_iteration = False
+        self.broker._first_iteration = False
+        self._strategy_context = on_trading_iteration.locals
+        self.strategy._last_on_trading_iteration_datetime = datetime.now()
+        self.process_queue()
+        self._in_trading_iteration = False
+
+        end_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.strategy.log_message(f"Trading iteration ended at {end_str}", color="blue")
+
+    def _get_sleeptime_seconds(self):
+        """Returns the sleeptime of the strategy in seconds, only checked and converted again when it changes"""
+        sleeptime = self.strategy.sleeptime
+        if sleeptime != self._sleeptime or type(sleeptime) is not type(self._sleeptime):
+            self._check_sleeptime(sleeptime)
+            self._sleeptime_seconds = self._sleeptime_to_seconds(sleeptime)
+            self._sleeptime = sleeptime
+        return self._sleeptime_seconds
+
+    def _run_trading_session(self):
+        """Runs a trading session of the backtest, from before the market opens to after it closes"""
+
+        broker = self.broker
+        is_247 = broker.market == "24/7"
+
+        if is_247:
+            time_to_close = float("inf")
+        else:
+            # Set date to the start date, but account for minutes_before_opening
+            self.strategy.await_market_to_open()
+            if not broker.should_continue():
+                return
+
+            self.strategy._update_cash_with_dividends()
+
+            if not broker.is_market_open():
+                self._before_market_opens()
+                self.lifecycle_last_date["before_market_opens"] = self.strategy.get_datetime().date()
+
+            # Now go to the actual open without considering minutes_before_opening
+            self.strategy.await_market_to_open(timedelta=0)
+            self._before_starting_trading()
+            self.lifecycle_last_date["before_starting_trading"] = self.strategy.get_datetime().date()
+
+            time_to_close = broker.get_time_to_close()
+
+        datetime_end = broker.data_source.datetime_end
+        while is_247 or (time_to_close is not None and (time_to_close > self.strategy.minutes_before_closing * 60)):
+            # Stop after we pass the backtesting end date
+            if broker.datetime > datetime_end:
+                break
+
+            self._on_trading_iteration()
+            broker.process_pending_orders(strategy=self.strategy)
+
+            # Sleep until the next trading iteration
+            if not self._strategy_sleep():
+                break
+
+        self.strategy.await_market_to_close()
+        if broker.is_market_open():
+            self._before_market_closes()
+
+        self.strategy.await_market_to_close(timedelta=0)
+        self._after_market_closes()
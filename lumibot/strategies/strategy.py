@@ -717,8 +717,10 @@ class Strategy(_Strategy):
         if not self.is_backtesting:
             # Sleep for the the sleeptime in seconds.
             time.sleep(sleeptime)
+            return self.broker.sleep(sleeptime)
 
-        return self.broker.sleep(sleeptime)
+        # The broker can be shared by several strategies, move the clock through the executor of this one
+        return self._executor.safe_sleep(sleeptime)
 
     def get_selling_order(self, position):
         """Get the selling order for a position.
@@ -3750,7 +3752,7 @@ class Strategy(_Strategy):
             The initial budget to use for the backtest.
         benchmark_asset : str or Asset
             The benchmark asset to use for the backtest to compare to. If it is a string then it will be converted
-            to a stock Asset object.
+            to a stock Asset object. If it is None, the backtest is not compared to a benchmark.
         plot_file_html : str
             The file to write the plot html to.
         trades_file : str
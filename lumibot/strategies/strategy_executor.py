@@ -36,6 +36,14 @@ class StrategyExecutor(Thread):
         self.result = {}
         self._in_trading_iteration = False
 
+        # The snapshot of the strategy taken before each lifecycle method is only passed to trace_stats, only take it
+        # when the strategy overrides trace_stats
+        trace_stats = type(strategy).trace_stats
+        self._snapshot_stats = (trace_stats.__module__, trace_stats.__qualname__) != (
+            "lumibot.strategies.strategy",
+            "Strategy.trace_stats",
+        )
+
         # Create a dictionary of job stores. A job store is where the scheduler persists its jobs. In this case,
         # we create an in-memory job store for "default" and "On_Trading_Iteration" which is the job store we will
         # use to store jobs for the main on_trading_iteration method.
@@ -326,7 +334,7 @@ class StrategyExecutor(Thread):
         @wraps(func_input)
         def func_output(self, *args, **kwargs):
             self.strategy._update_portfolio_value()
-            snapshot_before = self.strategy._copy_dict()
+            snapshot_before = self.strategy._copy_dict() if self._snapshot_stats else None
             result = func_input(self, *args, **kwargs)
             self._trace_stats(self._strategy_context, snapshot_before)
             return result
@@ -339,23 +347,13 @@ class StrategyExecutor(Thread):
         else:
             result = self.strategy.trace_stats(context, snapshot_before)
 
-        result["datetime"] = self.strategy.get_datetime()
-        result["portfolio_value"] = self.strategy.portfolio_value
-        result["cash"] = self.strategy.cash
-
-        # Add positions column
-        positions_list = []
-        positions = self.strategy.get_positions()
-        for position in positions:
-            pos_dict = {
-                "asset": position.asset,
-                "quantity": position.quantity,
-            }
-            positions_list.append(pos_dict)
-
-        result["positions"] = positions_list
-
-        self.strategy._append_row(result)
+        self.strategy._stats_recorder.append(
+            self.strategy.get_datetime(),
+            self.strategy.portfolio_value,
+            self.strategy.cash,
+            self.strategy.get_positions(),
+            result,
+        )
         return result
 
     # =======Lifecycle methods====================
@@ -756,6 +754,25 @@ class StrategyExecutor(Thread):
         # Return a CronTrigger object with the calculated settings.
         return CronTrigger(**kwargs)
 
+    @staticmethod
+    def _check_sleeptime(sleeptime):
+        """Raise a ValueError if the sleeptime is neither a number of minutes nor a string with time units"""
+        sleeptime_err_msg = (
+            "You can set the sleep time as an integer which will be interpreted as "
+            "minutes. eg: sleeptime = 50 would be 50 minutes. Conversely, you can enter "
+            "the time as a string with the duration numbers first, followed by the time "
+            "units: 'M' for minutes, 'S' for seconds eg: '300S' is 300 seconds."
+        )
+        if isinstance(sleeptime, int):
+            units = "M"
+        elif isinstance(sleeptime, str):
+            units = sleeptime[-1:]
+        else:
+            raise ValueError(sleeptime_err_msg)
+
+        if units not in "SMHDsmhd":
+            raise ValueError(sleeptime_err_msg)
+
     # TODO: speed up this function, it's a major bottleneck for backtesting
     def _strategy_sleep(self):
         """Sleep for the strategy's sleep time"""
@@ -776,23 +793,7 @@ class StrategyExecutor(Thread):
 
             time_to_before_closing = time_to_close - self.strategy.minutes_before_closing * 60
 
-        sleeptime_err_msg = (
-            "You can set the sleep time as an integer which will be interpreted as "
-            "minutes. eg: sleeptime = 50 would be 50 minutes. Conversely, you can enter "
-            "the time as a string with the duration numbers first, followed by the time "
-            "units: 'M' for minutes, 'S' for seconds eg: '300S' is 300 seconds."
-        )
-        if isinstance(self.strategy.sleeptime, int):
-            units = "M"
-        elif isinstance(self.strategy.sleeptime, str):
-            units = self.strategy.sleeptime[-1:]
-        else:
-            raise ValueError(sleeptime_err_msg)
-
-        if units not in "SMHDsmhd":
-            raise ValueError(sleeptime_err_msg)
-
-        strategy_sleeptime = self._sleeptime_to_seconds(self.strategy.sleeptime)
+        strategy_sleeptime = self._get_sleeptime_seconds()
 
         if not self.should_continue or strategy_sleeptime == 0 or time_to_before_closing <= 0:
             return False
@@ -801,11 +802,13 @@ class StrategyExecutor(Thread):
 
             # Run process orders at the market close time first (if not 24/7)
             if not is_247:
-                # Get the time to close.
-                time_to_close = self.broker.get_time_to_close()
+                # Get the time to close again, live time has passed since (the backtest clock hasn't moved).
+                if not self.strategy.is_backtesting:
+                    time_to_close = self.broker.get_time_to_close()
 
-                # If strategy sleep time is greater than the time to close, process expired option contracts.
-                if strategy_sleeptime > time_to_close:
+                # If strategy sleep time is greater than the time to close, process expired option contracts. In a
+                # backtest the clock jumps straight to the next iteration when no contract expires at the close.
+                if strategy_sleeptime > time_to_close and self._has_events_at_close(time_to_close):
                     # Sleep until the market closes.
                     self.safe_sleep(time_to_close)
 
@@ -822,6 +825,21 @@ class StrategyExecutor(Thread):
 
         return True
 
+    def _get_sleeptime_seconds(self):
+        """Returns the sleeptime of the strategy in seconds, checking that it is valid"""
+        self._check_sleeptime(self.strategy.sleeptime)
+        return self._sleeptime_to_seconds(self.strategy.sleeptime)
+
+    def _has_events_at_close(self, time_to_close):
+        """Return True if something has to be processed when the market closes, in time_to_close seconds, before the
+        next trading iteration. Live strategies always stop at the close. In a backtest only expiring contracts need
+        it: orders are processed after the trading iterations and at the session boundaries."""
+        if not self.strategy.is_backtesting or not hasattr(self.broker, "has_expired_contracts"):
+            return True
+
+        close_dt = self.broker.datetime + timedelta(seconds=time_to_close)
+        return self.broker.has_expired_contracts(self.strategy, close_dt)
+
     # ======Execution methods ====================
     def _run_trading_session(self):
         """This is really intraday trading method. Timeframes of less than a day, seconds,
@@ -1043,13 +1061,15 @@ class StrategyExecutor(Thread):
         market = self.broker.market
 
         # Get the trading days based on the market that the strategy is trading on
-        self.broker._trading_days = get_trading_days(market)
+        trading_days = get_trading_days(market)
 
         # Sort the trading days by market close time so that we can search them faster
-        self.broker._trading_days.sort_values('market_close', inplace=True)  # Ensure sorted order
+        trading_days.sort_values('market_close', inplace=True)  # Ensure sorted order
 
-        # Set DataFrame index to market_close for fast lookups
-        self.broker._trading_days.set_index('market_close', inplace=True)
+        # Set DataFrame index to market_close for fast lookups. It is set on the broker once it is ready, backtesting
+        # brokers turn it into arrays of open and close times
+        trading_days.set_index('market_close', inplace=True)
+        self.broker._trading_days = trading_days
 
         #####
         # The main loop for running any strategy
@@ -4,6 +4,11 @@ import signal
 import sys
 from pathlib import Path
 
+import pandas as pd
+
+from lumibot.backtesting import LockstepClock
+from lumibot.tools import day_deduplicate, stats_summary
+
 # Overloading time.sleep to warn users against using it
 
 logger = logging.getLogger(__name__)
@@ -54,6 +59,10 @@ class Trader:
         self._strategies = strategies if strategies else []
         self._pool = []
 
+        # The portfolio of the strategies backtested together, see run_all
+        self.combined_stats = None
+        self.combined_analysis = None
+
     @property
     def is_backtest_broker(self):
         result = False
@@ -78,6 +87,11 @@ class Trader:
         """
         run all strategies
 
+        Several strategies can be backtested together if they share one BacktestingBroker, and so one data source
+        and one clock. Every strategy keeps its own cash, positions, orders and stats, and runs as if it was
+        backtested alone. The data is only loaded once. The portfolio value and cash of all the strategies added
+        up are then in `combined_stats`, and their `stats_summary` in `combined_analysis`.
+
         Parameters
         ----------
         async_: bool
@@ -105,6 +119,16 @@ class Trader:
         -------
         dict
             A dictionary with the keys being the strategy names and the values being the strategy analysis.
+
+        Examples
+        --------
+        >>> data_source = PandasDataBacktesting(datetime_start, datetime_end, pandas_data=pandas_data)
+        >>> broker = BacktestingBroker(data_source)
+        >>> trader = Trader(backtest=True)
+        >>> trader.add_strategy(Momentum(broker, name="momentum", budget=50000))
+        >>> trader.add_strategy(MeanReversion(broker, name="mean_reversion", budget=50000))
+        >>> result = trader.run_all(show_plot=False, show_tearsheet=False)
+        >>> trader.combined_analysis["sharpe"]
         """
         if not self._strategies:
             raise RuntimeError(
@@ -120,19 +144,26 @@ class Trader:
 
         if len(self._strategies) != 1:
             if self.is_backtest_broker:
-                raise Exception(
-                    f"Received {len(self._strategies)} strategies for backtesting."
-                    f"You can only backtest one at a time."
-                )
+                broker = self._strategies[0].broker
+                if any(strategy.broker is not broker for strategy in self._strategies):
+                    raise Exception(
+                        f"Received {len(self._strategies)} strategies for backtesting. "
+                        f"Strategies can only be backtested together if they share the same broker."
+                    )
+                names = [strategy._name for strategy in self._strategies]
+                if len(set(names)) != len(names):
+                    raise Exception(
+                        f"Strategies backtested together must have different names. You passed in {names}."
+                    )
             else:
                 raise NotImplementedError(
                     f"Running multiple live strategies is not implemented yet. You passed "
                     f"in {len(self._strategies)} strategies."
                 )
 
-        strat = self._strategies[0]
         if self.is_backtest_broker:
-            strat.verify_backtest_inputs(strat.backtesting_start, strat.backtesting_end)
+            for strat in self._strategies:
+                strat.verify_backtest_inputs(strat.backtesting_start, strat.backtesting_end)
             logger.info("Backtesting starting...")
 
         signal.signal(signal.SIGINT, self._stop_pool)
@@ -146,15 +177,33 @@ class Trader:
         if self.is_backtest_broker:
             logger.setLevel(logging.INFO)
             logger.info("Backtesting finished")
-            strat.backtest_analysis(
-                logdir=self.logdir,
-                show_plot=show_plot,
-                show_tearsheet=show_tearsheet,
-                save_tearsheet=save_tearsheet,
-                show_indicators=show_indicators,
-                tearsheet_file=tearsheet_file,
-                base_filename=base_filename,
-            )
+            if len(self._strategies) == 1:
+                self._strategies[0].backtest_analysis(
+                    logdir=self.logdir,
+                    show_plot=show_plot,
+                    show_tearsheet=show_tearsheet,
+                    save_tearsheet=save_tearsheet,
+                    show_indicators=show_indicators,
+                    tearsheet_file=tearsheet_file,
+                    base_filename=base_filename,
+                )
+            else:
+                for strat in self._strategies:
+                    # Every strategy gets its own files
+                    strategy_tearsheet_file = None
+                    if tearsheet_file:
+                        root, extension = os.path.splitext(tearsheet_file)
+                        strategy_tearsheet_file = f"{root}_{strat._name}{extension}"
+                    strat.backtest_analysis(
+                        logdir=self.logdir,
+                        show_plot=show_plot,
+                        show_tearsheet=show_tearsheet,
+                        save_tearsheet=save_tearsheet,
+                        show_indicators=show_indicators,
+                        tearsheet_file=strategy_tearsheet_file,
+                        base_filename=f"{base_filename}_{strat._name}" if base_filename else strat._name,
+                    )
+                self._combine_stats()
 
         return result
 
@@ -224,6 +273,11 @@ class Trader:
     def _init_pool(self):
         self._pool = [strategy._executor for strategy in self._strategies]
 
+        # Strategies backtested together take turns on the clock of their broker
+        if self.is_backtest_broker and len(self._pool) > 1:
+            broker = self._strategies[0].broker
+            broker.lockstep_clock = LockstepClock(broker, self._pool)
+
     def _start_pool(self):
         for strategy_thread in self._pool:
             strategy_thread.start()
@@ -250,3 +304,37 @@ class Trader:
         for strategy_thread in self._pool:
             result[strategy_thread.name] = strategy_thread.result
         return result
+
+    def _combine_stats(self):
+        """Adds up the portfolio value and cash of the strategies backtested together, at every datetime where one
+        of them has stats, with the last stats of the others. Before its first stats, a strategy counts with its
+        starting budget."""
+        frames = {}
+        budgets = {}
+        for strategy in self._strategies:
+            stats = strategy._stats
+            if stats is not None and len(stats) > 0:
+                frames[strategy._name] = day_deduplicate(stats)[["portfolio_value", "cash"]]
+                budgets[strategy._name] = strategy._initial_budget
+
+        if not frames:
+            self.combined_stats = pd.DataFrame()
+            self.combined_analysis = {}
+            return
+
+        # Only fill forward, the stats of a strategy must not be known before it has them
+        stats = pd.concat(frames, axis=1).sort_index().ffill()
+        for name, budget in budgets.items():
+            if budget is not None:
+                stats[name] = stats[name].fillna(budget)
+
+        # Without a starting budget, there is no total until every strategy has stats
+        combined = pd.DataFrame(
+            {
+                "portfolio_value": stats.xs("portfolio_value", axis=1, level=1).sum(axis=1, min_count=len(frames)),
+                "cash": stats.xs("cash", axis=1, level=1).sum(axis=1, min_count=len(frames)),
+            }
+        )
+        combined["return"] = combined["portfolio_value"].pct_change()
+        self.combined_stats = combined
+        self.combined_analysis = stats_summary(combined, self._strategies[0].risk_free_rate)
@@ -1,2 +1,6 @@
-from .custom_stream import CustomStream, PollingStream
+from .custom_stream import CustomStream, DirectStream, PollingStream
+from .order_store import OrderStatusList, OrderStore
+from .position_ledger import PositionLedger
 from .safe_list import SafeList
+from .stats_recorder import StatsRecorder
+from .trade_event_log import TradeEventLog
@@ -1,7 +1,8 @@
 import logging
 import queue
+from collections import deque
 from queue import Queue
-from threading import Thread
+from threading import RLock, Thread
 
 
 class CustomStream:
@@ -43,6 +44,47 @@ class CustomStream:
         self._run()
 
 
+class DirectStream(CustomStream):
+    """
+    A stream that runs the actions in the thread that dispatches the events, used for backtesting. There is no stream
+    thread to hand the events to and wait for, so dispatch() returns once the event has been processed.
+
+    The events keep the order of the queued stream: an event dispatched by an action runs after the action returns,
+    and events dispatched from other threads wait for the events being processed. An exception raised by an action
+    is raised by dispatch(), and the events still waiting behind it are dropped.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._pending = deque()
+        self._lock = RLock()
+        self._dispatching = False
+
+    def dispatch(self, event, wait_until_complete=False, **payload):
+        with self._lock:
+            self._pending.append((event, payload))
+            if self._dispatching:
+                # Dispatched by an action, it is processed when that action returns
+                return
+
+            self._dispatching = True
+            try:
+                while self._pending:
+                    event, payload = self._pending.popleft()
+                    self._process_queue_event(event, payload)
+            finally:
+                # If an action raised, the events left are dropped rather than replayed by the next dispatch
+                self._pending.clear()
+                self._dispatching = False
+
+    def run(self, name):
+        # Nothing to wait for, the events are processed by dispatch()
+        pass
+
+    def _run(self):
+        pass
+
+
 class PollingStream(CustomStream):
     """
     A stream that polls an API endpoint at a regular interval and dispatches events based on the response. It is
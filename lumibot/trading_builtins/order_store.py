@@ -0,0 +1,250 @@
+from _thread import RLock as rlock_type
+
+
+class OrderStore:
+    """Orders tracked by a broker, indexed by status, identifier, strategy and asset.
+
+    The orders of each status are kept in an insertion ordered bucket, and every bucket is exposed as an
+    ``OrderStatusList`` with the same interface as the ``SafeList`` objects the brokers used before. Moving an order
+    between statuses, looking an order up by identifier and listing the orders of a strategy and asset are then
+    dictionary operations instead of scans over every order the broker has seen.
+
+    Orders are indexed under the identifier they have when they are added. The store registers itself with every
+    order it tracks, and an order whose identifier changes afterwards calls ``update_identifier`` to be indexed
+    again under its new identifier.
+
+    Parameters
+    ----------
+    lock : threading.RLock
+        The lock shared with the broker.
+    archive_terminal : bool
+        If True, filled, errored and canceled orders are archived: ``get_orders`` leaves them out unless their
+        statuses are requested explicitly, but they are still found by ``get_order``.
+    """
+
+    STATUSES = ("unprocessed", "new", "partially_filled", "filled", "error", "canceled")
+    TERMINAL_STATUSES = ("filled", "error", "canceled")
+
+    def __init__(self, lock, archive_terminal=False):
+        if not isinstance(lock, rlock_type):
+            raise ValueError("lock must be a threading.RLock")
+
+        self._lock = lock
+        self.archive_terminal = archive_terminal
+        # status -> {id(order): order}, in the order the orders were added
+        self._buckets = {status: {} for status in self.STATUSES}
+        # identifier -> {id(order): order}, and id(order) -> the identifier the order is indexed under
+        self._by_identifier = {}
+        self._identifiers = {}
+        # strategy -> status -> {id(order): order}, and the same for (strategy, asset)
+        self._by_strategy = {}
+        self._by_strategy_asset = {}
+        # id(order) -> the (strategy, (strategy, asset)) keys the order is indexed under
+        self._index_keys = {}
+        self._views = {status: OrderStatusList(self, status) for status in self.STATUSES}
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(bucket) for bucket in self._buckets.values())
+
+    def view(self, status):
+        """Return the list-like view over the orders of a status."""
+        return self._views[status]
+
+    def add(self, order, status):
+        """Add an order to the bucket of a status. Adding an order twice to the same bucket does nothing."""
+        with self._lock:
+            key = id(order)
+            self._index_identifier(order, key)
+            bucket = self._buckets[status]
+            if key in bucket:
+                return
+
+            bucket[key] = order
+            index_keys = self._index_keys.get(key)
+            if index_keys is None:
+                index_keys = self._index_keys[key] = (order.strategy, (order.strategy, order.asset))
+                order._order_stores.append(self)
+            for index, index_key in zip((self._by_strategy, self._by_strategy_asset), index_keys):
+                statuses = index.get(index_key)
+                if statuses is None:
+                    statuses = index[index_key] = {s: {} for s in self.STATUSES}
+                statuses[status][key] = order
+
+    def discard(self, order, status):
+        """Remove an order from the bucket of a status. Returns True if the order was in the bucket."""
+        with self._lock:
+            key = id(order)
+            if self._buckets[status].pop(key, None) is None:
+                return False
+
+            for index, index_key in zip((self._by_strategy, self._by_strategy_asset), self._index_keys[key]):
+                statuses = index[index_key]
+                del statuses[status][key]
+                if not any(statuses.values()):
+                    del index[index_key]
+
+            if not any(key in bucket for bucket in self._buckets.values()):
+                del self._index_keys[key]
+                order._order_stores.remove(self)
+                identifier = self._identifiers.pop(key)
+                orders = self._by_identifier[identifier]
+                del orders[key]
+                if not orders:
+                    del self._by_identifier[identifier]
+            return True
+
+    def find(self, identifier, status):
+        """Return the orders of a status with the given identifier, in the order they were added."""
+        with self._lock:
+            bucket = self._buckets[status]
+            keys = [
+                key for key, order in self._by_identifier.get(identifier, {}).items()
+                if key in bucket and order.identifier == identifier
+            ]
+            if len(keys) > 1:
+                keys = [key for key in bucket if key in keys]
+            return [bucket[key] for key in keys]
+
+    def get_order(self, identifier):
+        """Return the first order with the given identifier, looking through the statuses in order."""
+        with self._lock:
+            for status in self.STATUSES:
+                orders = self.find(identifier, status)
+                if orders:
+                    return orders[0]
+            return None
+
+    def get_orders(self, strategy=None, asset=None, statuses=None):
+        """Return the orders of a strategy and asset, grouped by status in the order of ``STATUSES``.
+
+        Parameters
+        ----------
+        strategy : str
+            The name of the strategy, or None for every strategy.
+        asset : Asset
+            The asset of the orders, or None for every asset.
+        statuses : list of str
+            The statuses to return. Defaults to every status, leaving out the terminal ones when they are
+            archived.
+
+        Returns
+        -------
+        list of Order
+        """
+        if statuses is None:
+            statuses = [s for s in self.STATUSES if not (self.archive_terminal and s in self.TERMINAL_STATUSES)]
+
+        with self._lock:
+            if strategy is None:
+                buckets = self._buckets
+            elif asset is None:
+                buckets = self._by_strategy.get(strategy)
+            else:
+                buckets = self._by_strategy_asset.get((strategy, asset))
+            if buckets is None:
+                return []
+
+            result = []
+            for status in self.STATUSES:
+                if status in statuses:
+                    result.extend(buckets[status].values())
+            if strategy is None and asset is not None:
+                result = [order for order in result if order.asset == asset]
+            return result
+
+    def update_identifier(self, order):
+        """Index an order tracked by the store again under its current identifier."""
+        with self._lock:
+            key = id(order)
+            if key in self._identifiers:
+                self._index_identifier(order, key)
+
+    def reindex(self):
+        """Rebuild the identifier index from the current identifiers of the orders."""
+        with self._lock:
+            self._by_identifier = {}
+            self._identifiers = {}
+            for bucket in self._buckets.values():
+                for key, order in bucket.items():
+                    self._index_identifier(order, key)
+
+    def _index_identifier(self, order, key):
+        identifier = order.identifier
+        indexed = self._identifiers.get(key)
+        if key in self._identifiers:
+            if indexed == identifier:
+                return
+            orders = self._by_identifier[indexed]
+            del orders[key]
+            if not orders:
+                del self._by_identifier[indexed]
+
+        self._identifiers[key] = identifier
+        self._by_identifier.setdefault(identifier, {})[key] = order
+
+
+class OrderStatusList:
+    """The orders of one status of an ``OrderStore``, with the interface of a ``SafeList``."""
+
+    def __init__(self, store, status):
+        self._store = store
+        self._status = status
+
+    def __repr__(self):
+        return repr(self.get_list())
+
+    def __bool__(self):
+        with self._store._lock:
+            return bool(self._store._buckets[self._status])
+
+    def __len__(self):
+        with self._store._lock:
+            return len(self._store._buckets[self._status])
+
+    def __iter__(self):
+        return iter(self.get_list())
+
+    def __contains__(self, val):
+        identifier = getattr(val, "identifier", None)
+        if identifier is None:
+            return False
+        return any(order == val for order in self._store.find(identifier, self._status))
+
+    def __getitem__(self, n):
+        return self.get_list()[n]
+
+    def append(self, value):
+        self._store.add(value, self._status)
+
+    def extend(self, value):
+        for item in value:
+            self.append(item)
+
+    def remove(self, value, key=None):
+        store = self._store
+        with store._lock:
+            if key is None:
+                for order in store.find(getattr(value, "identifier", None), self._status):
+                    if order == value:
+                        store.discard(order, self._status)
+                        return
+                raise ValueError(f"{value} is not in the {self._status} orders")
+
+            if not isinstance(key, str):
+                raise ValueError(f"key must be a string, received {key} of type {type(key)}")
+            if key == "identifier":
+                orders = store.find(value, self._status)
+            else:
+                orders = [item for item in store._buckets[self._status].values() if getattr(item, key) == value]
+            for order in orders:
+                store.discard(order, self._status)
+
+    def get_list(self):
+        with self._store._lock:
+            return list(self._store._buckets[self._status].values())
+
+    def remove_all(self):
+        with self._store._lock:
+            for item in self.get_list():
+                self._store.discard(item, self._status)
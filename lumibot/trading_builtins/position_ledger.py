@@ -0,0 +1,152 @@
+import heapq
+from _thread import RLock as rlock_type
+from itertools import count
+
+
+class PositionLedger:
+    """Positions tracked by a broker, indexed by asset, with the interface of a ``SafeList``.
+
+    Looking up the position of a strategy and asset, the cash position of a strategy included, only goes through
+    the few positions held in that asset instead of every position the broker tracks. The positions keep the order
+    in which they were added, like a list.
+
+    The strategy of a position can be changed after it is added (``Broker.sync_positions`` assigns one to the
+    positions pulled from the broker), so it is matched when looking positions up rather than being part of the key.
+
+    Positions in an asset with an expiration are also kept in a min-heap keyed by the expiration, so finding the
+    expired contracts only looks at the front of the heap when none have expired. Positions that were removed are
+    dropped from the heap when they reach its front.
+    """
+
+    def __init__(self, lock, initial=None):
+        if not isinstance(lock, rlock_type):
+            raise ValueError("lock must be a threading.RLock")
+
+        self._lock = lock
+        # id(position) -> position, in the order the positions were added
+        self._positions = {}
+        # asset -> {id(position): position}, and id(position) -> the asset the position is indexed under
+        self._by_asset = {}
+        self._assets = {}
+        # id(position) -> the rank of the position in the order they were added
+        self._ranks = {}
+        self._counter = count()
+        # (expiration, rank, position) for the positions in an asset with an expiration
+        self._expirations = []
+        if initial:
+            self.extend(initial)
+
+    def __repr__(self):
+        return repr(self.get_list())
+
+    def __bool__(self):
+        with self._lock:
+            return bool(self._positions)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._positions)
+
+    def __iter__(self):
+        return iter(self.get_list())
+
+    def __contains__(self, val):
+        with self._lock:
+            return id(val) in self._positions
+
+    def __getitem__(self, n):
+        return self.get_list()[n]
+
+    def __setitem__(self, n, val):
+        with self._lock:
+            positions = self.get_list()
+            positions[n] = val
+            self.remove_all()
+            self.extend(positions)
+
+    def get(self, asset, strategy=None):
+        """Return the first position held in an asset, by the given strategy if it is not empty."""
+        with self._lock:
+            for position in self._by_asset.get(asset, {}).values():
+                if position.asset == asset and (not strategy or position.strategy == strategy):
+                    return position
+            return None
+
+    def expiring(self, date, strategy=None):
+        """Return the positions in an asset that expires on or before date, held by the given strategy if it is not
+        empty, in the order they were added."""
+        with self._lock:
+            heap = self._expirations
+            while heap and not self._is_tracked(heap[0]):
+                heapq.heappop(heap)
+            if not heap or heap[0][0] > date:
+                return []
+
+            # Walk the part of the heap that is due, the children of an entry never expire before it
+            due = {}
+            stack = [0]
+            while stack:
+                i = stack.pop()
+                if i >= len(heap) or heap[i][0] > date:
+                    continue
+                entry = heap[i]
+                position = entry[2]
+                if self._is_tracked(entry) and (not strategy or position.strategy == strategy):
+                    due[id(position)] = position
+                stack.extend((2 * i + 1, 2 * i + 2))
+
+            if len(heap) > 2 * len(self._positions) + 16:
+                self._rebuild_expirations()
+            return sorted(due.values(), key=lambda position: self._ranks[id(position)])
+
+    def append(self, value):
+        with self._lock:
+            key = id(value)
+            if key in self._positions:
+                return
+
+            asset = getattr(value, "asset", None)
+            self._positions[key] = value
+            self._assets[key] = asset
+            self._by_asset.setdefault(asset, {})[key] = value
+            rank = self._ranks[key] = next(self._counter)
+            expiration = getattr(asset, "expiration", None)
+            if expiration is not None:
+                heapq.heappush(self._expirations, (expiration, rank, value))
+
+    def remove(self, value):
+        with self._lock:
+            key = id(value)
+            if self._positions.pop(key, None) is None:
+                raise ValueError(f"{value} is not in the tracked positions")
+
+            asset = self._assets.pop(key)
+            del self._ranks[key]
+            positions = self._by_asset[asset]
+            del positions[key]
+            if not positions:
+                del self._by_asset[asset]
+
+    def extend(self, value):
+        for item in value:
+            self.append(item)
+
+    def get_list(self):
+        with self._lock:
+            return list(self._positions.values())
+
+    def remove_all(self):
+        with self._lock:
+            self._positions = {}
+            self._by_asset = {}
+            self._assets = {}
+            self._ranks = {}
+            self._expirations = []
+
+    def _is_tracked(self, entry):
+        # An entry is stale once its position was removed, or added again under a new rank
+        return self._ranks.get(id(entry[2])) == entry[1]
+
+    def _rebuild_expirations(self):
+        self._expirations = [entry for entry in self._expirations if self._is_tracked(entry)]
+        heapq.heapify(self._expirations)
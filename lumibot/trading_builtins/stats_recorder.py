@@ -0,0 +1,199 @@
+from array import array
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytz
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class StatsRecorder:
+    """Stats of a strategy, one row after every lifecycle method, recorded in columns.
+
+    The datetime, portfolio value and cash of every row are written into preallocated NumPy arrays, and the positions
+    are kept as (row, asset id, quantity) triplets, instead of keeping a dictionary with a list of position
+    dictionaries for every row. The stats returned by an override of ``Strategy.trace_stats`` are kept as they are.
+
+    ``to_dataframe`` builds the DataFrame ``pd.DataFrame`` built from the rows as dictionaries, with the same columns,
+    column order and dtypes. Values that do not fit a column, like a missing cash position or a naive datetime, are
+    kept aside and the column is then built from the values the way pandas would.
+
+    Parameters
+    ----------
+    capacity : int
+        The number of rows to allocate at first. The columns double in size when they are full.
+    """
+
+    COLUMNS = ("datetime", "portfolio_value", "cash", "positions")
+
+    # Where every value of a column is: in its array, in its array but an int, or kept aside
+    IN_COLUMN = 0
+    INT_IN_COLUMN = 1
+    ASIDE = 2
+
+    def __init__(self, capacity=4096):
+        self._size = 0
+        self._capacity = capacity
+        self._datetimes = np.empty(capacity, dtype=np.int64)
+        self._portfolio_values = np.empty(capacity, dtype=np.float64)
+        self._cash = np.empty(capacity, dtype=np.float64)
+        self._kinds = {
+            column: np.empty(capacity, dtype=np.int8) for column in ("datetime", "portfolio_value", "cash")
+        }
+        # column -> {row: value} for the values that do not fit their column
+        self._others = {"datetime": {}, "portfolio_value": {}, "cash": {}}
+        # The time zone of the datetimes, a pytz time zone
+        self._zone = None
+        self._tz = None
+
+        # The positions of every row, as (row, asset id, quantity) triplets
+        self._position_rows = array("q")
+        self._position_asset_ids = array("q")
+        self._position_quantities = []
+        # id(asset) -> asset id, and the assets by asset id
+        self._asset_ids = {}
+        self._assets = []
+
+        # row -> the stats returned by trace_stats, and every column in the order they appeared in
+        self._extras = {}
+        self._columns = {}
+        self._has_columns = False
+
+    def __len__(self):
+        return self._size
+
+    def append(self, dt, portfolio_value, cash, positions, extra=None):
+        """Add a row.
+
+        Parameters
+        ----------
+        dt : datetime
+            The datetime of the row.
+        portfolio_value : float
+            The portfolio value of the strategy.
+        cash : float
+            The cash of the strategy.
+        positions : list of Position
+            The positions of the strategy.
+        extra : dict
+            The stats returned by ``Strategy.trace_stats``, if any.
+        """
+        row = self._size
+        if row == self._capacity:
+            self._grow()
+
+        if extra:
+            for key in extra:
+                self._columns.setdefault(key)
+            self._extras[row] = {key: value for key, value in extra.items() if key not in self.COLUMNS}
+        if not self._has_columns:
+            for key in self.COLUMNS:
+                self._columns.setdefault(key)
+            self._has_columns = True
+
+        self._set_datetime(row, dt)
+        self._set_number(self._portfolio_values, "portfolio_value", row, portfolio_value)
+        self._set_number(self._cash, "cash", row, cash)
+
+        for position in positions:
+            asset = position.asset
+            asset_id = self._asset_ids.get(id(asset))
+            if asset_id is None:
+                asset_id = self._asset_ids[id(asset)] = len(self._assets)
+                # Keeping the asset also keeps its id from being reused
+                self._assets.append(asset)
+            self._position_rows.append(row)
+            self._position_asset_ids.append(asset_id)
+            self._position_quantities.append(position.quantity)
+
+        self._size = row + 1
+
+    def to_dataframe(self):
+        """Return the rows as a DataFrame with a datetime, portfolio_value, cash and positions column, and a column
+        for every stat returned by ``trace_stats``."""
+        n = self._size
+        if n == 0:
+            return pd.DataFrame()
+
+        columns = {
+            "datetime": self._datetime_column(n),
+            "portfolio_value": self._number_column(self._portfolio_values, "portfolio_value", n),
+            "cash": self._number_column(self._cash, "cash", n),
+        }
+
+        positions = [[] for _ in range(n)]
+        assets = self._assets
+        for row, asset_id, quantity in zip(self._position_rows, self._position_asset_ids, self._position_quantities):
+            positions[row].append({"asset": assets[asset_id], "quantity": quantity})
+        columns["positions"] = positions
+
+        for key in self._columns:
+            if key not in columns:
+                values = [np.nan] * n
+                for row, extra in self._extras.items():
+                    if key in extra:
+                        values[row] = extra[key]
+                columns[key] = values
+
+        return pd.DataFrame({key: columns[key] for key in self._columns})
+
+    def _grow(self):
+        self._capacity *= 2
+        for name in ("_datetimes", "_portfolio_values", "_cash"):
+            values = getattr(self, name)
+            setattr(self, name, np.resize(values, self._capacity))
+        for column, kinds in self._kinds.items():
+            self._kinds[column] = np.resize(kinds, self._capacity)
+
+    def _set_datetime(self, row, dt):
+        zone = getattr(getattr(dt, "tzinfo", None), "zone", None)
+        if zone is not None and (zone == self._zone or self._zone is None):
+            if self._zone is None:
+                self._zone = zone
+                self._tz = pytz.timezone(zone)
+            if isinstance(dt, pd.Timestamp):
+                self._datetimes[row] = dt.value
+            else:
+                delta = dt - EPOCH
+                self._datetimes[row] = ((delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds) * 1_000
+            self._kinds["datetime"][row] = self.IN_COLUMN
+        else:
+            self._others["datetime"][row] = dt
+            self._kinds["datetime"][row] = self.ASIDE
+
+    def _set_number(self, values, column, row, value):
+        value_type = type(value)
+        if value_type is float or value_type is np.float64:
+            values[row] = value
+            self._kinds[column][row] = self.IN_COLUMN
+        elif value_type is int and abs(value) <= 2**53:
+            values[row] = value
+            self._kinds[column][row] = self.INT_IN_COLUMN
+        else:
+            self._others[column][row] = value
+            self._kinds[column][row] = self.ASIDE
+
+    def _datetime_column(self, n):
+        kinds = self._kinds["datetime"][:n]
+        if not self._others["datetime"]:
+            return pd.DatetimeIndex(self._datetimes[:n], tz="UTC").tz_convert(self._tz)
+
+        values = [
+            self._others["datetime"][row] if kind == self.ASIDE else pd.Timestamp(dt_ns, tz="UTC").tz_convert(self._tz)
+            for row, (kind, dt_ns) in enumerate(zip(kinds, self._datetimes[:n]))
+        ]
+        return values
+
+    def _number_column(self, values, column, n):
+        kinds = self._kinds[column][:n]
+        others = self._others[column]
+        if not others:
+            if n and (kinds == self.INT_IN_COLUMN).all():
+                return values[:n].astype(np.int64)
+            return values[:n].copy()
+
+        return [
+            others[row] if kind == self.ASIDE else (int(value) if kind == self.INT_IN_COLUMN else float(value))
+            for row, (kind, value) in enumerate(zip(kinds, values[:n]))
+        ]
@@ -0,0 +1,88 @@
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class TradeEventLog:
+    """Append-only log of the trade events of a broker.
+
+    The events are kept as a list of rows and only turned into a DataFrame when it is asked for, instead of
+    concatenating a one row DataFrame for every event. The fields of an event that are missing (None or NaN) are left
+    out of its row, so the DataFrame has the columns, column order and dtypes the events would have had when
+    concatenated one by one.
+
+    Parameters
+    ----------
+    parquet_dir : str
+        If set, the events are also written to this directory as Parquet files of ``chunk_size`` events while the log
+        grows, and only the events that were not written yet are kept in memory.
+    chunk_size : int
+        The number of events written to each Parquet file.
+    """
+
+    def __init__(self, parquet_dir=None, chunk_size=10000):
+        self.parquet_dir = parquet_dir
+        self.chunk_size = chunk_size
+        self._rows = []
+        self._chunk_files = []
+        self._df = None
+
+    def __len__(self):
+        return len(self._rows) + len(self._chunk_files) * self.chunk_size
+
+    def append(self, event):
+        """Add an event, given as a dictionary of its fields."""
+        self._rows.append({key: value for key, value in event.items() if not self._is_missing(value)})
+        self._df = None
+        if self.parquet_dir and len(self._rows) >= self.chunk_size:
+            self._write_chunk()
+
+    def to_dataframe(self):
+        """Return the events as a DataFrame, one row per event."""
+        if self._df is None:
+            frames = [pd.read_parquet(path) for path in self._chunk_files]
+            if self._rows:
+                frames.append(self._rows_to_dataframe(self._rows))
+            if not frames:
+                self._df = pd.DataFrame()
+            elif len(frames) == 1:
+                self._df = frames[0]
+            else:
+                self._df = pd.concat(frames, axis=0)
+        return self._df
+
+    def _write_chunk(self):
+        os.makedirs(self.parquet_dir, exist_ok=True)
+        path = os.path.join(self.parquet_dir, f"trade_events_{len(self._chunk_files):05d}.parquet")
+        try:
+            self._rows_to_dataframe(self._rows).to_parquet(path)
+        except (ImportError, TypeError, ValueError) as e:
+            # Keep the events in memory rather than failing the run because of the log
+            logging.warning(f"Could not write the trade events to {path}, keeping them in memory instead: {e}")
+            self.parquet_dir = None
+            return
+
+        self._chunk_files.append(path)
+        self._rows = []
+
+    @staticmethod
+    def _rows_to_dataframe(rows):
+        # Every event used to be its own one row DataFrame, with a zero index
+        df = pd.DataFrame(rows, index=np.zeros(len(rows), dtype=np.int64))
+
+        # A one row DataFrame keeps the resolution of a datetime (microseconds for a datetime.datetime), a column of
+        # them is converted to nanoseconds. Use the finest resolution of the events, like concatenating them did.
+        for column in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[column]):
+                examples = {type(row[column]): row[column] for row in rows if column in row}
+                units = [pd.DataFrame({column: value}, index=[0])[column].dtype.unit for value in examples.values()]
+                unit = min(units, key=["ns", "us", "ms", "s"].index)
+                if unit != df[column].dtype.unit:
+                    df[column] = df[column].dt.as_unit(unit)
+        return df
+
+    @staticmethod
+    def _is_missing(value):
+        return value is None or value is pd.NaT or (isinstance(value, (float, np.floating)) and np.isnan(value))
@@ -0,0 +1,48 @@
+import datetime
+
+import pandas as pd
+
+from lumibot.backtesting import BacktestingBroker, PandasDataBacktesting
+from lumibot.entities import Asset, Data
+from lumibot.strategies import BacktestingExecutor, Strategy
+
+
+class MinuteStrategy(Strategy):
+    def initialize(self):
+        self.sleeptime = "1M"
+        self.iterations = 0
+        self.fills = 0
+
+    def on_trading_iteration(self):
+        self.iterations += 1
+        if self.iterations == 1:
+            self.submit_order(self.create_order("XYZ", 1, "buy"))
+
+    def on_filled_order(self, position, order, price, quantity, multiplier):
+        self.fills += 1
+
+
+class TestBacktestingExecutor:
+    def test_run(self, monkeypatch):
+        # The timing of the loop is measured by benchmarks/backtest_iteration_overhead.py
+        df = pd.read_csv("data/XYZ_1Min.csv", index_col=0, parse_dates=True)
+        data_source = PandasDataBacktesting(
+            datetime_start=datetime.datetime(2020, 1, 6),
+            datetime_end=datetime.datetime(2020, 1, 11),
+            pandas_data=[Data(Asset("XYZ"), df, timestep="minute")],
+            show_progress_bar=False,
+        )
+        broker = BacktestingBroker(data_source=data_source)
+        strategy = MinuteStrategy(broker=broker, budget=100000, benchmark_asset=None, risk_free_rate=0)
+        executor = strategy._executor
+        assert isinstance(executor, BacktestingExecutor)
+        assert executor.scheduler is None
+
+        monkeypatch.setattr(strategy, "_dump_stats", lambda: None)
+        executor.run()
+
+        assert strategy.iterations == 1950
+        # The fill of the order went through the queue, which the loop drained without a scheduler
+        assert strategy.fills == 1
+        assert len(executor.queue) == 0
+        assert executor.scheduler is None
@@ -0,0 +1,157 @@
+import datetime
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from lumibot.backtesting import BacktestingBroker, PandasDataBacktesting
+from lumibot.entities import Asset, Data, Position
+from lumibot.strategies import Strategy
+from lumibot.tools import day_deduplicate
+from lumibot.traders import Trader
+
+
+class MeanReversion(Strategy):
+    parameters = {"period": 5, "quantity": 1, "sleeptime": "30M"}
+
+    def initialize(self):
+        self.sleeptime = self.parameters["sleeptime"]
+        self.events = []
+
+    def on_trading_iteration(self):
+        self.events.append(("iteration", self.get_datetime(), self.cash))
+        bars = self.get_historical_prices("XYZ", self.parameters["period"] + 1, "minute")
+        if bars is None:
+            return
+        close = bars.df["close"]
+        position = self.get_position(Asset("XYZ"))
+        if close.iloc[-1] > close.mean() and position is None:
+            self.submit_order(self.create_order("XYZ", self.parameters["quantity"], "buy"))
+        elif close.iloc[-1] < close.mean() and position is not None:
+            self.sell_all()
+
+    def on_filled_order(self, position, order, price, quantity, multiplier):
+        self.events.append(("fill", self.get_datetime(), order.side, quantity, price))
+
+
+STRATEGIES = [
+    ("fast", {"period": 5, "quantity": 1, "sleeptime": "30M"}, {}),
+    ("slow", {"period": 20, "quantity": 10, "sleeptime": "7M"}, {"minutes_before_closing": 30, "budget": 50000}),
+]
+
+
+def make_broker():
+    df = pd.read_csv("data/XYZ_1Min.csv", index_col=0, parse_dates=True)
+    data_source = PandasDataBacktesting(
+        datetime.datetime(2020, 1, 6),
+        datetime.datetime(2020, 1, 11),
+        pandas_data=[Data(Asset("XYZ"), df, timestep="minute")],
+        show_progress_bar=False,
+    )
+    return BacktestingBroker(data_source=data_source)
+
+
+def run(strategies, broker=None):
+    broker = broker or make_broker()
+    trader = Trader(backtest=True, quiet_logs=True)
+    for name, parameters, kwargs in strategies:
+        strategy = MeanReversion(
+            broker=broker, name=name, parameters=parameters, benchmark_asset=None, risk_free_rate=0, **kwargs
+        )
+        trader.add_strategy(strategy)
+    trader.run_all(show_plot=False, show_tearsheet=False, save_tearsheet=False, show_indicators=False)
+    return trader
+
+
+class TestMultiStrategyBacktest:
+    def test_strategies_run_as_if_alone(self):
+        trader = run(STRATEGIES)
+        together = {strategy.name: strategy for strategy in trader._strategies}
+
+        for spec in STRATEGIES:
+            alone = run([spec])._strategies[0]
+            strategy = together[alone.name]
+            assert strategy.events == alone.events
+            pd.testing.assert_frame_equal(strategy._stats, alone._stats)
+            assert strategy._analysis == alone._analysis
+
+        fast, slow = (day_deduplicate(together[name]._stats)["portfolio_value"] for name in ("fast", "slow"))
+        index = fast.index.union(slow.index)
+        # Before its first stats, a strategy counts with its budget
+        expected = fast.reindex(index).ffill().fillna(100000) + slow.reindex(index).ffill().fillna(50000)
+        assert trader.combined_stats["portfolio_value"].tolist() == expected.tolist()
+        assert trader.combined_stats["portfolio_value"].iloc[0] == 150000
+        assert trader.combined_analysis["total_return"] == pytest.approx(
+            trader.combined_stats["portfolio_value"].iloc[-1] / 150000 - 1
+        )
+
+    def test_strategies_move_the_clock_with_their_cash(self):
+        def record_clock(strategies):
+            broker = make_broker()
+            calls = []
+            update_datetime = broker.data_source._update_datetime
+
+            def recorded_update_datetime(dt, cash=None, portfolio_value=None):
+                calls.append((dt, cash, portfolio_value))
+                return update_datetime(dt, cash=cash, portfolio_value=portfolio_value)
+
+            broker.data_source._update_datetime = recorded_update_datetime
+            run(strategies, broker)
+            return calls
+
+        together = record_clock(STRATEGIES)
+        alone = [call for spec in STRATEGIES for call in record_clock([spec])]
+        # The data source sees the cash and portfolio value of the strategy that moves the clock, as it would alone
+        assert set(together) <= set(alone)
+        assert any(cash is not None for _, cash, _ in together)
+
+    def test_combined_stats_do_not_look_ahead(self):
+        index = pd.date_range("2020-01-06", periods=3, freq="D", tz="America/New_York")
+        early = pd.DataFrame({"portfolio_value": [100.0, 110.0, 120.0], "cash": [100.0, 50.0, 50.0]}, index=index)
+        late = pd.DataFrame({"portfolio_value": [60.0, 70.0], "cash": [60.0, 60.0]}, index=index[1:])
+
+        trader = Trader(backtest=True)
+        trader._strategies = [
+            SimpleNamespace(_name="early", _stats=early, _initial_budget=100, risk_free_rate=0),
+            SimpleNamespace(_name="late", _stats=late, _initial_budget=50, risk_free_rate=0),
+        ]
+        trader._combine_stats()
+        assert trader.combined_stats["portfolio_value"].tolist() == [150.0, 170.0, 190.0]
+        assert trader.combined_stats["cash"].tolist() == [150.0, 110.0, 110.0]
+
+        # Without a starting budget, there is no total before every strategy has stats
+        trader._strategies[1]._initial_budget = None
+        trader._combine_stats()
+        assert trader.combined_stats["portfolio_value"].isna().tolist() == [True, False, False]
+
+    def test_cash_positions(self):
+        broker = make_broker()
+        fast = MeanReversion(broker=broker, name="fast", benchmark_asset=None)
+        slow = MeanReversion(broker=broker, name="slow", benchmark_asset=None, budget=50000)
+        assert [(p.strategy, p.quantity) for p in broker._filled_positions] == [("fast", 100000), ("slow", 50000)]
+
+        # In a backtest, every strategy sharing the broker has its own cash
+        fast._set_cash_position(400)
+        assert [(p.strategy, p.quantity) for p in broker._filled_positions] == [("fast", 400), ("slow", 50000)]
+
+        # When trading live, any cash position is updated, like one synced from the broker without a strategy
+        broker._filled_positions.remove_all()
+        broker._filled_positions.append(Position("", fast.quote_asset, 10))
+        fast.is_backtesting = False
+        fast._set_cash_position(500)
+        assert [(p.strategy, p.quantity) for p in broker._filled_positions] == [("", 500)]
+
+    def test_strategies_must_share_the_broker(self):
+        trader = Trader(backtest=True)
+        for name, parameters, _ in STRATEGIES:
+            trader.add_strategy(MeanReversion(broker=make_broker(), name=name, parameters=parameters))
+        with pytest.raises(Exception, match="share the same broker"):
+            trader.run_all()
+
+    def test_strategies_must_have_different_names(self):
+        broker = make_broker()
+        trader = Trader(backtest=True)
+        for _ in range(2):
+            trader.add_strategy(MeanReversion(broker=broker, name="same"))
+        with pytest.raises(Exception, match="different names"):
+            trader.run_all()
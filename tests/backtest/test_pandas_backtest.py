@@ -43,3 +43,21 @@ class TestPandasBacktest:
         )
         logger.info(f"Result: {result}")
         assert result is not None
+
+    def test_backtest_without_benchmark(self, pandas_data_fixture):
+        result = LifecycleLogger.backtest(
+            datasource_class=PandasDataBacktesting,
+            backtesting_start=DateTime(2019, 1, 14),
+            backtesting_end=DateTime(2019, 1, 20),
+            pandas_data=list(pandas_data_fixture.values()),
+            benchmark_asset=None,
+            risk_free_rate=0,
+            show_plot=False,
+            save_tearsheet=False,
+            show_tearsheet=False,
+            show_indicators=False,
+            budget=40000,
+            show_progress_bar=False,
+            quiet_logs=True,
+        )
+        assert result["total_return"] is not None
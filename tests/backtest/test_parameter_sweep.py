@@ -0,0 +1,122 @@
+import datetime
+
+import pandas as pd
+
+from lumibot.backtesting import PandasDataBacktesting
+from lumibot.entities import Asset, Data
+from lumibot.strategies import Strategy
+
+
+class MeanReversion(Strategy):
+    parameters = {"period": 5, "quantity": 1}
+
+    def initialize(self):
+        self.sleeptime = "30M"
+
+    def on_trading_iteration(self):
+        bars = self.get_historical_prices("XYZ", self.parameters["period"] + 1, "minute")
+        if bars is None:
+            return
+        close = bars.df["close"]
+        position = self.get_position(Asset("XYZ"))
+        if close.iloc[-1] > close.mean() and position is None:
+            self.submit_order(self.create_order("XYZ", self.parameters["quantity"], "buy"))
+        elif close.iloc[-1] < close.mean() and position is not None:
+            self.sell_all()
+
+
+class FailingAnalysis(MeanReversion):
+    def write_backtest_settings(self, settings_file):
+        if self.parameters["quantity"] <= 0:
+            raise ValueError("The quantity must be positive")
+        super().write_backtest_settings(settings_file)
+
+
+def make_backtest_kwargs():
+    df = pd.read_csv("data/XYZ_1Min.csv", index_col=0, parse_dates=True)
+    return dict(
+        datasource_class=PandasDataBacktesting,
+        backtesting_start=datetime.datetime(2020, 1, 6),
+        backtesting_end=datetime.datetime(2020, 1, 18),
+        pandas_data=[Data(Asset("XYZ"), df, timestep="minute")],
+        budget=100000,
+        benchmark_asset=None,
+        risk_free_rate=0,
+    )
+
+
+class TestParameterSweep:
+    def test_run_parameter_sweep(self):
+        backtest_kwargs = make_backtest_kwargs()
+
+        results = MeanReversion.run_parameter_sweep(
+            {"period": [5, 20], "quantity": [1, 10]}, max_workers=2, **backtest_kwargs
+        )
+
+        assert list(results.columns) == [
+            "period",
+            "quantity",
+            "cagr",
+            "volatility",
+            "sharpe",
+            "max_drawdown",
+            "max_drawdown_date",
+            "romad",
+            "total_return",
+            "error",
+        ]
+        assert results[["period", "quantity"]].values.tolist() == [[5, 1], [5, 10], [20, 1], [20, 10]]
+        assert results["total_return"].notna().all()
+        assert results["error"].isna().all()
+
+        # Every row has the results of a backtest run on its own with the same parameters
+        analysis, _ = MeanReversion.run_backtest(
+            parameters={"period": 20, "quantity": 10},
+            show_plot=False,
+            show_tearsheet=False,
+            save_tearsheet=False,
+            show_indicators=False,
+            show_progress_bar=False,
+            quiet_logs=True,
+            **backtest_kwargs,
+        )
+        row = results.iloc[3]
+        assert row["total_return"] == analysis["total_return"]
+        assert row["sharpe"] == analysis["sharpe"]
+        assert row["max_drawdown"] == analysis["max_drawdown"]["drawdown"]
+
+    def test_shared_memory(self):
+        param_grid = [{"period": 5, "quantity": 1}, {"period": 20, "quantity": 10}]
+        results = MeanReversion.run_parameter_sweep(param_grid, max_workers=2, **make_backtest_kwargs())
+        shared_results = MeanReversion.run_parameter_sweep(
+            param_grid, max_workers=2, shared_memory=True, **make_backtest_kwargs()
+        )
+        pd.testing.assert_frame_equal(shared_results, results)
+
+    def test_failing_backtest_is_reported(self):
+        results = FailingAnalysis.run_parameter_sweep(
+            [{"period": 5, "quantity": 1}, {"period": 5, "quantity": 0}], max_workers=2, **make_backtest_kwargs()
+        )
+
+        assert results["total_return"].notna().tolist() == [True, False]
+        assert results["error"].isna().tolist() == [True, False]
+        assert results["error"].iloc[1] == "ValueError: The quantity must be positive"
+
+    def test_shared_memory_data_source_arguments(self, tmp_path):
+        # The data source arguments of run_backtest are used to fill the shared data too
+        param_grid = [{"period": 5, "quantity": 1}]
+        results = MeanReversion.run_parameter_sweep(param_grid, max_workers=1, **make_backtest_kwargs())
+        shared_results = MeanReversion.run_parameter_sweep(
+            param_grid, max_workers=1, shared_memory=True, storage_dir=str(tmp_path), **make_backtest_kwargs()
+        )
+        pd.testing.assert_frame_equal(shared_results, results)
+        assert list(tmp_path.glob("*.npy"))
+
+    def test_workers_do_not_write_logs(self, tmp_path, monkeypatch):
+        backtest_kwargs = make_backtest_kwargs()
+        monkeypatch.chdir(tmp_path)
+
+        results = MeanReversion.run_parameter_sweep({"period": [5, 20]}, max_workers=2, **backtest_kwargs)
+
+        assert results["total_return"].notna().all()
+        assert not list(tmp_path.rglob("*"))
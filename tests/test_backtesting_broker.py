@@ -1,9 +1,13 @@
 import datetime
+import timeit
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
+from lumibot import LUMIBOT_DEFAULT_PYTZ
 from lumibot.backtesting import BacktestingBroker
 from lumibot.data_sources import PandasData
-from lumibot.entities import Asset, Order
+from lumibot.entities import Asset, Order, Position
+from lumibot.tools import get_trading_days
 
 
 class TestBacktestingBroker:
@@ -70,3 +74,94 @@ class TestBacktestingBroker:
         Order(asset=Asset("SPY"), quantity=10, side="buy", strategy='abc')
         broker.submit_order(Order(asset=Asset("SPY"), quantity=10, side="buy", strategy='abc'))
         broker._conform_order.assert_called_once()
+
+    def test_batch_fill_prices_match_single_orders(self):
+        start = datetime.datetime(2023, 8, 1)
+        end = datetime.datetime(2023, 8, 2)
+        data_source = PandasData(datetime_start=start, datetime_end=end, pandas_data={})
+        broker = BacktestingBroker(data_source=data_source)
+        bar = {"open": 100.0, "high": 110.0, "low": 90.0}
+
+        asset = Asset("SPY")
+        orders = []
+        for price in range(80, 125, 5):
+            for side in ["buy", "sell"]:
+                orders.append(Order("test", asset, 1, side, limit_price=price))
+                orders.append(Order("test", asset, 1, side, stop_price=price))
+                orders.append(Order("test", asset, 1, side, limit_price=price, stop_price=100 + (price - 100) / 2))
+        assert len(orders) >= broker.VECTORIZED_FILL_MIN_ORDERS
+
+        expected = [broker._get_fill_price(order, bar["open"], bar["high"], bar["low"]) for order in orders]
+        assert broker._get_fill_prices(orders, bar) == expected
+        assert (105, False) in expected and (100.0, False) in expected and (None, False) in expected
+
+    def test_submit_oco_order_tracks_the_legs(self):
+        start = datetime.datetime(2023, 8, 1)
+        end = datetime.datetime(2023, 8, 2)
+        data_source = PandasData(datetime_start=start, datetime_end=end, pandas_data={})
+        broker = BacktestingBroker(data_source=data_source)
+
+        order = Order("abc", Asset("SPY"), 10, "sell", order_class="oco", take_profit_price=110, stop_loss_price=90)
+        assert broker.submit_order(order) is order
+        assert order not in broker._new_orders
+        assert len(broker._new_orders) == 2
+
+        order = Order("abc", Asset("SPY"), 10, "buy")
+        broker.submit_order(order)
+        assert order in broker._new_orders
+        assert len(broker._new_orders) == 3
+
+    def test_attribute_access_is_not_intercepted(self):
+        # Micro-benchmark: the broker attributes read on every bar cost the same as on a plain object
+        start = datetime.datetime(2023, 8, 1)
+        end = datetime.datetime(2023, 8, 2)
+        data_source = PandasData(datetime_start=start, datetime_end=end, pandas_data={})
+        broker = BacktestingBroker(data_source=data_source)
+        plain = SimpleNamespace(data_source=data_source)
+
+        assert type(broker).__getattribute__ is object.__getattribute__
+        broker_time = min(timeit.repeat(lambda: broker.data_source, number=20000, repeat=5))
+        plain_time = min(timeit.repeat(lambda: plain.data_source, number=20000, repeat=5))
+        assert broker_time < 2.5 * plain_time
+
+    def test_clock_functions_use_the_trading_days(self):
+        start = datetime.datetime(2023, 8, 1)
+        end = datetime.datetime(2023, 8, 10)
+        data_source = PandasData(datetime_start=start, datetime_end=end, pandas_data={})
+        broker = BacktestingBroker(data_source=data_source)
+        trading_days = get_trading_days("NYSE", start_date="2023-07-25", end_date="2023-08-15")
+        broker._trading_days = trading_days.set_index("market_close")
+
+        # Friday during the session
+        data_source._datetime = LUMIBOT_DEFAULT_PYTZ.localize(datetime.datetime(2023, 8, 4, 15, 30))
+        assert broker.is_market_open() is True
+        assert broker.get_time_to_close() == 30 * 60
+        assert broker.get_time_to_open() == 0
+
+        # Friday after the close
+        data_source._datetime = LUMIBOT_DEFAULT_PYTZ.localize(datetime.datetime(2023, 8, 4, 16, 5))
+        assert broker.is_market_open() is False
+        assert broker.get_time_to_close() is None
+        assert broker.get_time_to_open() == (2 * 24 * 60 + 17 * 60 + 25) * 60
+        assert broker._get_next_trading_day() == LUMIBOT_DEFAULT_PYTZ.localize(datetime.datetime(2023, 8, 7, 9, 30))
+
+    def test_has_expired_contracts(self):
+        start = datetime.datetime(2023, 8, 1)
+        end = datetime.datetime(2023, 8, 10)
+        data_source = PandasData(datetime_start=start, datetime_end=end, pandas_data={})
+        broker = BacktestingBroker(data_source=data_source)
+        strategy = MagicMock()
+        strategy.name = "strategy"
+        option = Asset("SPY", asset_type="option", expiration=datetime.date(2023, 8, 4), strike=450, right="CALL")
+        broker._filled_positions.append(Position("strategy", Asset("SPY"), 10))
+
+        # Nothing to settle at the close, the clock can jump over it
+        close = LUMIBOT_DEFAULT_PYTZ.localize(datetime.datetime(2023, 8, 4, 16, 0))
+        assert broker.has_expired_contracts(strategy, close) is False
+
+        broker._filled_positions.append(Position("strategy", option, 1))
+        assert broker.has_expired_contracts(strategy, close) is True
+        assert broker.has_expired_contracts(strategy, close - datetime.timedelta(days=1)) is False
+
+        strategy.name = "other"
+        assert broker.has_expired_contracts(strategy, close) is False
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from lumibot import LUMIBOT_DEFAULT_PYTZ
+from lumibot.entities import Asset, Bars
+
+
+def make_arrays(dividend=False):
+    index = pd.date_range("2023-01-03", periods=5, freq="D", tz=LUMIBOT_DEFAULT_PYTZ, name="datetime")
+    data = {
+        "datetime": index,
+        "open": np.array([10.0, 11.0, 12.0, 13.0, 14.0]),
+        "high": np.array([11.0, 12.0, 13.0, 14.0, 15.0]),
+        "low": np.array([9.0, 10.0, 11.0, 12.0, 13.0]),
+        "close": np.array([10.5, 11.5, 12.5, 13.5, 14.5]),
+        "volume": np.array([100.0, 200.0, 300.0, 400.0, 500.0]),
+    }
+    if dividend:
+        data["dividend"] = np.array([0.0, 0.0, 0.1, 0.0, 0.0])
+    return data
+
+
+class TestBarsFromArrays:
+    def test_columns_are_the_arrays(self):
+        data = make_arrays()
+        bars = Bars.from_arrays(data, "pandas", Asset("SPY"))
+        assert bars.close is data["close"]
+        assert bars._df is None
+        assert bars.get_last_price() == 14.5
+
+    def test_compact_last_price_is_a_float(self):
+        data = make_arrays(dividend=True)
+        data["close"] = data["close"].astype(np.float32)
+        data["dividend"] = data["dividend"].astype(np.float32)
+        bars = Bars.from_arrays(data, "pandas", Asset("SPY"))
+        assert type(bars.get_last_price()) is float
+        assert bars.get_last_price() == 14.5
+        assert type(bars.get_last_dividend()) is float
+
+    def test_df_matches_eager_bars(self):
+        data = make_arrays(dividend=True)
+        lazy = Bars.from_arrays(data, "pandas", Asset("SPY"))
+        df = pd.DataFrame({k: v for k, v in data.items() if k != "datetime"}, index=data["datetime"])
+        eager = Bars(df, "pandas", Asset("SPY"))
+        pd.testing.assert_frame_equal(lazy.df, eager.df)
+        np.testing.assert_array_equal(eager.close, data["close"])
+
+    def test_momentum_matches_eager_bars(self):
+        for dividend in (False, True):
+            data = make_arrays(dividend=dividend)
+            lazy = Bars.from_arrays(data, "pandas", Asset("SPY"))
+            df = pd.DataFrame({k: v for k, v in data.items() if k != "datetime"}, index=data["datetime"])
+            eager = Bars(df, "pandas", Asset("SPY"))
+            for num_periods in (1, 3, 5):
+                assert np.isclose(lazy.get_momentum(num_periods), eager.get_momentum(num_periods))
@@ -0,0 +1,290 @@
+import datetime
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from lumibot import LUMIBOT_DEFAULT_PYTZ
+from lumibot.entities import Asset, Data
+from lumibot.entities.data import DataClock
+
+
+def make_minute_data(periods=10):
+    index = pd.date_range("2023-01-03 09:30", periods=periods, freq="1min", tz=LUMIBOT_DEFAULT_PYTZ)
+    df = pd.DataFrame(
+        {
+            "open": np.arange(periods, dtype=float) + 100,
+            "high": np.arange(periods, dtype=float) + 101,
+            "low": np.arange(periods, dtype=float) + 99,
+            "close": np.arange(periods, dtype=float) + 100.5,
+            "volume": np.full(periods, 1000.0),
+        },
+        index=index,
+    )
+    return Data(Asset("SPY"), df, timestep="minute")
+
+
+def make_off_grid_data():
+    data = make_minute_data()
+    data.df.index = data.df.index + pd.Timedelta(seconds=30)
+    data.datetime_start = data.df.index[0]
+    return data
+
+
+class TestDataIndex:
+    def test_index_is_int64_nanoseconds(self):
+        data = make_minute_data()
+        data.repair_times_and_fill(data.df.index)
+        assert data.index_ns.dtype == np.int64
+        assert data.index_ns[0] == data.df.index[0].value
+
+    def test_get_iter_count_exact_and_between_rows(self):
+        data = make_minute_data()
+        start = data.df.index[0]
+        assert data.get_iter_count(start) == 0
+        assert data.get_iter_count(start + pd.Timedelta(minutes=3)) == 3
+        # Between two rows returns the last known row
+        assert data.get_iter_count(start + pd.Timedelta(minutes=3, seconds=30)) == 3
+        # After the end returns the last row
+        assert data.get_iter_count(start + pd.Timedelta(days=1)) == 9
+        # Before the start there is no row
+        assert data.get_iter_count(start - pd.Timedelta(minutes=1)) == -1
+
+    def test_get_iter_count_backwards_after_cursor_moved(self):
+        data = make_minute_data()
+        start = data.df.index[0]
+        assert data.get_iter_count(start + pd.Timedelta(minutes=8)) == 8
+        assert data.get_iter_count(start + pd.Timedelta(minutes=2)) == 2
+
+    def test_get_iter_count_accepts_python_datetimes(self):
+        data = make_minute_data()
+        dt = LUMIBOT_DEFAULT_PYTZ.localize(datetime.datetime(2023, 1, 3, 9, 35))
+        assert data.get_iter_count(dt) == 5
+        assert data.get_iter_count(dt.astimezone(datetime.timezone.utc)) == 5
+
+    def test_get_last_price_uses_open_at_bar_start(self):
+        data = make_minute_data()
+        start = data.df.index[0]
+        assert data.get_last_price(start + pd.Timedelta(minutes=4)) == 104
+        assert data.get_last_price(start + pd.Timedelta(minutes=4, seconds=1)) == 104.5
+
+    def test_get_last_prices_matches_get_last_price(self):
+        datas = [make_minute_data(), make_minute_data(periods=5)]
+        datas[1].df["close"] += 1
+        for data in datas:
+            data.repair_times_and_fill(datas[0].df.index)
+        start = datas[0].df.index[0]
+        for dt in (start + pd.Timedelta(minutes=2), start + pd.Timedelta(minutes=7, seconds=30)):
+            assert Data.get_last_prices(datas, dt) == [data.get_last_price(dt) for data in datas]
+        assert Data.get_last_prices(datas, start - pd.Timedelta(minutes=1)) == [None, None]
+
+    def test_get_last_price_before_start_raises(self):
+        data = make_minute_data()
+        with pytest.raises(ValueError):
+            data.get_last_price(data.df.index[0] - pd.Timedelta(minutes=1))
+
+    def test_no_data_before_the_first_filled_row(self):
+        # The first row is not on the minute grid, so dt is after datetime_start but before the first filled row
+        data = make_off_grid_data()
+        dt = data.df.index[0] + pd.Timedelta(seconds=15)
+        data.repair_times_and_fill(data.df.index - pd.Timedelta(seconds=30))
+        assert data.datetime_start < dt
+        assert data.get_iter_count(dt) == -1
+
+        with pytest.raises(ValueError):
+            data.get_last_price(dt)
+        with pytest.raises(ValueError):
+            data.get_bars(dt, length=2)
+
+    def test_get_last_prices_before_the_first_filled_row(self):
+        data = make_off_grid_data()
+        dt = data.df.index[0] + pd.Timedelta(seconds=15)
+        data.repair_times_and_fill(data.df.index - pd.Timedelta(seconds=30))
+        assert Data.get_last_prices([data], dt) == [None]
+
+    def test_timeshift_before_the_first_row_returns_no_bars(self):
+        data = make_minute_data()
+        assert data._get_bars_rows(data.df.index[1], length=2, timeshift=3) == (0, 0)
+
+
+class TestDataClock:
+    def test_advance_finds_the_row_at_or_before(self):
+        data = make_minute_data()
+        clock = DataClock(data.df.index.asi8)
+        start = data.df.index[0]
+        for minutes, row in [(-1, -1), (0, 0), (1.5, 1), (2, 2), (7, 7), (3, 3), (60, 9)]:
+            clock.advance(start + pd.Timedelta(minutes=minutes))
+            assert clock.row == row
+
+    def test_aligned_data_reads_the_clock_row(self):
+        data = make_minute_data()
+        data.repair_times_and_fill(data.df.index)
+        data.clock = DataClock(data.index_ns)
+        dt = data.df.index[5]
+        data.clock.advance(dt)
+        data.clock.row = 2
+        assert data.get_iter_count(dt) == 2
+        # Another datetime object, or data with another index, is looked up as usual
+        assert data.get_iter_count(dt.to_pydatetime()) == 5
+        data.clock.index_ns = data.index_ns.copy()
+        assert data.get_iter_count(dt) == 5
+
+    def test_no_data_from_the_clock_before_the_first_row(self):
+        data = make_off_grid_data()
+        dt = data.df.index[0] + pd.Timedelta(seconds=15)
+        data.repair_times_and_fill(data.df.index - pd.Timedelta(seconds=30))
+        data.clock = DataClock(data.index_ns)
+        data.clock.advance(dt)
+        assert data.clock.row == -1
+
+        with pytest.raises(ValueError):
+            data.get_last_price(data.clock.datetime)
+        assert Data.get_last_prices([data], data.clock.datetime) == [None]
+
+
+class TestDataGetBars:
+    def test_aggregated_bars_match_resample(self):
+        data = make_minute_data(periods=120)
+        dt = data.df.index[-1]
+        bars = data.get_bars(dt, length=4, timestep="15minute")
+
+        df = data.df.iloc[:-1]
+        expected = df.resample("15min").agg(
+            {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+        ).tail(4)
+        pd.testing.assert_frame_equal(bars, expected, check_freq=False)
+
+    def test_hour_timestep_is_60_minutes(self):
+        data = make_minute_data(periods=180)
+        dt = data.df.index[-1]
+        pd.testing.assert_frame_equal(
+            data.get_bars(dt, length=2, timestep="hour"),
+            data.get_bars(dt, length=2, timestep="60minute"),
+        )
+
+    def test_aggregated_bars_are_cached_and_extended(self):
+        data = make_minute_data(periods=120)
+        first = data.get_bars(data.df.index[40], length=2, timestep="5minute")
+        later = data.get_bars(data.df.index[100], length=2, timestep="5minute")
+        assert len(data._bars_cache) == 1
+        assert first.index[-1] < later.index[-1]
+        assert later["volume"].iloc[-1] == 5000
+
+
+class TestDataStorageDir:
+    def test_columns_are_memory_mapped(self, tmp_path):
+        data = make_minute_data()
+        data.storage_dir = str(tmp_path)
+        expected = data.df.copy()
+        data.repair_times_and_fill(data.df.index)
+
+        assert isinstance(data.datalines["close"].dataline.base, np.memmap)
+        assert not data.datalines["close"].dataline.flags.writeable
+        pd.testing.assert_frame_equal(data.df, expected, check_freq=False)
+        assert data.get_last_price(data.df.index[3]) == 103
+
+    def test_identical_columns_share_files(self, tmp_path):
+        first = make_minute_data()
+        second = make_minute_data()
+        for data in (first, second):
+            data.storage_dir = str(tmp_path)
+            data.repair_times_and_fill(data.df.index)
+
+        assert len(list(tmp_path.glob("*.npy"))) == 5
+        assert first.datalines["close"].dataline.base.filename == second.datalines["close"].dataline.base.filename
+
+    def test_threads_write_identical_columns(self, tmp_path):
+        datas = [make_minute_data() for _ in range(8)]
+        for data in datas:
+            data.storage_dir = str(tmp_path)
+
+        with ThreadPoolExecutor(max_workers=len(datas)) as executor:
+            list(executor.map(lambda data: data.repair_times_and_fill(data.df.index), datas))
+
+        assert len(list(tmp_path.glob("*.npy"))) == 5
+        assert not list(tmp_path.glob("*.tmp"))
+        for data in datas:
+            assert data.get_last_price(data.df.index[3]) == 103
+
+    def test_clear_storage_dir(self, tmp_path):
+        data = make_minute_data()
+        data.storage_dir = str(tmp_path)
+        data.repair_times_and_fill(data.df.index)
+        (tmp_path / "leftover.tmp").write_bytes(b"")
+        (tmp_path / "notes.txt").write_text("kept")
+
+        assert Data.clear_storage_dir(str(tmp_path)) == 6
+        assert [path.name for path in tmp_path.iterdir()] == ["notes.txt"]
+        assert Data.clear_storage_dir(str(tmp_path / "missing")) == 0
+
+
+class TestSharedData:
+    def test_attach_reads_the_shared_columns(self):
+        data = make_minute_data()
+        data.df["condition"] = "regular"
+        shared = data.to_shared_memory()
+        try:
+            attached = pickle.loads(pickle.dumps(shared)).attach()
+
+            pd.testing.assert_frame_equal(attached.df, data.df, check_freq=False)
+            assert np.array_equal(attached.index_ns, data.index_ns)
+            assert attached.asset == data.asset
+            assert attached.datetime_end == data.datetime_end
+            close = attached.datalines["close"].dataline
+            assert not close.flags.writeable
+            segment = np.ndarray(attached._shared_memory.size, dtype=np.uint8, buffer=attached._shared_memory.buf)
+            assert np.shares_memory(close, segment)
+            assert attached.get_last_price(data.df.index[3]) == 103
+
+            # Filling the attached data on the dates it was shared with keeps the shared columns
+            attached.repair_times_and_fill(data.df.index)
+            assert attached.datalines["close"].dataline is close
+            del attached, close, segment
+        finally:
+            shared.unlink()
+
+
+class TestDataCompact:
+    def test_compact_dtypes(self):
+        data = make_minute_data()
+        data.df["bid_exchange"] = 12.0
+        data.compact = True
+        data.repair_times_and_fill(data.df.index)
+
+        assert data.df["close"].dtype == np.float32
+        assert data.df["volume"].dtype == np.uint32
+        assert data.df["bid_exchange"].dtype == np.int8
+        price = data.get_last_price(data.df.index[2])
+        assert isinstance(price, float)
+        assert price == 102
+
+    def test_compact_daily_volume_does_not_overflow(self):
+        data = make_minute_data(periods=60)
+        data.df["volume"] = float(np.iinfo(np.uint32).max)
+        data.compact = True
+        data.repair_times_and_fill(data.df.index)
+
+        bars = data.get_bars(data.df.index[-1], length=2, timestep="30minute")
+        assert bars["volume"].iloc[0] == 30 * np.iinfo(np.uint32).max
+
+
+class TestDataRepairTimesAndFill:
+    def test_gaps_take_the_previous_row(self):
+        data = make_minute_data(periods=4)
+        full_index = pd.date_range(data.df.index[0], periods=6, freq="30s", tz=LUMIBOT_DEFAULT_PYTZ)
+        expected = data.df.reindex(full_index, method="ffill")
+        data.repair_times_and_fill(full_index)
+        pd.testing.assert_frame_equal(data.df, expected, check_freq=False)
+
+    def test_missing_values_are_filled(self):
+        data = make_minute_data(periods=4)
+        data.df.loc[data.df.index[1], ["open", "high", "volume"]] = np.nan
+        data.df.loc[data.df.index[2], "close"] = np.nan
+        data.repair_times_and_fill(data.df.index)
+
+        assert data.df["volume"].iloc[1] == 0
+        assert data.df["open"].iloc[1] == data.df["close"].iloc[1]
+        assert data.df["high"].iloc[1] == data.df["close"].iloc[1]
+        assert data.df["close"].iloc[2] == data.df["close"].iloc[1]
@@ -1,3 +1,12 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from lumibot import LUMIBOT_DEFAULT_PYTZ
+from lumibot.data_sources import PandasData
+from lumibot.data_sources.pandas_data import PandasDataStore
+from lumibot.entities import Asset, Data
 from tests.fixtures import pandas_data_fixture
 
 
@@ -18,3 +27,134 @@ class TestPandasData:
         ]
         assert spy.df.columns.tolist() == expected_columns
 
+    def test_update_date_index_merges_all_assets(self, pandas_data_fixture):
+        data_source = PandasData(
+            datetime.datetime(2019, 1, 2), datetime.datetime(2019, 12, 31), pandas_data=pandas_data_fixture
+        )
+        expected = None
+        for data in pandas_data_fixture.values():
+            expected = data.df.index if expected is None else expected.join(data.df.index, how="outer")
+        assert data_source.update_date_index().equals(expected)
+
+    def test_clean_trading_times_fills_minutes_within_sessions(self):
+        index = pd.DatetimeIndex(
+            ["2023-01-03 09:30", "2023-01-03 09:33", "2023-01-04 09:30", "2023-01-04 09:31"],
+            tz=LUMIBOT_DEFAULT_PYTZ,
+        )
+        data_source = PandasData(datetime.datetime(2023, 1, 3), datetime.datetime(2023, 1, 5), pandas_data={})
+        pcal = pd.DataFrame(
+            {"market_open": index[[0, 2]], "market_close": index[[1, 3]]},
+            index=[index[0].date(), index[2].date()],
+        )
+        result = data_source.clean_trading_times(index, pcal)
+        expected = index[:1].append(pd.date_range(index[0], periods=4, freq="1min")[1:]).append(index[2:])
+        assert result.equals(expected)
+
+
+def make_option_data(strike, right="CALL", expiration=datetime.date(2023, 1, 20), quote=None):
+    index = pd.date_range("2023-01-03 09:30", periods=2, freq="1min", tz=LUMIBOT_DEFAULT_PYTZ)
+    df = pd.DataFrame({"open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1.0}, index=index)
+    asset = Asset("SPY", asset_type="option", expiration=expiration, strike=strike, right=right)
+    return Data(asset, df, quote=quote or Asset("USD", asset_type="forex"), timestep="minute")
+
+
+class TestPandasDataStore:
+    def test_chains_are_indexed_and_sorted(self):
+        data_source = PandasData(
+            datetime.datetime(2023, 1, 3),
+            datetime.datetime(2023, 1, 5),
+            pandas_data=[make_option_data(410), make_option_data(400), make_option_data(405, right="PUT")],
+        )
+        chains = data_source.get_chains(Asset("SPY"))
+        assert chains["Chains"]["CALL"][datetime.date(2023, 1, 20)] == [400, 410]
+        assert chains["Chains"]["PUT"][datetime.date(2023, 1, 20)] == [405]
+        assert data_source.get_strikes(Asset("SPY")) == [400, 405, 410]
+        assert data_source.get_chains(Asset("QQQ"))["Chains"]["CALL"] == {}
+
+    def test_index_follows_additions_and_evictions(self):
+        data_source = PandasData(
+            datetime.datetime(2023, 1, 3), datetime.datetime(2023, 1, 5), pandas_data=[make_option_data(400)]
+        )
+        data_source.pandas_data.update(data_source._set_pandas_data_keys([make_option_data(420)]))
+        option = Asset("SPY", asset_type="option", expiration=datetime.date(2023, 1, 20), right="CALL")
+        assert data_source.get_nearest_strike(option, 411) == 420
+        assert data_source.get_nearest_strike(option, 410) == 400
+
+        data_source.pandas_data.popitem(last=False)
+        assert data_source.get_strikes(option) == [420]
+        del data_source.pandas_data[next(iter(data_source.pandas_data))]
+        assert data_source.get_nearest_strike(option, 410) is None
+        assert data_source.get_chains(Asset("SPY"))["Chains"]["CALL"] == {}
+
+    def test_contract_with_several_quotes_is_indexed_once(self):
+        store = PandasDataStore()
+        for quote in (Asset("USD", asset_type="forex"), Asset("EUR", asset_type="forex")):
+            data = make_option_data(400, quote=quote)
+            store[(data.asset, data.quote)] = data
+        assert store.get_strikes("SPY", "CALL", datetime.date(2023, 1, 20)) == [400]
+        store.pop(next(iter(store)))
+        assert store.get_strikes("SPY", "CALL", datetime.date(2023, 1, 20)) == [400]
+
+
+class TestPandasDataGetLastPrices:
+    def test_batch_matches_single_prices(self, pandas_data_fixture):
+        data_source = PandasData(
+            datetime.datetime(2019, 1, 2), datetime.datetime(2019, 12, 31), pandas_data=pandas_data_fixture
+        )
+        data_source.load_data()
+        data_source._datetime = LUMIBOT_DEFAULT_PYTZ.localize(datetime.datetime(2019, 6, 3, 16))
+        assets = [Asset("SPY"), Asset("GLD"), Asset("MISSING")]
+
+        prices = data_source.get_last_prices(assets)
+        assert prices == {asset: data_source.get_last_price(asset) for asset in assets}
+        assert prices[Asset("MISSING")] is None
+
+        array = data_source.get_last_prices(assets, as_array=True)
+        assert array[:2].tolist() == [prices[Asset("SPY")], prices[Asset("GLD")]]
+        assert np.isnan(array[2])
+
+    def test_loaded_data_share_the_index_array(self, pandas_data_fixture):
+        data_source = PandasData(
+            datetime.datetime(2019, 1, 2), datetime.datetime(2019, 12, 31), pandas_data=pandas_data_fixture
+        )
+        data_source.load_data()
+        first, *others = data_source._data_store.values()
+        for data in others:
+            assert data.index_ns is first.index_ns
+
+    def test_update_datetime_advances_the_clock(self, pandas_data_fixture):
+        data_source = PandasData(
+            datetime.datetime(2019, 1, 2), datetime.datetime(2019, 12, 31), pandas_data=pandas_data_fixture
+        )
+        data_source._show_progress_bar = False
+        data_source.load_data()
+        spy = data_source._data_store[data_source.find_asset_in_data_store(Asset("SPY"))]
+        dt = data_source._date_index[10]
+        data_source._update_datetime(dt)
+        assert data_source._clock.row == 10
+        assert spy.get_iter_count(dt) == 10
+        assert data_source.get_last_price(Asset("SPY")) == spy.df["open"].iloc[10]
+
+    def test_get_fill_bar_matches_historical_prices(self, pandas_data_fixture):
+        data_source = PandasData(
+            datetime.datetime(2019, 1, 2), datetime.datetime(2019, 12, 31), pandas_data=pandas_data_fixture
+        )
+        data_source._show_progress_bar = False
+        data_source.load_data()
+        for dt in (data_source._date_index[10], data_source._date_index[10] + datetime.timedelta(hours=1)):
+            data_source._update_datetime(dt)
+            df = data_source.get_historical_prices(Asset("SPY"), 2, timeshift=-2, timestep="day").df
+            df = df[df.index >= dt] if (df.index >= dt).any() else df.iloc[-1:]
+
+            bar = data_source.get_fill_bar(Asset("SPY"), timestep="day")
+            assert bar["datetime"] == df.index[0]
+            assert [bar[column] for column in ["open", "high", "low", "close", "volume"]] == df.iloc[0][
+                ["open", "high", "low", "close", "volume"]
+            ].tolist()
+
+    def test_get_fill_bar_without_data(self, pandas_data_fixture):
+        data_source = PandasData(
+            datetime.datetime(2019, 1, 2), datetime.datetime(2019, 12, 31), pandas_data=pandas_data_fixture
+        )
+        data_source.load_data()
+        assert data_source.get_fill_bar(Asset("MISSING")) is None
@@ -0,0 +1,269 @@
+import datetime
+import threading
+from decimal import Decimal
+from threading import RLock
+
+import pandas as pd
+import pytest
+
+from lumibot import LUMIBOT_DEFAULT_PYTZ
+from lumibot.entities import Asset, Order, Position
+from lumibot.trading_builtins import DirectStream, OrderStore, PositionLedger, StatsRecorder, TradeEventLog
+
+
+def make_order(strategy="strategy", symbol="SPY", quantity=10):
+    return Order(strategy, Asset(symbol), quantity, "buy")
+
+
+class TestOrderStore:
+    def test_status_views_behave_like_lists(self):
+        store = OrderStore(RLock())
+        new_orders = store.view("new")
+        first, second = make_order(), make_order(quantity=5)
+        new_orders.append(first)
+        new_orders.append(second)
+        new_orders.append(first)
+
+        assert len(new_orders) == 2
+        assert new_orders[1] is second
+        assert first in new_orders
+        assert make_order() not in new_orders
+
+        new_orders.remove(first)
+        assert new_orders.get_list() == [second]
+        new_orders.remove(second.identifier, key="identifier")
+        assert not new_orders
+
+    def test_orders_are_listed_by_status_strategy_and_asset(self):
+        store = OrderStore(RLock())
+        spy, qqq, other = make_order(), make_order(symbol="QQQ"), make_order(strategy="other")
+        filled = make_order()
+        store.add(filled, "filled")
+        store.add(qqq, "new")
+        store.add(spy, "unprocessed")
+        store.add(other, "new")
+
+        assert store.get_orders() == [spy, qqq, other, filled]
+        assert store.get_orders("strategy") == [spy, qqq, filled]
+        assert store.get_orders("strategy", Asset("SPY")) == [spy, filled]
+        assert store.get_orders(asset=Asset("QQQ")) == [qqq]
+        assert store.get_orders("missing") == []
+
+        # Moving an order to another status
+        store.view("unprocessed").remove(spy.identifier, key="identifier")
+        store.add(spy, "canceled")
+        assert store.get_orders("strategy", statuses=("unprocessed", "new")) == [qqq]
+        assert store.get_orders("strategy", Asset("SPY")) == [filled, spy]
+
+    def test_archived_orders_are_only_found_by_identifier(self):
+        store = OrderStore(RLock(), archive_terminal=True)
+        active, filled = make_order(), make_order()
+        store.add(active, "new")
+        store.add(filled, "filled")
+
+        assert store.get_orders("strategy") == [active]
+        assert store.get_orders("strategy", statuses=OrderStore.STATUSES) == [active, filled]
+        assert store.get_order(filled.identifier) is filled
+
+    def test_changed_identifiers_are_found(self, monkeypatch):
+        store = OrderStore(RLock())
+        order, other = make_order(), make_order()
+        store.add(order, "unprocessed")
+        store.add(other, "new")
+        first_identifier = order.identifier
+        order.set_identifier("broker-id")
+        other.identifier = "other-broker-id"
+
+        # Orders are indexed again when their identifier changes, a missed lookup does not rebuild the index
+        monkeypatch.setattr(store, "reindex", lambda: pytest.fail("the index was rebuilt"))
+        assert store.get_order("broker-id") is order
+        assert store.get_order("other-broker-id") is other
+        assert store.get_order(first_identifier) is None
+        assert store.get_order("missing") is None
+
+        store.view("unprocessed").remove("broker-id", key="identifier")
+        assert len(store) == 1
+        assert store.get_order("broker-id") is None
+        assert order._order_stores == []
+        order.set_identifier("ignored")
+        assert store.get_order("ignored") is None
+        assert order.to_dict()["identifier"] == "ignored"
+
+
+class TestPositionLedger:
+    def test_positions_are_found_by_asset_and_strategy(self):
+        ledger = PositionLedger(RLock())
+        usd = Position("first", Asset("USD", asset_type="forex"), 1000)
+        first, second = Position("first", Asset("SPY"), 10), Position("second", Asset("SPY"), 5)
+        ledger.extend([usd, first, second])
+
+        assert ledger.get(Asset("SPY")) is first
+        assert ledger.get(Asset("SPY"), "second") is second
+        assert ledger.get(Asset("USD", asset_type="forex"), "second") is None
+        assert ledger.get(Asset("QQQ")) is None
+        assert ledger.get_list() == [usd, first, second]
+
+        # The strategy is matched on lookup, so it can change after the position is added
+        second.strategy = "third"
+        assert ledger.get(Asset("SPY"), "third") is second
+
+        ledger.remove(first)
+        assert ledger.get(Asset("SPY")) is second
+        assert len(ledger) == 2
+
+    def test_expiring_positions(self):
+        ledger = PositionLedger(RLock())
+
+        def option(day, strike):
+            return Asset("SPY", asset_type="option", expiration=datetime.date(2023, 8, day), strike=strike, right="CALL")
+
+        stock = Position("first", Asset("SPY"), 10)
+        late = Position("first", option(18, 450), 1)
+        early = Position("first", option(4, 450), 1)
+        other = Position("second", option(4, 455), 1)
+        earliest = Position("first", option(3, 460), -1)
+        ledger.extend([stock, late, early, other, earliest])
+
+        assert ledger.expiring(datetime.date(2023, 8, 2)) == []
+        # In the order the positions were added, not by expiration
+        assert ledger.expiring(datetime.date(2023, 8, 4), "first") == [early, earliest]
+        assert ledger.expiring(datetime.date(2023, 8, 4)) == [early, other, earliest]
+
+        ledger.remove(earliest)
+        ledger.remove(early)
+        assert ledger.expiring(datetime.date(2023, 8, 4), "first") == []
+        ledger.append(early)
+        assert ledger.expiring(datetime.date(2023, 8, 31)) == [late, other, early]
+
+
+class TestDirectStream:
+    def test_events_are_processed_in_order_by_the_dispatching_thread(self):
+        stream = DirectStream()
+        processed = []
+
+        @stream.add_action("first")
+        def first(value):
+            # Dispatched by an action, processed after this action returns
+            stream.dispatch("second", value=value + 1)
+            processed.append(("first", value, threading.get_ident()))
+
+        @stream.add_action("second")
+        def second(value):
+            processed.append(("second", value, threading.get_ident()))
+
+        stream.dispatch("first", wait_until_complete=True, value=1)
+        assert processed == [("first", 1, threading.get_ident()), ("second", 2, threading.get_ident())]
+
+    def test_events_left_by_a_failing_action_are_dropped(self):
+        stream = DirectStream()
+        processed = []
+
+        @stream.add_action("fail")
+        def fail():
+            stream.dispatch("record", value="queued by the failing action")
+            raise RuntimeError("action failed")
+
+        @stream.add_action("record")
+        def record(value):
+            processed.append(value)
+
+        with pytest.raises(RuntimeError):
+            stream.dispatch("fail")
+        stream.dispatch("record", value="next")
+        assert processed == ["next"]
+
+
+def make_trade_event(status, price=None, **fields):
+    event = {
+        "time": LUMIBOT_DEFAULT_PYTZ.localize(datetime.datetime(2023, 1, 3, 9, 30)),
+        "strategy": "strategy",
+        "symbol": "SPY",
+        "status": status,
+        "price": price,
+        "filled_quantity": None if price is None else 10.0,
+        "asset.strike": None,
+    }
+    event.update(fields)
+    return event
+
+
+class TestTradeEventLog:
+    def test_dataframe_matches_concatenated_events(self):
+        events = [
+            make_trade_event("new"),
+            make_trade_event("fill", price=100.5),
+            make_trade_event("new", **{"asset.strike": 270}),
+            make_trade_event("canceled", time=pd.Timestamp("2023-01-04 10:00", tz=LUMIBOT_DEFAULT_PYTZ)),
+        ]
+        log = TradeEventLog()
+        expected = pd.DataFrame()
+        for event in events:
+            log.append(event)
+            expected = pd.concat([expected, pd.DataFrame(event, index=[0]).dropna(axis=1, how="all")], axis=0)
+
+        assert len(log) == 4
+        pd.testing.assert_frame_equal(log.to_dataframe(), expected)
+        assert TradeEventLog().to_dataframe().empty
+
+    def test_events_are_written_to_parquet_in_chunks(self, tmp_path):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            pytest.skip("pyarrow is needed to write Parquet files")
+        log = TradeEventLog(parquet_dir=str(tmp_path), chunk_size=2)
+        for price in [1.0, 2.0, 3.0, 4.0, 5.0]:
+            log.append(make_trade_event("fill", price=price))
+
+        assert len(list(tmp_path.glob("*.parquet"))) == 2
+        assert len(log) == 5
+        assert log.to_dataframe()["price"].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+class TestStatsRecorder:
+    @staticmethod
+    def record(rows):
+        recorder = StatsRecorder(capacity=2)
+        for row in rows:
+            extra = {key: value for key, value in row.items() if key not in StatsRecorder.COLUMNS}
+            positions = [Position("strategy", p["asset"], p["quantity"]) for p in row["positions"]]
+            recorder.append(row["datetime"], row["portfolio_value"], row["cash"], positions, extra)
+        return recorder
+
+    def test_dataframe_matches_the_rows(self):
+        spy, usd = Asset("SPY"), Asset("USD", asset_type="forex")
+        start = LUMIBOT_DEFAULT_PYTZ.localize(datetime.datetime(2023, 8, 4, 9, 30))
+        rows = [
+            {"datetime": start, "portfolio_value": 1000, "cash": 1000, "positions": []},
+            {
+                "my_stat": 1.5,
+                "datetime": start + datetime.timedelta(minutes=1),
+                "portfolio_value": 1000.0,
+                "cash": 500.5,
+                "positions": [{"asset": spy, "quantity": 5.0}, {"asset": usd, "quantity": 500.5}],
+            },
+            {
+                "datetime": start + datetime.timedelta(days=100),
+                "portfolio_value": 1010.0,
+                "cash": 500.5,
+                "positions": [{"asset": spy, "quantity": 5.0}],
+                "other_stat": "a",
+            },
+        ]
+        recorder = self.record(rows)
+
+        assert len(recorder) == 3
+        pd.testing.assert_frame_equal(recorder.to_dataframe(), pd.DataFrame(rows))
+        assert recorder.to_dataframe()["positions"].tolist() == [row["positions"] for row in rows]
+        assert StatsRecorder().to_dataframe().empty
+
+    def test_values_that_do_not_fit_the_columns(self):
+        start = LUMIBOT_DEFAULT_PYTZ.localize(datetime.datetime(2023, 8, 4, 9, 30))
+        rows = [
+            {"datetime": start, "portfolio_value": 1000, "cash": None, "positions": []},
+            {"datetime": datetime.datetime(2023, 8, 4, 9, 31), "portfolio_value": 1000, "cash": Decimal("1.5"),
+             "positions": []},
+        ]
+        pd.testing.assert_frame_equal(self.record(rows).to_dataframe(), pd.DataFrame(rows))
+        rows[1]["datetime"] = start.astimezone(datetime.timezone.utc)
+        rows[1]["cash"] = 1.5
+        pd.testing.assert_frame_equal(self.record(rows).to_dataframe(), pd.DataFrame(rows))